@@ -46,8 +46,15 @@ from configsuite.validation_errors import (
     InvalidValueError,
     TransformationError,
     ContextExtractionError,
+    ValidationTimeoutError,
 )
 from configsuite.validator import Validator
 from configsuite.transformer import Transformer
+from configsuite.layer import PreparedLayer, LayerCache
 from configsuite.config import ConfigSuite
+from configsuite.aio import AsyncConfigSuite
+from configsuite.exporter import export, export_json
+from configsuite.accessor import compile_accessor
+from configsuite.differ import diff, diff_snapshots
+from configsuite.batch import validate_many
 from configsuite import docs
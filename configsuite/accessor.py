@@ -0,0 +1,192 @@
+"""Copyright 2021 Equinor ASA and The Netherlands Organisation for
+Applied Scientific Research TNO.
+
+Licensed under the MIT license.
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the conditions stated in the LICENSE file in the project root for
+details.
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+"""
+
+
+import operator
+import re
+
+import configsuite
+from configsuite import MetaKeys as MK
+from configsuite.snapshot import ColumnarListSnapshot
+
+
+_NAME = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+_SUBSCRIPT = re.compile(r"\[(\*|-?[0-9]+|\"[^\"]*\"|'[^']*'|[^\]\[\"']+)\]")
+
+_WILDCARD = object()
+
+
+def _parse(path):
+    """Splits `path` into a list of tokens, which are field names, subscripts
+    given as strings, and the wildcard."""
+    tokens = []
+    pos = 0
+    while pos < len(path):
+        if path[pos] == "[":
+            match = _SUBSCRIPT.match(path, pos)
+            if match is None:
+                break
+            subscript = match.group(1)
+            tokens.append(_WILDCARD if subscript == "*" else ("subscript", subscript))
+        else:
+            if len(tokens) > 0:
+                if path[pos] != ".":
+                    break
+                pos += 1
+            match = _NAME.match(path, pos)
+            if match is None:
+                break
+            tokens.append(("name", match.group(0)))
+        pos = match.end()
+
+    if pos < len(path) or len(tokens) == 0:
+        raise ValueError("Invalid path {!r} at position {}".format(path, pos))
+    return tokens
+
+
+def _chain(step, child):
+    if child is None:
+
+        def _get(snapshot):
+            return None if snapshot is None else step(snapshot)
+
+    else:
+
+        def _get(snapshot):
+            return None if snapshot is None else child(step(snapshot))
+
+    return _get
+
+
+def _map_items(child, dict_values):
+    def _get(snapshot):
+        if snapshot is None:
+            return None
+
+        elems = snapshot.values() if dict_values else snapshot
+        if child is None:
+            return tuple(elems)
+        return tuple(map(child, elems))
+
+    return _get
+
+
+def _map_column(child, field):
+    def _get(snapshot):
+        if snapshot is None:
+            return None
+        elif isinstance(snapshot, ColumnarListSnapshot):
+            return tuple(snapshot.column(field))
+        return tuple(map(child, snapshot))
+
+    return _get
+
+
+def _dict_key(subscript, key_schema):
+    if subscript[0] in "\"'":
+        return subscript[1:-1]
+    elif key_schema[MK.Type] == configsuite.types.Integer:
+        return int(subscript)
+    return subscript
+
+
+def _access_error(token, data_type, path):
+    msg = "Cannot access {} of {} in path {!r}"
+    token_str = "[*]" if token is _WILDCARD else token[1]
+    return TypeError(msg.format(token_str, data_type.name, path))
+
+
+def _compile_wildcard(tokens, schema, path):
+    data_type = schema[MK.Type]
+    if data_type == configsuite.types.List:
+        item_schema = schema[MK.Content][MK.Item]
+        child = _compile(tokens, item_schema, path)
+        if len(tokens) == 1 and item_schema[MK.Type] == configsuite.types.NamedDict:
+            return _map_column(child, tokens[0][1])
+        return _map_items(child, False)
+    elif data_type == configsuite.types.Dict:
+        value_schema = schema[MK.Content][MK.Value]
+        return _map_items(_compile(tokens, value_schema, path), True)
+    raise _access_error(_WILDCARD, data_type, path)
+
+
+def _compile(tokens, schema, path):
+    if len(tokens) == 0:
+        return None
+
+    token, tokens = tokens[0], tokens[1:]
+    if token is _WILDCARD:
+        return _compile_wildcard(tokens, schema, path)
+
+    data_type = schema[MK.Type]
+    if data_type == configsuite.types.NamedDict and token[0] == "name":
+        content_schema = schema[MK.Content]
+        if token[1] not in content_schema:
+            msg = "Unknown key {} in path {!r}"
+            raise KeyError(msg.format(token[1], path))
+
+        fields = tuple(sorted(content_schema.keys()))
+        step = operator.itemgetter(fields.index(token[1]))
+        child_schema = content_schema[token[1]]
+    elif data_type == configsuite.types.List and token[0] == "subscript":
+        try:
+            step = operator.itemgetter(int(token[1]))
+        except ValueError:
+            msg = "Expected integer index of list in path {!r}, was {}"
+            raise ValueError(msg.format(path, token[1]))
+        child_schema = schema[MK.Content][MK.Item]
+    elif data_type == configsuite.types.Dict and token[0] == "subscript":
+        key = _dict_key(token[1], schema[MK.Content][MK.Key])
+
+        def step(snapshot):
+            return snapshot.get(key)
+
+        child_schema = schema[MK.Content][MK.Value]
+    else:
+        raise _access_error(token, data_type, path)
+
+    return _chain(step, _compile(tokens, child_schema, path))
+
+
+def compile_accessor(schema, path):
+    """Compiles a function that extracts the element at `path` from snapshots
+    of `schema`.
+
+    The path consists of the keys of NamedDicts separated by dots, together
+    with subscripts of Lists and Dicts, e.g. ``"transactions[0].amount"`` or
+    ``"exchange_rates[NOK]"``. The wildcard ``[*]`` extracts all items of a
+    List, or all values of a Dict, as a tuple, with the remaining path
+    applied to each of them, e.g. ``"transactions[*].amount"``. The values of
+    a key of all items of a `ColumnarListSnapshot` are read directly from its
+    column. If an element along the path is `None` or a key is not in a Dict,
+    the accessor returns `None`.
+
+    The path is resolved against the schema once, such that the accessor
+    only does positional lookups.
+
+    Raises
+    ------
+    ValueError
+        If the path cannot be parsed.
+    KeyError
+        If the path contains a key that is not in the schema.
+    TypeError
+        If the path accesses an element of a basic type, or uses a key where
+        a subscript is expected or vice versa.
+    """
+    return _compile(_parse(path), schema, path)
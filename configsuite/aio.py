@@ -0,0 +1,86 @@
+"""Copyright 2021 Equinor ASA and The Netherlands Organisation for
+Applied Scientific Research TNO.
+
+Licensed under the MIT license.
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the conditions stated in the LICENSE file in the project root for
+details.
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+"""
+
+
+import inspect
+
+from configsuite.config import ConfigSuite
+
+
+class AsyncConfigSuite(ConfigSuite):
+    """A `ConfigSuite` whose final validation is carried out asynchronously by
+    `avalidate`. It accepts the same arguments as `ConfigSuite`, but
+    `extract_validation_context` can be a coroutine function, and context and
+    element validators can be coroutine functions decorated by
+    `validator_msg`. The calls of the coroutine validators are awaited
+    concurrently. Note that `extract_transformation_context` cannot be a
+    coroutine function.
+
+    The configuration is merged and transformed when the suite is
+    constructed, but `valid` and `errors` are only available after
+    `avalidate` is awaited:
+
+        suite = await AsyncConfigSuite(raw_config, schema).avalidate()
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._validation_pending = False
+        super().__init__(*args, **kwargs)
+
+    def _validate_final(self):
+        self._validation_pending = True
+
+    def _assert_validated(self):
+        if self._validation_pending:
+            err_msg = "The suite must be validated by awaiting avalidate"
+            raise AssertionError(err_msg)
+
+    @property
+    def valid(self):
+        """See `ConfigSuite.valid`. Only available after `avalidate`."""
+        self._assert_validated()
+        return self._valid
+
+    @property
+    def errors(self):
+        """See `ConfigSuite.errors`. Only available after `avalidate`."""
+        self._assert_validated()
+        return self._errors
+
+    async def avalidate(self, concurrency=None):
+        """Carries out the final validation of the configuration and returns
+        the suite. At most `concurrency` calls of coroutine validators are in
+        progress at the time if given. Awaiting an already validated suite
+        returns immediately.
+        """
+        if not self._validation_pending:
+            return self
+
+        context = self._extract_validation_context(self.snapshot)
+        if inspect.isawaitable(context):
+            context = await context
+
+        validator = self._final_validator()
+        val_res = await validator.avalidate(
+            self._merged_config, context, concurrency=concurrency
+        )
+        self._valid &= val_res.valid
+        self._errors += val_res.errors
+        self._validation_pending = False
+        self._assert_state()
+        return self
@@ -0,0 +1,151 @@
+"""Copyright 2021 Equinor ASA and The Netherlands Organisation for
+Applied Scientific Research TNO.
+
+Licensed under the MIT license.
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the conditions stated in the LICENSE file in the project root for
+details.
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+"""
+
+
+import concurrent.futures
+import hashlib
+import itertools
+import os
+import pickle
+
+import configsuite
+from configsuite.config import _no_context, _validate_schema
+from configsuite.layer import PreparedLayer
+from configsuite.validator import ValidationResult
+
+
+_CHUNK_SIZE = 64
+
+_worker_state = {}
+
+
+def _suite_factory(schema, layers, suite_kwargs):
+    # The schema is validated and copied, and the layers are prepared, once
+    # and not for every config.
+    schema = _validate_schema(schema, deduce_required=suite_kwargs["deduce_required"])
+    layers = tuple(
+        PreparedLayer(layer, schema.schema, keep_raw_layer=False) for layer in layers
+    )
+
+    def _build_suite(config):
+        return configsuite.ConfigSuite(config, schema, layers=layers, **suite_kwargs)
+
+    return _build_suite
+
+
+def _validate(build_suite, config):
+    suite = build_suite(config)
+    return ValidationResult(valid=suite.valid, errors=suite.errors)
+
+
+def _worker_suite_factory(state_key, state):
+    """Returns the suite factory of the pickled `state`, which is built once
+    per worker process and `state_key`.
+    """
+    if _worker_state.get("state_key") != state_key:
+        _worker_state.clear()
+        _worker_state["build_suite"] = _suite_factory(*pickle.loads(state))
+        _worker_state["state_key"] = state_key
+    return _worker_state["build_suite"]
+
+
+def _validate_chunk(state_key, state, offset, configs):
+    build_suite = _worker_suite_factory(state_key, state)
+    return [
+        (offset + idx, _validate(build_suite, config))
+        for idx, config in enumerate(configs)
+    ]
+
+
+def _chunked(configs, chunk_size):
+    configs = iter(configs)
+    offset = 0
+    while True:
+        chunk = list(itertools.islice(configs, chunk_size))
+        if len(chunk) == 0:
+            return
+        yield offset, chunk
+        offset += len(chunk)
+
+
+def validate_many(
+    configs,
+    schema,
+    workers=None,
+    layers=(),
+    extract_validation_context=_no_context,
+    extract_transformation_context=_no_context,
+    deduce_required=False,
+    chunk_size=_CHUNK_SIZE,
+):
+    """Validates each of `configs` against `schema` in a pool of `workers`
+    processes, yielding `(index, ValidationResult)` pairs in the order the
+    validations finish.
+
+    Each config is validated as the raw config of a `ConfigSuite` with the
+    given `layers`, context extractors and `deduce_required`. The schema is
+    sent to each worker, and the layers are prepared, once per worker. The
+    configs are consumed lazily and sent to the workers in chunks of
+    `chunk_size`, with at most two chunks per worker in flight. If `workers`
+    is 1 the configs are validated in the current process and the results
+    are yielded in order. If `workers` is `None` the number of processors is
+    used.
+
+    The schema, the layers and the context extractors must be picklable
+    when `workers` is larger than 1.
+    """
+    suite_kwargs = {
+        "extract_validation_context": extract_validation_context,
+        "extract_transformation_context": extract_transformation_context,
+        "deduce_required": deduce_required,
+    }
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers == 1:
+        build_suite = _suite_factory(schema, layers, suite_kwargs)
+        for idx, config in enumerate(configs):
+            yield idx, _validate(build_suite, config)
+        return
+
+    # The state is pickled once and sent along with each chunk, since pool
+    # initializers require Python 3.7.
+    state = pickle.dumps((schema, tuple(layers), suite_kwargs))
+    state_key = hashlib.sha256(state).hexdigest()
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        max_pending = 2 * workers
+        chunks = _chunked(configs, chunk_size)
+        pending = set()
+        for offset, chunk in itertools.islice(chunks, max_pending):
+            pending.add(
+                executor.submit(_validate_chunk, state_key, state, offset, chunk)
+            )
+
+        while len(pending) > 0:
+            done, pending = concurrent.futures.wait(
+                pending, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                for result in future.result():
+                    yield result
+
+            for offset, chunk in itertools.islice(chunks, len(done)):
+                pending.add(
+                    executor.submit(_validate_chunk, state_key, state, offset, chunk)
+                )
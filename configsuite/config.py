@@ -19,13 +19,46 @@ in all copies or substantial portions of the Software.
 
 import copy
 import configsuite
-import collections
 
 
-from .schema import assert_valid_schema
+from .accessor import compile_accessor
+from .exporter import compile_exporter, dumps
+from .layer import PreparedLayer, _StringInterner, readability_errors
+from .schema import assert_valid_schema, schema_fingerprint
+from .snapshot import SnapshotBuilder, build_snapshot
 from .meta_keys import MetaKeys as MK
 
 
+def _no_context(_snapshot):
+    return None
+
+
+class _ValidatedSchema(object):
+    """A schema that has been validated and copied, together with its
+    fingerprint. Suites given a validated schema use it as is, such that
+    suites of the same schema, e.g. in `validate_many` and the validation
+    server, do not validate and copy the schema again.
+    """
+
+    __slots__ = ("schema", "fingerprint")
+
+    def __init__(self, schema, fingerprint):
+        self.schema = schema
+        self.fingerprint = fingerprint
+
+
+def _validate_schema(schema, deduce_required=False):
+    assert_valid_schema(schema, deduce_required=deduce_required)
+    schema = copy.deepcopy(schema)
+    return _ValidatedSchema(schema, schema_fingerprint(schema))
+
+
+def _copy_default_config(config):
+    if isinstance(config, dict):
+        return {key: _copy_default_config(value) for key, value in config.items()}
+    return config
+
+
 class ConfigSuite(object):
     """A `Suite` exposing the functionality of Config Suite in a unified manner.
 
@@ -33,17 +66,24 @@ class ConfigSuite(object):
     with a `schema` describing the structure of a configuration, together with
     a `raw_config` and possibly additional `layers`.
 
+    A suite can be pickled, and hence sent to worker processes without being
+    validated again, if its schema and context extractors can be pickled.
+    Validators and transformations decorated at module level are pickled by
+    reference. The `executor` and the `layer_cache` are not pickled.
+
     Parameters
     ----------
     raw_config
-        The configuration taking precedence.
+        The configuration taking precedence. Can also be a `PreparedLayer`.
     schema
         A description of the structure of a valid configuration, together with
         actions that are to be carried out.
     layers: iterable of layers, optional
         Additional layers of configuration. A layer takes precedence over all
         other layers following it in the given sequence. Note that `raw_config`
-        takes precedence over all elements of `layers`.
+        takes precedence over all elements of `layers`. Layers that are to be
+        used in many suites can be given as `PreparedLayer`s to avoid
+        transforming and checking them for each suite.
     extract_validation_context: callable, optional
         Callable that extracts the context used for validation. The callable is
         given a snapshot of the configuration as argument. Defaults to the
@@ -57,6 +97,49 @@ class ConfigSuite(object):
         entry is `required` by inspecting `allow_none` and `default`. In
         particular, using `required` in schemas as well as not setting
         `deduce_required=True` is deprecated.
+    executor: concurrent.futures.Executor, optional
+        Executor used to transform the items of large lists and dicts in
+        chunks. Note that a process pool requires the schema, the
+        transformation context and the configuration to be picklable.
+        Defaults to `None`, in which case all transformations are carried
+        out serially.
+    layer_cache: LayerCache, optional
+        Cache of prepared layers. Layers equal to a layer in the cache, for
+        the same schema, are not transformed and checked again.
+    base_snapshot: snapshot, optional
+        Snapshot of a suite with the same schema. Subtrees of the snapshot of
+        this suite that are equal to the corresponding subtrees of
+        `base_snapshot` reuse the subtrees of `base_snapshot`, such that
+        memory is only spent on what has changed. Suites created by `push`
+        share their snapshot with the suite they are pushed on.
+    compact_snapshot: bool, optional
+        If true, the snapshot stores NamedDicts and Lists in classes with
+        slots and Lists of integers or floats in arrays, which reduces the
+        memory footprint of large configurations, and caches the hashes of
+        its elements. The compact snapshot compares equal to the default
+        snapshot of the same configuration, which consists of tuples.
+    columnar_snapshot: bool, optional
+        If true, Lists of NamedDicts with values of basic types are stored in
+        the snapshot as `ColumnarListSnapshot`s with one column per key, see
+        `ColumnarListSnapshot.column`. The items are built on access.
+    shared_memory_snapshot: bool, optional
+        If true, Lists of many integers or floats are stored in the snapshot
+        in shared memory blocks, see `SharedNumericListSnapshot`. The
+        snapshot can then be sent to worker processes without copying the
+        elements, as long as this suite is alive.
+    intern_strings: bool, optional
+        If true, the strings of the layers and the merged configuration, which
+        the snapshot is built from, that are `String` keys or values in the
+        schema are interned, such that duplicate strings share memory. The
+        number of bytes saved is reported by `interned_bytes`.
+    validator_timeout: float, optional
+        The maximum number of seconds each element and context validator is
+        given in the final validation. A validator that times out fails with a
+        `ValidationTimeoutError`, but is not stopped, see `Validator`.
+    time_budget: float, optional
+        The maximum number of seconds spent on the final validation. When the
+        budget is spent the validation stops with a `ValidationTimeoutError`
+        carrying the key path where it stopped.
 
 
 
@@ -73,15 +156,34 @@ class ConfigSuite(object):
         raw_config,
         schema,
         layers=(),
-        extract_validation_context=lambda snapshot: None,
-        extract_transformation_context=lambda snapshot: None,
+        extract_validation_context=_no_context,
+        extract_transformation_context=_no_context,
         deduce_required=False,
+        executor=None,
+        layer_cache=None,
+        base_snapshot=None,
+        compact_snapshot=False,
+        columnar_snapshot=False,
+        shared_memory_snapshot=False,
+        intern_strings=False,
+        validator_timeout=None,
+        time_budget=None,
     ):
-        assert_valid_schema(schema, deduce_required=deduce_required)
+        if isinstance(schema, _ValidatedSchema):
+            self._schema = schema.schema
+            self._schema_fingerprint = schema.fingerprint
+        else:
+            assert_valid_schema(schema, deduce_required=deduce_required)
+            self._schema = copy.deepcopy(schema)
+            self._schema_fingerprint = schema_fingerprint(self._schema)
+        self._executor = executor
+        self._layer_cache = layer_cache
+        self._intern_strings = intern_strings
+        self._validator_timeout = validator_timeout
+        self._time_budget = time_budget
         self._layers = tuple(
-            [copy.deepcopy(layer) for layer in tuple(layers) + (raw_config,)]
+            [self._prepare_layer(layer) for layer in tuple(layers) + (raw_config,)]
         )
-        self._schema = copy.deepcopy(schema)
         self._extract_validation_context = extract_validation_context
         self._extract_transformation_context = extract_transformation_context
 
@@ -89,7 +191,15 @@ class ConfigSuite(object):
         self._valid = True
         self._errors = ()
         self._snapshot = None
+        self._base_snapshot = base_snapshot
+        self._compact_snapshot = compact_snapshot
+        self._columnar_snapshot = columnar_snapshot
+        self._shared_memory_snapshot = shared_memory_snapshot
+        self._merged_interned_bytes = 0
         self._deduce_required = deduce_required
+        self._default_templates = {}
+        self._exporter = None
+        self._accessors = {}
 
         self._cached_merged_config = self._build_merged_config()
         if self._readable:
@@ -129,10 +239,62 @@ class ConfigSuite(object):
             raise AssertionError(err_msg)
 
         if self._snapshot is None:
-            self._snapshot = self._build_snapshot(self._merged_config, self._schema)
+            builder = SnapshotBuilder(
+                compact=self._compact_snapshot,
+                columnar=self._columnar_snapshot,
+                shared_memory=self._shared_memory_snapshot,
+            )
+            self._snapshot = builder.build(
+                self._merged_config, self._schema, base=self._base_snapshot
+            )
+            self._base_snapshot = None
 
         return self._snapshot
 
+    @property
+    def interned_bytes(self):
+        """The number of bytes of duplicate strings in the layers and the
+        merged configuration that were replaced by interned strings, see
+        `intern_strings`. Layers that are shared with other suites are counted
+        in each suite.
+        """
+        layers_interned_bytes = sum(layer.interned_bytes for layer in self._layers)
+        return layers_interned_bytes + self._merged_interned_bytes
+
+    def to_primitive(self):
+        """Returns the snapshot as plain Python dictionaries, lists and basic
+        types. Named dicts and dicts are exported as dictionaries and lists as
+        lists.
+
+        Raises
+        ------
+        AssertionError
+            Raised if `suite` is not `readable`.
+        """
+        if self._exporter is None:
+            self._exporter = compile_exporter(self._schema)
+        return self._exporter(self.snapshot)
+
+    def accessor(self, path):
+        """Returns a function that extracts the element at `path` from the
+        snapshot of this suite, or of any suite with the same schema. See
+        `compile_accessor` for the format of the path.
+        """
+        if path not in self._accessors:
+            self._accessors[path] = compile_accessor(self._schema, path)
+        return self._accessors[path]
+
+    def to_json(self):
+        """Returns the snapshot serialized as a JSON string, see
+        `to_primitive`.
+
+        Raises
+        ------
+        AssertionError
+            Raised if `suite` is not `readable`.
+        """
+        return dumps(self.to_primitive())
+
     @property
     def _validation_context(self):
         return self._extract_validation_context(self.snapshot)
@@ -151,15 +313,24 @@ class ConfigSuite(object):
 
         Returns
         -------
-        A new `ConfigSuite` with `raw_config` as the first layer.
+        A new suite of the same class with `raw_config` as the first layer.
         """
-        return ConfigSuite(
+        return self.__class__(
             raw_config,
-            self._schema,
+            _ValidatedSchema(self._schema, self._schema_fingerprint),
             layers=self._layers,
             extract_validation_context=self._extract_validation_context,
             extract_transformation_context=self._extract_transformation_context,
             deduce_required=self._deduce_required,
+            executor=self._executor,
+            layer_cache=self._layer_cache,
+            base_snapshot=self.snapshot if self.readable else None,
+            compact_snapshot=self._compact_snapshot,
+            columnar_snapshot=self._columnar_snapshot,
+            shared_memory_snapshot=self._shared_memory_snapshot,
+            intern_strings=self._intern_strings,
+            validator_timeout=self._validator_timeout,
+            time_budget=self._time_budget,
         )
 
     @property
@@ -186,7 +357,9 @@ class ConfigSuite(object):
     def _build_merged_config(self):
         layers = self._build_transformed_layers()
 
-        self._validate_readability(layers)
+        self._validate_readability(
+            layers, [layer.readability_errors for layer in self._layers]
+        )
         if not self.readable:
             return None
 
@@ -203,50 +376,87 @@ class ConfigSuite(object):
         if not self.readable:
             return None
 
+        if self._intern_strings:
+            # The strings produced by the transformations are interned in the
+            # merged config, which the snapshot is then built from.
+            interner = _StringInterner()
+            merged_config = interner.intern(merged_config, self._schema)
+            self._merged_interned_bytes = interner.interned_bytes
+
         return merged_config
 
-    def _build_transformed_layers(self):
-        layer_transformer = configsuite.Transformer(
-            self._schema, MK.LayerTransformation, (), bottom_up=False
+    def _prepare_layer(self, layer):
+        if isinstance(layer, PreparedLayer):
+            return layer.prepare(
+                self._schema,
+                fingerprint=self._schema_fingerprint,
+                executor=self._executor,
+                intern_strings=self._intern_strings,
+            )
+        elif self._layer_cache is not None:
+            return self._layer_cache.prepare(
+                layer,
+                self._schema,
+                fingerprint=self._schema_fingerprint,
+                executor=self._executor,
+                intern_strings=self._intern_strings,
+            )
+        return PreparedLayer(
+            layer,
+            self._schema,
+            executor=self._executor,
+            intern_strings=self._intern_strings,
+            keep_raw_layer=False,
         )
-        layers = []
+
+    def _build_transformed_layers(self):
         for layer in self._layers:
-            trans_layer = layer_transformer.transform(layer)
-            self._errors += trans_layer.errors
-            layers.append(trans_layer.result)
+            self._errors += layer.errors
 
         self._valid &= len(self._errors) == 0
-        return layers
+        return [layer.layer for layer in self._layers]
+
+    def _named_dict_default_template(self, schema):
+        """Returns the default values of the defaultable keys of a NamedDict
+        level, together with the merged config of the defaults. Both are
+        computed once per schema level and must not be mutated.
+        """
+        template = self._default_templates.get(id(schema))
+        if template is not None:
+            return template
 
-    def _build_initial_named_dict_merged_config(self, layers, schema):
-        rec = self._build_initial_merged_config
         content_schema = schema[MK.Content]
 
         def is_collection(schema_type):
             return isinstance(schema_type, configsuite.types.Collection)
 
-        def is_defaultable(schema_item):
-            return MK.Default in schema_item or is_collection(schema_item[MK.Type])
+        defaults = {}
+        for key, value in content_schema.items():
+            if is_collection(value[MK.Type]):
+                defaults[key] = value[MK.Type].create_empty()
+            elif MK.Default in value:
+                defaults[key] = value[MK.Default]
 
-        layer_keys = set((key for layer in layers for key in layer.keys()))
-        defaultable_keys = set(
-            key for key, val in content_schema.items() if is_defaultable(val)
-        )
+        default_config = {
+            key: self._build_initial_merged_config((default,), content_schema[key])
+            for key, default in defaults.items()
+        }
 
-        config = {}
-        for key in layer_keys | defaultable_keys:
-            child_layers = tuple([layer[key] for layer in layers if key in layer])
+        template = (defaults, default_config)
+        self._default_templates[id(schema)] = template
+        return template
 
-            if key in defaultable_keys:
-                key_type = content_schema[key][MK.Type]
-                if is_collection(key_type):
-                    default = key_type.create_empty()
-                else:
-                    default = content_schema[key].get(MK.Default)
-                child_layers = (default,) + child_layers
+    def _build_initial_named_dict_merged_config(self, layers, schema):
+        rec = self._build_initial_merged_config
+        content_schema = schema[MK.Content]
+        defaults, default_config = self._named_dict_default_template(schema)
 
-            if len(child_layers) == 0:
-                continue
+        config = _copy_default_config(default_config)
+        layer_keys = set((key for layer in layers for key in layer.keys()))
+        for key in layer_keys:
+            child_layers = tuple([layer[key] for layer in layers if key in layer])
+            if key in defaults:
+                child_layers = (defaults[key],) + child_layers
 
             if key in content_schema:
                 config[key] = rec(child_layers, content_schema[key])
@@ -291,14 +501,16 @@ class ConfigSuite(object):
             raise TypeError(msg.format(str(data_type)))
 
     def _apply_transformations(self, config):
-        transformer = configsuite.Transformer(self._schema, MK.Transformation, ())
+        transformer = configsuite.Transformer(
+            self._schema, MK.Transformation, (), executor=self._executor
+        )
         trans_res = transformer.transform(config)
         self._errors += trans_res.errors
         self._valid &= len(trans_res.errors) == 0
         return trans_res.result
 
     def _apply_context_transformations(self, config):
-        prelim_snapshot = self._build_snapshot(config, self._schema)
+        prelim_snapshot = build_snapshot(config, self._schema)
         try:
             context = self._extract_transformation_context(prelim_snapshot)
         # pylint: disable=broad-except
@@ -308,79 +520,26 @@ class ConfigSuite(object):
             return config
 
         context_transformer = configsuite.Transformer(
-            self._schema, MK.ContextTransformation, (context,)
+            self._schema,
+            MK.ContextTransformation,
+            (context,),
+            executor=self._executor,
         )
         trans_res = context_transformer.transform(config)
         self._errors += trans_res.errors
         self._valid &= len(trans_res.errors) == 0
         return trans_res.result
 
-    def _build_named_dict_snapshot(self, config, schema):
-        data_type = schema[MK.Type]
-        content_schema = schema[MK.Content]
-        dict_name = data_type.name
-        dict_keys = sorted(content_schema.keys())
-        dict_collection = collections.namedtuple(dict_name, dict_keys)
-
-        return dict_collection(
-            **{
-                key: self._build_snapshot(config.get(key), content_schema[key])
-                for key in content_schema
-            }
-        )
-
-    def _build_list_snapshot(self, config, schema):
-        item_schema = schema[MK.Content][MK.Item]
-        return tuple([self._build_snapshot(elem, item_schema) for elem in config])
-
-    def _build_dict_snapshot(self, config, schema):
-        key_schema = schema[MK.Content][MK.Key]
-        value_schema = schema[MK.Content][MK.Value]
-
-        Pair = collections.namedtuple("KeyValuePair", ["key", "value"])
-        return tuple(
-            [
-                Pair(
-                    self._build_snapshot(key, key_schema),
-                    self._build_snapshot(value, value_schema),
-                )
-                for key, value in config.items()
+    def _validate_readability(self, layers, layers_errors=None):
+        if layers_errors is None:
+            layers_errors = [
+                readability_errors(self._schema, layer) for layer in layers
             ]
-        )
-
-    def _build_snapshot(self, config, schema):
-        if config is None:
-            return None
-
-        data_type = schema[MK.Type]
-        if isinstance(data_type, configsuite.BasicType):
-            return config
-        elif data_type == configsuite.types.NamedDict:
-            return self._build_named_dict_snapshot(config, schema)
-        elif data_type == configsuite.types.List:
-            return self._build_list_snapshot(config, schema)
-        elif data_type == configsuite.types.Dict:
-            return self._build_dict_snapshot(config, schema)
-        else:
-            msg = "Encountered unknown type {} while building snapshot"
-            raise TypeError(msg.format(str(data_type)))
 
-    def _validate_readability(self, layers):
-        readable_errors = (configsuite.UnknownKeyError, configsuite.MissingKeyError)
-
-        def _not_container(schema):
-            return not isinstance(schema[MK.Type], configsuite.types.Collection)
-
-        container_validator = configsuite.Validator(
-            self._schema, stop_condition=_not_container, apply_validators=False
-        )
         container_errors = []
-        for idx, layer in enumerate(layers):
-            val_res = container_validator.validate(layer)
+        for idx, layer_errors in enumerate(layers_errors):
             container_errors += [
-                error.create_layer_error(idx)
-                for error in val_res.errors
-                if not isinstance(error, readable_errors)
+                error.create_layer_error(idx) for error in layer_errors
             ]
 
         self._readable &= len(container_errors) == 0
@@ -393,23 +552,51 @@ class ConfigSuite(object):
             raise AssertionError(err_msg)
         self._assert_state()
 
-        validator = configsuite.Validator(self._schema)
+        validator = self._final_validator()
         val_res = validator.validate(self._merged_config, self._validation_context)
         self._valid &= val_res.valid
         self._errors += val_res.errors
 
+    def _final_validator(self):
+        return configsuite.Validator(
+            self._schema,
+            validator_timeout=self._validator_timeout,
+            time_budget=self._time_budget,
+        )
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.update(
+            {
+                "_executor": None,
+                "_layer_cache": None,
+                "_exporter": None,
+                "_accessors": {},
+                # Keyed by the ids of the schema levels, which differ once
+                # unpickled.
+                "_default_templates": {},
+            }
+        )
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        # Callables are fingerprinted by identity, which differs between
+        # processes.
+        self._schema_fingerprint = schema_fingerprint(self._schema)
+
     def _assert_state(self):
         """Asserts that the internal state is consistent. In particular we will
         verify that:
          - not readable => not valid
          - valid <=> no errors
         """
-        if not self.readable and self.valid:
+        if not self._readable and self._valid:
             err_msg = "Internal error: Config is valid, but not readable"
             raise AssertionError(err_msg)
-        if self.valid and len(self.errors) > 0:
+        if self._valid and len(self._errors) > 0:
             err_msg = "Internal error: Config is valid, but has errors"
             raise AssertionError(err_msg)
-        if not self.valid and len(self.errors) == 0:
+        if not self._valid and len(self._errors) == 0:
             err_msg = "Internal error: Config is not valid, but has no errors"
             raise AssertionError(err_msg)
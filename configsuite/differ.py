@@ -0,0 +1,116 @@
+"""Copyright 2021 Equinor ASA and The Netherlands Organisation for
+Applied Scientific Research TNO.
+
+Licensed under the MIT license.
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the conditions stated in the LICENSE file in the project root for
+details.
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+"""
+
+
+import configsuite
+from configsuite import MetaKeys as MK
+
+
+def _cached_hash(snapshot):
+    return getattr(snapshot, "_hash", None)
+
+
+def _identical(old, new):
+    if old is new:
+        return True
+
+    old_hash = _cached_hash(old)
+    return old_hash is not None and old_hash == _cached_hash(new) and old == new
+
+
+def _diff_named_dict(old, new, schema, key_path, changes):
+    content_schema = schema[MK.Content]
+    for idx, key in enumerate(sorted(content_schema.keys())):
+        _diff(old[idx], new[idx], content_schema[key], key_path + (key,), changes)
+
+
+def _diff_list(old, new, schema, key_path, changes):
+    item_schema = schema[MK.Content][MK.Item]
+    for idx in range(min(len(old), len(new))):
+        _diff(old[idx], new[idx], item_schema, key_path + (idx,), changes)
+
+    for idx in range(min(len(old), len(new)), max(len(old), len(new))):
+        changes.append(key_path + (idx,))
+
+
+def _diff_dict(old, new, schema, key_path, changes):
+    value_schema = schema[MK.Content][MK.Value]
+    new_keys = new.keys()
+    for key in old.keys():
+        if key in new_keys:
+            _diff(old[key], new[key], value_schema, key_path + (key,), changes)
+        else:
+            changes.append(key_path + (key,))
+
+    old_keys = old.keys()
+    for key in new_keys:
+        if key not in old_keys:
+            changes.append(key_path + (key,))
+
+
+def _diff(old, new, schema, key_path, changes):
+    if _identical(old, new):
+        return
+
+    data_type = schema[MK.Type]
+    if isinstance(data_type, configsuite.BasicType):
+        if type(old) is not type(new) or old != new:
+            changes.append(key_path)
+    elif data_type == configsuite.types.NamedDict:
+        _diff_named_dict(old, new, schema, key_path, changes)
+    elif data_type == configsuite.types.List:
+        _diff_list(old, new, schema, key_path, changes)
+    elif data_type == configsuite.types.Dict:
+        _diff_dict(old, new, schema, key_path, changes)
+    else:
+        msg = "Encountered unknown type {} while diffing snapshots"
+        raise TypeError(msg.format(str(data_type)))
+
+
+def diff_snapshots(old_snapshot, new_snapshot, schema):
+    """Returns the key paths of the elements that differ between two snapshots
+    of `schema`, as a tuple of tuples of keys and indices.
+
+    The key path of a basic value is reported if the value changed. For Lists
+    and Dicts the key paths of added and removed items are reported.
+    Subtrees that are shared by the snapshots, or are equal with equal
+    cached hashes, are skipped. Hence, diffing the snapshots of suites
+    sharing structure, e.g. a suite and a suite pushed on it, scales with
+    the size of the change.
+    """
+    changes = []
+    _diff(old_snapshot, new_snapshot, schema, (), changes)
+    return tuple(changes)
+
+
+def diff(old_suite, new_suite):
+    """Returns the key paths of the elements that differ between the snapshots
+    of two suites with the same schema, see `diff_snapshots`.
+
+    Raises
+    ------
+    ValueError
+        If the suites have different schemas.
+    AssertionError
+        If any of the suites are unreadable.
+    """
+    # pylint: disable=protected-access
+    if old_suite._schema_fingerprint != new_suite._schema_fingerprint:
+        raise ValueError("Cannot diff suites with different schemas")
+
+    return diff_snapshots(old_suite.snapshot, new_suite.snapshot, old_suite._schema)
@@ -22,68 +22,132 @@ from configsuite import MetaKeys as MK
 from configsuite import types
 
 
-def generate(schema, level=0):
-    indent = level * 4 * " "
-    element_sep = "\n\n"
+_ELEMENT_SEP = "\n\n"
+
+
+def _children(schema):
+    if schema[MK.Type] == types.NamedDict:
+        return tuple(schema[MK.Content].values())
+    elif schema[MK.Type] == types.List:
+        return (schema[MK.Content][MK.Item],)
+    elif schema[MK.Type] == types.Dict:
+        return (schema[MK.Content][MK.Key], schema[MK.Content][MK.Value])
+    return ()
+
+
+def _shared_schemas(schema):
+    seen = set()
+    shared = set()
+    stack = [schema]
+    while len(stack) > 0:
+        level_schema = stack.pop()
+        if id(level_schema) in seen:
+            shared.add(id(level_schema))
+            continue
+        seen.add(id(level_schema))
+        stack.extend(_children(level_schema))
+    return shared
 
-    docs = [indent + schema.get(MK.Description, "")]
 
+def _requirements(schema, indent):
     elem_vals = schema.get(MK.ElementValidators, ())
-    if len(elem_vals) > 0:
-        try:
-            docs += [
-                indent
-                + ":requirement: {}".format(
-                    ", ".join([elem_val.msg for elem_val in elem_vals])
-                )
-            ]
-        except AttributeError:
-            raise Exception(elem_vals[0].__name__)
+    if len(elem_vals) == 0:
+        return ()
 
-    if schema[MK.Type] == types.NamedDict:
+    try:
+        return (
+            _ELEMENT_SEP
+            + indent
+            + ":requirement: {}".format(
+                ", ".join([elem_val.msg for elem_val in elem_vals])
+            ),
+        )
+    except AttributeError:
+        raise Exception(elem_vals[0].__name__)
 
-        def req_child_marker(key):
-            child_req = not (
-                schema[MK.Content][key].get(MK.AllowNone, False)
-                or schema[MK.Content][key].get(MK.Default, None) is not None
-            )
-            return "*" if child_req else ""
-
-        docs += [
-            "\n".join(
-                (
-                    indent
-                    + "**{key}{req}:**".format(key=key, req=req_child_marker(key)),
-                    generate(value, level=level + 1),
-                )
-            )
-            for key, value in schema[MK.Content].items()
-        ]
+
+def _req_child_marker(child_schema):
+    child_req = not (
+        child_schema.get(MK.AllowNone, False)
+        or child_schema.get(MK.Default, None) is not None
+    )
+    return "*" if child_req else ""
+
+
+def _fragments(schema, level):
+    indent = level * 4 * " "
+
+    fragments = [indent + schema.get(MK.Description, "")]
+    fragments.extend(_requirements(schema, indent))
+
+    if schema[MK.Type] == types.NamedDict:
+        for key, value in schema[MK.Content].items():
+            fragments += [
+                _ELEMENT_SEP
+                + indent
+                + "**{key}{req}:**\n".format(key=key, req=_req_child_marker(value)),
+                (value, level + 1),
+            ]
     elif schema[MK.Type] == types.List:
-        docs += [
-            "\n".join(
-                [
-                    indent + "**<list_item>:**",
-                    generate(schema[MK.Content][MK.Item], level=level + 2),
-                ]
-            )
+        fragments += [
+            _ELEMENT_SEP + indent + "**<list_item>:**\n",
+            (schema[MK.Content][MK.Item], level + 2),
         ]
     elif schema[MK.Type] == types.Dict:
-        docs += [
-            "\n".join(
-                [
-                    indent + "**<key>:**",
-                    generate(schema[MK.Content][MK.Key], level=level + 2),
-                    "",
-                    indent + "**<value>:**",
-                    generate(schema[MK.Content][MK.Value], level=level + 2),
-                ]
-            )
+        fragments += [
+            _ELEMENT_SEP + indent + "**<key>:**\n",
+            (schema[MK.Content][MK.Key], level + 2),
+            _ELEMENT_SEP + indent + "**<value>:**\n",
+            (schema[MK.Content][MK.Value], level + 2),
         ]
     elif isinstance(schema[MK.Type], types.BasicType):
-        docs += [indent + ":type: {_type}".format(_type=schema[MK.Type].name)]
+        fragments.append(
+            _ELEMENT_SEP + indent + ":type: {_type}".format(_type=schema[MK.Type].name)
+        )
     else:
         err_msg = "Unexpected type ({}) in schema while generating documentation."
         raise TypeError(err_msg.format(schema[MK.Type]))
 
-    return element_sep.join(docs)
+    return fragments
+
+
+def _iter_generate(schema, level, shared, memo):
+    # Sub-schemas are expanded on an explicit stack, such that each fragment
+    # is yielded in constant time independently of the depth of the schema.
+    stack = list(reversed(_fragments(schema, level)))
+    while len(stack) > 0:
+        fragment = stack.pop()
+        if isinstance(fragment, str):
+            yield fragment
+            continue
+
+        child_schema, child_level = fragment
+        if id(child_schema) in shared:
+            key = (id(child_schema), child_level)
+            if key not in memo:
+                memo[key] = "".join(
+                    _iter_generate(child_schema, child_level, shared, memo)
+                )
+            yield memo[key]
+        else:
+            stack.extend(reversed(_fragments(child_schema, child_level)))
+
+
+def iter_generate(schema, level=0):
+    """Yields the documentation of `schema`, as given by `generate`, in
+    fragments. The fragments are produced in linear time in the size of the
+    documentation and, apart from sub-schemas occurring more than once in
+    `schema`, which are rendered once per level and reused, without keeping
+    the already yielded documentation in memory.
+    """
+    return _iter_generate(schema, level, _shared_schemas(schema), {})
+
+
+def write(schema, fileobj, level=0):
+    """Writes the documentation of `schema` to `fileobj` as it is generated."""
+    for fragment in iter_generate(schema, level=level):
+        fileobj.write(fragment)
+
+
+def generate(schema, level=0):
+    return "".join(iter_generate(schema, level=level))
@@ -0,0 +1,51 @@
+"""Copyright 2021 Equinor ASA and The Netherlands Organisation for
+Applied Scientific Research TNO.
+
+Licensed under the MIT license.
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the conditions stated in the LICENSE file in the project root for
+details.
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+"""
+
+
+import concurrent.futures
+import sys
+
+
+CHUNK_SIZE = 1024
+
+
+def chunks(items, chunk_size):
+    """Yields consecutive slices of `items` of length `chunk_size`, the last
+    of which might be shorter."""
+    for start in range(0, len(items), chunk_size):
+        end = start + chunk_size
+        yield items[start:end]
+
+
+def free_threading():
+    """Returns whether the interpreter runs without the global interpreter
+    lock, in which case threads execute Python code in parallel."""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+def parallel_executor(max_workers=None):
+    """Returns an executor that runs Python code in parallel, to be given as
+    the executor of `Transformer` or the chunk executor of `Validator`. That
+    is a thread pool on free-threaded Python and a process pool otherwise,
+    in which case the schema, the contexts and the configurations must be
+    picklable.
+    """
+    if free_threading():
+        return concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+    return concurrent.futures.ProcessPoolExecutor(max_workers=max_workers)
@@ -0,0 +1,128 @@
+"""Copyright 2021 Equinor ASA and The Netherlands Organisation for
+Applied Scientific Research TNO.
+
+Licensed under the MIT license.
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the conditions stated in the LICENSE file in the project root for
+details.
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+"""
+
+
+import datetime
+import json
+
+import configsuite
+from configsuite import MetaKeys as MK
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _identity(elem):
+    return elem
+
+
+def _compile_named_dict_exporter(schema):
+    content_schema = schema[MK.Content]
+    fields = tuple(sorted(content_schema.keys()))
+    exporters = tuple(compile_exporter(content_schema[key]) for key in fields)
+
+    def _export_named_dict(snapshot):
+        return {
+            field: exporter(value)
+            for field, exporter, value in zip(fields, exporters, snapshot)
+        }
+
+    return _export_named_dict
+
+
+def _compile_list_exporter(schema):
+    item_schema = schema[MK.Content][MK.Item]
+    if isinstance(item_schema[MK.Type], configsuite.BasicType):
+        return list
+
+    export_item = compile_exporter(item_schema)
+
+    def _export_list(snapshot):
+        return [export_item(item) for item in snapshot]
+
+    return _export_list
+
+
+def _compile_dict_exporter(schema):
+    export_key = compile_exporter(schema[MK.Content][MK.Key])
+    export_value = compile_exporter(schema[MK.Content][MK.Value])
+
+    def _export_dict(snapshot):
+        return {
+            export_key(key): export_value(value)
+            for key, value in zip(snapshot.keys(), snapshot.values())
+        }
+
+    return _export_dict
+
+
+def compile_exporter(schema):
+    """Compiles a function that converts snapshots of `schema` into plain
+    Python dictionaries, lists and basic types. Named dicts and dicts are
+    exported as dictionaries and lists as lists.
+    """
+    data_type = schema[MK.Type]
+    if isinstance(data_type, configsuite.BasicType):
+        return _identity
+    elif data_type == configsuite.types.NamedDict:
+        exporter = _compile_named_dict_exporter(schema)
+    elif data_type == configsuite.types.List:
+        exporter = _compile_list_exporter(schema)
+    elif data_type == configsuite.types.Dict:
+        exporter = _compile_dict_exporter(schema)
+    else:
+        msg = "Encountered unknown type {} while compiling exporter"
+        raise TypeError(msg.format(str(data_type)))
+
+    def _export(snapshot):
+        return None if snapshot is None else exporter(snapshot)
+
+    return _export
+
+
+def export(snapshot, schema):
+    """Exports `snapshot` of `schema` as plain Python dictionaries, lists and
+    basic types."""
+    return compile_exporter(schema)(snapshot)
+
+
+def _json_default(elem):
+    if isinstance(elem, (datetime.date, datetime.datetime)):
+        return elem.isoformat()
+    raise TypeError("Object of type {} is not JSON serializable".format(type(elem)))
+
+
+def dumps(primitive):
+    """Serializes an exported snapshot to a JSON string. Dates and datetimes
+    are serialized in ISO 8601 format. If orjson is installed it is used to
+    serialize, falling back to the standard library for unsupported values.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(primitive, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            pass
+
+    return json.dumps(primitive, default=_json_default, separators=(",", ":"))
+
+
+def export_json(snapshot, schema):
+    """Exports `snapshot` of `schema` as a JSON string."""
+    return dumps(export(snapshot, schema))
@@ -16,6 +16,7 @@ The above copyright notice and this permission notice shall be included
 in all copies or substantial portions of the Software.
 """
 
+import hashlib
 import os
 import importlib
 import inspect
@@ -146,7 +147,125 @@ def generate(schema, parent_section, parent_title=""):
     parent_section += section
 
 
+def _doc_fingerprint_elem(schema):
+    return (
+        schema[MK.Type].name,
+        schema.get(MK.Description, ""),
+        tuple(
+            validator.msg
+            for config_key in (MK.ElementValidators, MK.ContextValidators)
+            for validator in schema.get(config_key, [])
+        ),
+        tuple(
+            schema[config_key].msg
+            for config_key in (
+                MK.LayerTransformation,
+                MK.ContextTransformation,
+                MK.Transformation,
+            )
+            if config_key in schema
+        ),
+        tuple(
+            (key, _doc_fingerprint_elem(value))
+            for key, value in schema.get(MK.Content, {}).items()
+        ),
+    )
+
+
+def doc_fingerprint(schema):
+    """Returns a fingerprint of the parts of `schema` that are documented by
+    `generate`. Contrary to `configsuite.schema.schema_fingerprint` the
+    fingerprint is stable across processes, as validators and
+    transformations are only represented by their messages.
+    """
+    return hashlib.sha256(repr(_doc_fingerprint_elem(schema)).encode()).hexdigest()
+
+
+def _load_schema_func(schema_function_string):
+    if "." not in schema_function_string:
+        raise ValueError(
+            "Configsuite :module: has invalid format. "
+            + "Expected 'module.function', got {}".format(schema_function_string)
+        )
+
+    module_str, func_str = schema_function_string.rsplit(".", 1)
+
+    try:
+        module = importlib.import_module(module_str)
+    except (ImportError) as e:
+        raise ValueError(str(e))
+
+    try:
+        schema_func = getattr(module, func_str)
+    except (AttributeError) as e:
+        raise ValueError(str(e))
+
+    if not callable(schema_func):
+        err_msg = (
+            "The module.function given at Configsuite :module: "
+            + "must provide a callable function, the '{func_name}' was not"
+        )
+        raise ValueError(err_msg.format(func_name=func_str))
+
+    insp = inspect.getfullargspec(schema_func)
+    if len(insp.args) != 0:
+        err_msg = (
+            "The module.function given at Configsuite :module: "
+            + "can not require any arguments, the '{func_name}' "
+            + "takes {num_args} argument(s)"
+        )
+        raise ValueError(err_msg.format(func_name=func_str, num_args=len(insp.args)))
+
+    return schema_func
+
+
+def load_schema(schema_function_string):
+    """Returns the schema given by the `module.function` string of the
+    `:module:` option.
+
+    Raises
+    ------
+    ValueError
+        If the module or the function cannot be loaded, the function requires
+        arguments or it does not return a dictionary.
+    """
+    schema_func = _load_schema_func(schema_function_string)
+    schema = schema_func()
+    if not isinstance(schema, dict):
+        err_msg = (
+            "The module.function given at Configsuite :module: "
+            + "is expected to return a dictionary object\n"
+            + "The function '{func_name}' returned a {return_type}"
+        )
+        raise ValueError(
+            err_msg.format(
+                func_name=schema_function_string.rsplit(".", 1)[1],
+                return_type=type(schema),
+            )
+        )
+    return schema
+
+
+def _env_schemas(env):
+    if not hasattr(env, "configsuite_schemas"):
+        env.configsuite_schemas = {}
+    return env.configsuite_schemas
+
+
+def _env_sections(env):
+    if not hasattr(env, "configsuite_sections"):
+        env.configsuite_sections = {}
+    return env.configsuite_sections
+
+
 class ConfigsuiteDocDirective(Directive):
+    """Documents the schema given by the `:module:` option.
+
+    The generated section is cached in the Sphinx environment by the
+    `doc_fingerprint` of the schema, such that a schema documented in many
+    places, or unchanged between incremental builds, is only generated once.
+    """
+
     has_content = True
     option_spec = {"module": unchanged_required}
 
@@ -155,57 +274,78 @@ class ConfigsuiteDocDirective(Directive):
             raise self.error("Required :module: argument missing")
 
         schema_function_string = self.options.get("module")
-
-        if "." not in schema_function_string:
-            raise self.error(
-                "Configsuite :module: has invalid format. "
-                + "Expected 'module.function', got {}".format(schema_function_string)
-            )
-
-        module_str, func_str = schema_function_string.rsplit(".", 1)
-
-        try:
-            module = importlib.import_module(module_str)
-        except (ImportError) as e:
-            raise self.error(str(e))
-
         try:
-            schema_func = getattr(module, func_str)
-        except (AttributeError) as e:
+            schema = load_schema(schema_function_string)
+        except ValueError as e:
             raise self.error(str(e))
 
-        if not callable(schema_func):
-            err_msg = (
-                "The module.function given at Configsuite :module: "
-                + "must provide a callable function, the '{func_name}' was not"
-            )
-            raise self.error(err_msg.format(func_name=func_str))
-
-        insp = inspect.getfullargspec(schema_func)
-        if len(insp.args) != 0:
-            err_msg = (
-                "The module.function given at Configsuite :module: "
-                + "can not require any arguments, the '{func_name}' "
-                + "takes {num_args} argument(s)"
-            )
-            raise self.error(
-                err_msg.format(func_name=func_str, num_args=len(insp.args))
-            )
-
-        schema = schema_func()
-        if not isinstance(schema, dict):
-            err_msg = (
-                "The module.function given at Configsuite :module: "
-                + "is expected to return a dictionary object\n"
-                + "The function '{func_name}' returned a {return_type}"
-            )
-            raise self.error(
-                err_msg.format(func_name=func_str, return_type=type(schema))
-            )
-
-        section = cs_container(classes=["cs_top_container"])
-        generate(schema, section)
-        return [section]
+        fingerprint = doc_fingerprint(schema)
+        env = getattr(self.state.document.settings, "env", None)
+        if env is None:
+            section = cs_container(classes=["cs_top_container"])
+            generate(schema, section)
+            return [section]
+
+        _env_schemas(env).setdefault(env.docname, {})[
+            schema_function_string
+        ] = fingerprint
+
+        sections = _env_sections(env)
+        if fingerprint not in sections:
+            section = cs_container(classes=["cs_top_container"])
+            generate(schema, section)
+            sections[fingerprint] = section
+        return [sections[fingerprint].deepcopy()]
+
+
+def purge_schemas(app, env, docname):  # pylint: disable=unused-argument
+    _env_schemas(env).pop(docname, None)
+
+
+def merge_schemas(app, env, docnames, other):  # pylint: disable=unused-argument
+    schemas = _env_schemas(other)
+    for docname in docnames:
+        if docname in schemas:
+            _env_schemas(env)[docname] = schemas[docname]
+    _env_sections(env).update(_env_sections(other))
+
+
+def outdated_schema_docs(_app, env, _added, changed, removed):
+    """Returns the documents documenting a schema that has changed since the
+    document was read."""
+    fingerprints = {}
+
+    def _fingerprint(schema_function_string):
+        if schema_function_string not in fingerprints:
+            try:
+                schema = load_schema(schema_function_string)
+                fingerprints[schema_function_string] = doc_fingerprint(schema)
+            except ValueError:
+                fingerprints[schema_function_string] = None
+        return fingerprints[schema_function_string]
+
+    outdated = []
+    for docname, schemas in _env_schemas(env).items():
+        if docname in removed or docname in changed:
+            continue
+        for schema_function_string, fingerprint in schemas.items():
+            if _fingerprint(schema_function_string) != fingerprint:
+                outdated.append(docname)
+                break
+    return outdated
+
+
+def prune_sections(app, env):  # pylint: disable=unused-argument
+    """Drops the cached sections of schemas no longer documented."""
+    used = set(
+        fingerprint
+        for schemas in _env_schemas(env).values()
+        for fingerprint in schemas.values()
+    )
+    sections = _env_sections(env)
+    for fingerprint in set(sections) - used:
+        del sections[fingerprint]
+    return []
 
 
 def setup(app):
@@ -234,4 +374,14 @@ def setup(app):
 
     app.add_directive("configsuite", ConfigsuiteDocDirective)
 
-    return {"version": configsuite.__version__}
+    app.connect("env-purge-doc", purge_schemas)
+    app.connect("env-merge-info", merge_schemas)
+    app.connect("env-get-outdated", outdated_schema_docs)
+    app.connect("env-updated", prune_sections)
+
+    return {
+        "version": configsuite.__version__,
+        "env_version": 1,
+        "parallel_read_safe": True,
+        "parallel_write_safe": True,
+    }
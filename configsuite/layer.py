@@ -0,0 +1,328 @@
+"""Copyright 2021 Equinor ASA and The Netherlands Organisation for
+Applied Scientific Research TNO.
+
+Licensed under the MIT license.
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the conditions stated in the LICENSE file in the project root for
+details.
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+"""
+
+
+import collections
+import copy
+import hashlib
+import sys
+import threading
+
+import configsuite
+from configsuite import MetaKeys as MK
+from configsuite.schema import schema_fingerprint
+
+
+def _not_container(schema):
+    return not isinstance(schema[MK.Type], configsuite.types.Collection)
+
+
+def readability_errors(schema, config):
+    """Returns the errors that makes `config` unreadable with respect to
+    `schema`, i.e. errors in the container structure of the configuration.
+    """
+    readable_errors = (configsuite.UnknownKeyError, configsuite.MissingKeyError)
+
+    container_validator = configsuite.Validator(
+        schema, stop_condition=_not_container, apply_validators=False
+    )
+    val_res = container_validator.validate(config)
+    return tuple(
+        [error for error in val_res.errors if not isinstance(error, readable_errors)]
+    )
+
+
+class _StringInterner(object):
+    def __init__(self):
+        self.interned_bytes = 0
+        self._replaced = set()
+
+    def _intern(self, elem):
+        if type(elem) is not str:
+            return elem
+
+        interned = sys.intern(elem)
+        if interned is not elem and id(elem) not in self._replaced:
+            # Each replaced string is counted once, no matter how many times
+            # it occurs in the layer.
+            self._replaced.add(id(elem))
+            self.interned_bytes += sys.getsizeof(elem)
+        return interned
+
+    def intern(self, layer, schema):
+        """Returns a copy of `layer` where the `String`s of the schema are
+        interned. Parts of the layer not matching the schema are kept as is.
+        """
+        data_type = schema[MK.Type]
+        if data_type == configsuite.types.String:
+            return self._intern(layer)
+        elif data_type == configsuite.types.NamedDict and isinstance(layer, dict):
+            content_schema = schema[MK.Content]
+            return {
+                key: (
+                    self.intern(value, content_schema[key])
+                    if key in content_schema
+                    else value
+                )
+                for key, value in layer.items()
+            }
+        elif data_type == configsuite.types.List and isinstance(layer, (list, tuple)):
+            item_schema = schema[MK.Content][MK.Item]
+            return type(layer)([self.intern(elem, item_schema) for elem in layer])
+        elif data_type == configsuite.types.Dict and isinstance(layer, dict):
+            key_schema = schema[MK.Content][MK.Key]
+            value_schema = schema[MK.Content][MK.Value]
+            return {
+                self.intern(key, key_schema): self.intern(value, value_schema)
+                for key, value in layer.items()
+            }
+        return layer
+
+
+class PreparedLayer(object):
+    """A layer that has been layer transformed and checked for readability
+    with respect to a `schema`.
+
+    A prepared layer can be passed as a layer, or as the raw config, to any
+    number of suites with the same schema without being copied, transformed
+    or checked again. If it is given to a suite with a different schema it
+    is prepared again from the original layer, which is only retained if
+    `keep_raw_layer` is true.
+
+    Parameters
+    ----------
+    layer
+        The layer of configuration to prepare. The layer is copied and hence
+        later changes to `layer` do not affect the prepared layer.
+    schema
+        The schema of the suites the layer is to be used in. Note that the
+        schema is only validated when the layer is used in a suite.
+    executor: concurrent.futures.Executor, optional
+        Executor used for the layer transformations, see `ConfigSuite`.
+    intern_strings: bool, optional
+        If true, the strings of the transformed layer that are `String` keys
+        or values in the schema are interned, such that duplicate strings
+        share memory.
+    keep_raw_layer: bool, optional
+        If true, a copy of `layer` is retained such that the layer can be
+        prepared again for other schemas. Suites prepare their layers without
+        retaining them, as a suite never changes schema.
+    """
+
+    def __init__(
+        self,
+        layer,
+        schema,
+        executor=None,
+        intern_strings=False,
+        keep_raw_layer=True,
+    ):
+        self._raw_layer = copy.deepcopy(layer) if keep_raw_layer else None
+        self._schema = schema
+        self._fingerprint = schema_fingerprint(schema)
+        self._intern_strings = intern_strings
+
+        layer_transformer = configsuite.Transformer(
+            schema, MK.LayerTransformation, (), bottom_up=False, executor=executor
+        )
+        # Layer transformations may modify their input, hence they are given
+        # a copy, which is not retained.
+        trans_res = layer_transformer.transform(copy.deepcopy(layer))
+        self._layer = trans_res.result
+        self._errors = trans_res.errors
+        self._interned_bytes = 0
+        if intern_strings:
+            self._intern_layers()
+        self._readability_errors = readability_errors(schema, self._layer)
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        # Callables are fingerprinted by identity, which differs between
+        # processes.
+        self._fingerprint = schema_fingerprint(self._schema)
+
+    @property
+    def layer(self):
+        """The layer after the layer transformations are applied."""
+        return self._layer
+
+    @property
+    def raw_layer(self):
+        """A copy of the layer as given, or `None` if it was not retained."""
+        return copy.deepcopy(self._raw_layer)
+
+    @property
+    def schema_fingerprint(self):
+        """The fingerprint of the schema the layer is prepared for."""
+        return self._fingerprint
+
+    @property
+    def errors(self):
+        """The errors that occurred while applying the layer transformations."""
+        return self._errors
+
+    @property
+    def readability_errors(self):
+        """The errors that makes the transformed layer unreadable. The errors
+        are not associated with a layer index."""
+        return self._readability_errors
+
+    @property
+    def intern_strings(self):
+        """Whether the strings of the layer are interned."""
+        return self._intern_strings
+
+    @property
+    def interned_bytes(self):
+        """The number of bytes of the distinct strings the layer no longer
+        references as they were replaced by interned strings. The memory is
+        freed once the strings are not referenced elsewhere either, e.g. by
+        the original layer."""
+        return self._interned_bytes
+
+    def prepare(self, schema, fingerprint=None, executor=None, intern_strings=False):
+        """Returns a layer prepared for `schema`, which is the layer itself if
+        it was prepared for the same schema and with its strings interned if
+        `intern_strings` is true."""
+        if fingerprint is None:
+            fingerprint = schema_fingerprint(schema)
+
+        if fingerprint == self._fingerprint:
+            if self._intern_strings or not intern_strings:
+                return self
+            return self._interned()
+
+        if self._raw_layer is None:
+            raise ValueError(
+                "The layer was prepared for another schema and cannot be prepared "
+                "again as it was not given keep_raw_layer=True"
+            )
+        return PreparedLayer(
+            self._raw_layer, schema, executor=executor, intern_strings=intern_strings
+        )
+
+    def _intern_layers(self):
+        interner = _StringInterner()
+        self._layer = interner.intern(self._layer, self._schema)
+        if self._raw_layer is not None:
+            self._raw_layer = interner.intern(self._raw_layer, self._schema)
+        self._interned_bytes = interner.interned_bytes
+
+    def _interned(self):
+        interned_layer = copy.copy(self)
+        interned_layer._intern_strings = True
+        interned_layer._intern_layers()
+        return interned_layer
+
+
+def layer_digest(layer):
+    """Returns a digest of the content of `layer` that can be used in place
+    of comparing the layers. Equal layers have equal digests.
+    """
+    if isinstance(layer, dict):
+        parts = sorted(
+            layer_digest(key) + layer_digest(value) for key, value in layer.items()
+        )
+        payload = b"dict" + b"".join(parts)
+    elif isinstance(layer, (list, tuple)):
+        payload = type(layer).__name__.encode() + b"".join(
+            layer_digest(elem) for elem in layer
+        )
+    else:
+        payload = "{}:{!r}".format(type(layer).__name__, layer).encode()
+    return hashlib.sha256(payload).digest()
+
+
+class LayerCache(object):
+    """A content addressed cache of prepared layers.
+
+    Layers are looked up by the fingerprint of the schema and the content
+    digest of the layer, see `layer_digest`, without retaining the layers
+    themselves. Hence, a layer that occurs in many suites, or many times in the
+    same suite, is only transformed and checked for readability once. The
+    least recently used layers are evicted when more than `maxsize` layers are
+    cached. The cached layers retain their schemas, and hence the callables
+    that are fingerprinted by identity.
+    """
+
+    def __init__(self, maxsize=128):
+        if maxsize < 1:
+            raise ValueError("Expected maxsize to be positive, was {}".format(maxsize))
+
+        self._maxsize = maxsize
+        self._layers = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._layers)
+
+    @property
+    def maxsize(self):
+        return self._maxsize
+
+    def _key(self, layer, fingerprint, intern_strings=False):
+        return (fingerprint, intern_strings, layer_digest(layer))
+
+    def prepare(
+        self, layer, schema, fingerprint=None, executor=None, intern_strings=False
+    ):
+        """Returns `layer` prepared for `schema`, reusing a cached prepared
+        layer if an equal layer has been prepared for the same schema."""
+        if fingerprint is None:
+            fingerprint = schema_fingerprint(schema)
+
+        key = self._key(layer, fingerprint, intern_strings=intern_strings)
+        with self._lock:
+            prepared_layer = self._layers.get(key)
+            # A layer prepared for another schema with the same fingerprint is
+            # prepared again and replaced.
+            # pylint: disable=protected-access
+            if prepared_layer is not None and prepared_layer._schema == schema:
+                self._layers.move_to_end(key)
+                return prepared_layer
+
+        prepared_layer = PreparedLayer(
+            layer,
+            schema,
+            executor=executor,
+            intern_strings=intern_strings,
+            keep_raw_layer=False,
+        )
+        with self._lock:
+            self._layers[key] = prepared_layer
+            self._layers.move_to_end(key)
+            while len(self._layers) > self._maxsize:
+                self._layers.popitem(last=False)
+
+        return prepared_layer
+
+    def evict(self, layer, schema):
+        """Evicts `layer` prepared for `schema` from the cache. Returns whether
+        the layer was cached."""
+        fingerprint = schema_fingerprint(schema)
+        keys = [
+            self._key(layer, fingerprint, intern_strings=flag) for flag in (False, True)
+        ]
+        with self._lock:
+            evicted = [self._layers.pop(key, None) is not None for key in keys]
+        return any(evicted)
+
+    def clear(self):
+        """Evicts all layers from the cache."""
+        with self._lock:
+            self._layers.clear()
@@ -356,3 +356,40 @@ def _assert_valid_dict_schema(schema, validate_named_keys, deduce_required):
 
     _assert_valid_schema(content[MK.Key], False, validate_named_keys, deduce_required)
     _assert_valid_schema(content[MK.Value], False, validate_named_keys, deduce_required)
+
+
+def _fingerprint_elem(elem):
+    if isinstance(elem, dict):
+        return (
+            "dict",
+            tuple(
+                sorted(
+                    (
+                        (type(key).__name__, str(key), _fingerprint_elem(value))
+                        for key, value in elem.items()
+                    ),
+                    key=lambda item: item[:2],
+                )
+            ),
+        )
+    elif isinstance(elem, (types.BasicType, types.Collection)):
+        return ("type", elem.name, id(elem.validate))
+    elif isinstance(elem, (list, tuple)):
+        return ("sequence", tuple(_fingerprint_elem(value) for value in elem))
+    elif callable(elem):
+        return ("callable", id(elem))
+
+    try:
+        hash(elem)
+        return (type(elem).__name__, elem)
+    except TypeError:
+        return (type(elem).__name__, repr(elem))
+
+
+def schema_fingerprint(schema):
+    """Returns a fingerprint of `schema` that is equal for schemas with the
+    same structure, values and callables. Callables are compared by identity,
+    hence the fingerprint is only meaningful while the callables are alive
+    and cannot be compared across processes.
+    """
+    return _fingerprint_elem(schema)
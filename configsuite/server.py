@@ -0,0 +1,377 @@
+"""Copyright 2021 Equinor ASA and The Netherlands Organisation for
+Applied Scientific Research TNO.
+
+Licensed under the MIT license.
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the conditions stated in the LICENSE file in the project root for
+details.
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+"""
+
+
+import argparse
+import importlib
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+
+import configsuite
+from configsuite import validation_errors
+from configsuite.config import _no_context, _validate_schema
+from configsuite.layer import LayerCache
+from configsuite.validator import ValidationResult
+
+
+def _load_function(spec):
+    if "." not in spec:
+        raise ValueError("Expected 'module.function', got {}".format(spec))
+
+    module_str, func_str = spec.rsplit(".", 1)
+    function = getattr(importlib.import_module(module_str), func_str)
+    if not callable(function):
+        raise TypeError("Expected {} to be callable".format(spec))
+    return function
+
+
+class SchemaRegistry(object):
+    """A thread safe registry of the schemas and context extractors served,
+    loaded from `module.function` specs.
+
+    A schema spec names a function taking no arguments and returning the
+    schema, as the `:module:` option of the Sphinx extension. Only schemas
+    and extractors added by `add_schema` and `add_extractor` are served,
+    unless `load_on_request` is true, in which case any importable function
+    named by a request is loaded and called. Hence, `load_on_request` must
+    only be used with trusted clients.
+
+    The schemas are validated and copied once, and a `LayerCache` is kept
+    per registry such that layers shared by many requests are only prepared
+    once.
+    """
+
+    def __init__(
+        self, deduce_required=False, layer_cache_size=128, load_on_request=False
+    ):
+        self._deduce_required = deduce_required
+        self._load_on_request = load_on_request
+        self._schemas = {}
+        self._extractors = {}
+        self._layer_cache = LayerCache(maxsize=layer_cache_size)
+        self._lock = threading.Lock()
+
+    @property
+    def deduce_required(self):
+        return self._deduce_required
+
+    @property
+    def layer_cache(self):
+        return self._layer_cache
+
+    def __contains__(self, spec):
+        return spec in self._schemas
+
+    def add_extractor(self, spec):
+        """Loads the context extractor named by `spec` to be served.
+
+        Raises
+        ------
+        ImportError, AttributeError
+            If the module or the function of `spec` does not exist.
+        TypeError, ValueError
+            If `spec` is malformed or does not name a function.
+        """
+        function = _load_function(spec)
+        with self._lock:
+            return self._extractors.setdefault(spec, function)
+
+    def add_schema(self, spec):
+        """Loads the schema returned by the function named by `spec` to be
+        served, validating and copying it once.
+
+        Raises
+        ------
+        ImportError, AttributeError
+            If the module or the function of `spec` does not exist.
+        TypeError, KeyError, ValueError
+            If `spec` is malformed or does not give a valid schema.
+        """
+        schema = _load_function(spec)()
+        if not isinstance(schema, dict):
+            msg = "Expected {} to return a dictionary, got {}"
+            raise ValueError(msg.format(spec, type(schema)))
+        schema = _validate_schema(schema, deduce_required=self._deduce_required)
+
+        with self._lock:
+            return self._schemas.setdefault(spec, schema)
+
+    def extractor(self, spec):
+        """Returns the context extractor named by `spec`.
+
+        Raises
+        ------
+        ValueError
+            If the extractor is not served.
+        """
+        extractor = self._extractors.get(spec)
+        if extractor is not None:
+            return extractor
+        if not self._load_on_request:
+            raise ValueError("Context extractor {} is not served".format(spec))
+        return self.add_extractor(spec)
+
+    def schema(self, spec):
+        """Returns the validated schema named by `spec`, see `add_schema`.
+
+        Raises
+        ------
+        ValueError
+            If the schema is not served.
+        """
+        schema = self._schemas.get(spec)
+        if schema is not None:
+            return schema
+        if not self._load_on_request:
+            raise ValueError("Schema {} is not served".format(spec))
+        return self.add_schema(spec)
+
+
+def _encode_error(error):
+    return {
+        "type": error.__class__.__name__,
+        "msg": error.msg,
+        "key_path": list(error.key_path),
+        "layer": error.layer,
+    }
+
+
+def _decode_error(error):
+    error_class = getattr(validation_errors, error["type"], None)
+    if not (
+        isinstance(error_class, type)
+        and issubclass(error_class, validation_errors.ValidationError)
+    ):
+        error_class = validation_errors.ValidationError
+    return error_class(error["msg"], tuple(error["key_path"]), layer=error["layer"])
+
+
+def _extractor(registry, request, key):
+    spec = request.get(key)
+    if spec is None:
+        return _no_context
+    return registry.extractor(spec)
+
+
+def validate_request(registry, request):
+    """Validates the configuration of `request` and returns the response.
+
+    A request is a dictionary with the `schema` spec and the `config` to
+    validate, and optionally a list of `layers` and the specs of the
+    `extract_validation_context` and `extract_transformation_context`
+    functions. The response holds `readable`, `valid` and the encoded
+    `errors`, or only an `error` message if the request could not be served,
+    e.g. due to a schema that is not served or an extractor that failed.
+    """
+    if not isinstance(request, dict) or "schema" not in request:
+        return {"error": "Expected a request with a schema"}
+    if "config" not in request:
+        return {"error": "Expected a request with a config"}
+
+    try:
+        suite = configsuite.ConfigSuite(
+            request["config"],
+            registry.schema(request["schema"]),
+            layers=request.get("layers", ()),
+            extract_validation_context=_extractor(
+                registry, request, "extract_validation_context"
+            ),
+            extract_transformation_context=_extractor(
+                registry, request, "extract_transformation_context"
+            ),
+            deduce_required=registry.deduce_required,
+            layer_cache=registry.layer_cache,
+        )
+        return {
+            "readable": suite.readable,
+            "valid": suite.valid,
+            "errors": [_encode_error(error) for error in suite.errors],
+        }
+    # A failing request must not take down the connection, or the server.
+    # pylint: disable=broad-except
+    except Exception as err:
+        return {"error": "{}: {}".format(err.__class__.__name__, err)}
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            if len(line.strip()) == 0:
+                continue
+
+            try:
+                request = json.loads(line.decode("utf-8"))
+            except ValueError as err:
+                response = {"error": "Invalid request: {}".format(err)}
+            else:
+                response = validate_request(self.server.registry, request)
+
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class ValidationServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """A server validating configurations sent to the Unix socket at `path`.
+
+    The protocol is newline delimited JSON, one request per line answered
+    by one response per line as described by `validate_request`. Each
+    connection is served by a thread, and a connection can send any number
+    of requests. Schemas are kept loaded in `registry` between requests.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, path, registry=None):
+        self.registry = SchemaRegistry() if registry is None else registry
+        socketserver.UnixStreamServer.__init__(self, path, _RequestHandler)
+
+    def server_close(self):
+        socketserver.UnixStreamServer.server_close(self)
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+
+
+class Client(object):
+    """A client of a `ValidationServer` listening at `path`.
+
+    The connection is kept open until `close` is called, or the client is
+    used as a context manager and the context is exited.
+    """
+
+    def __init__(self, path, timeout=None):
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.settimeout(timeout)
+        self._socket.connect(path)
+        self._rfile = self._socket.makefile("rb")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self._rfile.close()
+        self._socket.close()
+
+    def request(self, request):
+        """Sends `request` to the server and returns the decoded response."""
+        self._socket.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        line = self._rfile.readline()
+        if len(line) == 0:
+            raise ConnectionError("The validation server closed the connection")
+        return json.loads(line.decode("utf-8"))
+
+    def validate(
+        self,
+        config,
+        schema,
+        layers=(),
+        extract_validation_context=None,
+        extract_transformation_context=None,
+    ):
+        """Validates `config` with `layers` against the schema given by the
+        `schema` spec and returns a `ValidationResult`. The context extractors
+        are given as `module.function` specs.
+
+        Raises
+        ------
+        ValueError
+            If the server could not serve the request, for instance due to an
+            invalid schema spec.
+        """
+        request = {"schema": schema, "config": config, "layers": list(layers)}
+        if extract_validation_context is not None:
+            request["extract_validation_context"] = extract_validation_context
+        if extract_transformation_context is not None:
+            request["extract_transformation_context"] = extract_transformation_context
+
+        response = self.request(request)
+        if "error" in response:
+            raise ValueError(response["error"])
+        return ValidationResult(
+            valid=response["valid"],
+            errors=tuple(_decode_error(error) for error in response["errors"]),
+        )
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="python -m configsuite.server",
+        description="Validate configurations sent to a Unix socket.",
+    )
+    parser.add_argument("socket", help="Path of the Unix socket to listen on")
+    parser.add_argument(
+        "--schema",
+        action="append",
+        default=[],
+        help="Schema to serve, given as module.function",
+    )
+    parser.add_argument(
+        "--extractor",
+        action="append",
+        default=[],
+        help="Context extractor to serve, given as module.function",
+    )
+    parser.add_argument(
+        "--load-on-request",
+        action="store_true",
+        help=(
+            "Load and call any module.function named by a request, "
+            "only use with trusted clients"
+        ),
+    )
+    parser.add_argument(
+        "--deduce-required",
+        action="store_true",
+        help="Deduce whether schema entries are required",
+    )
+    return parser.parse_args(argv)
+
+
+def _exit(*_):
+    sys.exit(0)
+
+
+def main(argv=None):
+    signal.signal(signal.SIGTERM, _exit)
+    args = _parse_args(argv)
+    registry = SchemaRegistry(
+        deduce_required=args.deduce_required, load_on_request=args.load_on_request
+    )
+    for spec in args.schema:
+        registry.add_schema(spec)
+    for spec in args.extractor:
+        registry.add_extractor(spec)
+
+    server = ValidationServer(args.socket, registry=registry)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,788 @@
+"""Copyright 2021 Equinor ASA and The Netherlands Organisation for
+Applied Scientific Research TNO.
+
+Licensed under the MIT license.
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the conditions stated in the LICENSE file in the project root for
+details.
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+"""
+
+
+import array
+import collections
+import operator
+import sys
+
+import configsuite
+from configsuite import MetaKeys as MK
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    from multiprocessing.shared_memory import SharedMemory
+except ImportError:
+    SharedMemory = None
+
+
+SHARED_MEMORY_MIN_LENGTH = 512
+
+
+KeyValuePair = collections.namedtuple("KeyValuePair", ["key", "value"])
+
+
+class ListSnapshot(tuple):
+    """An immutable snapshot of a List, which is a tuple of the elements."""
+
+    __slots__ = ()
+
+    def __reduce__(self):
+        return (type(self), (tuple(self),))
+
+
+class CompactListSnapshot(object):
+    """A compact snapshot of a List. It behaves as an immutable tuple of the
+    elements, but caches its hash in a slot.
+
+    The hash of a snapshot is computed from the (cached) hashes of its
+    elements and is cached on first use. Equality short-circuits on identity
+    and on mismatching cached hashes.
+    """
+
+    __slots__ = ("_items", "_hash")
+
+    def __init__(self, items=()):
+        self._items = tuple(items)
+        self._hash = None
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __getitem__(self, idx):
+        return self._items[idx]
+
+    def __contains__(self, elem):
+        return elem in self._items
+
+    def index(self, elem):
+        return self._items.index(elem)
+
+    def count(self, elem):
+        return self._items.count(elem)
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash(self._items)
+        return self._hash
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if isinstance(other, CompactListSnapshot):
+            if self._hash is not None and other._hash is not None:
+                if self._hash != other._hash:
+                    return False
+            return self._items == other._items
+        if isinstance(other, (tuple, NumericListSnapshot, ColumnarListSnapshot)):
+            return self._items == tuple(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __repr__(self):
+        return "{}({})".format(type(self).__name__, self._items)
+
+    def __reduce__(self):
+        return (type(self), (self._items,))
+
+
+class DictSnapshot(object):
+    """An immutable snapshot of a Dict.
+
+    The snapshot iterates over its elements as `KeyValuePair`s, and hence
+    membership is tested for key-value pairs. Lookup by key, through
+    `snapshot[key]` and `snapshot.get(key)`, as well as testing membership of
+    keys through `key in snapshot.keys()` are constant time operations.
+    """
+
+    __slots__ = ("_items", "_hash")
+
+    def __init__(self, pairs=()):
+        self._items = dict(pairs)
+        self._hash = None
+
+    def __getitem__(self, key):
+        return self._items[key]
+
+    def get(self, key, default=None):
+        return self._items.get(key, default)
+
+    def __contains__(self, pair):
+        if not isinstance(pair, tuple) or len(pair) != 2:
+            return False
+        key, value = pair
+        try:
+            return key in self._items and self._items[key] == value
+        except TypeError:
+            return False
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return (KeyValuePair(key, value) for key, value in self._items.items())
+
+    def keys(self):
+        return self._items.keys()
+
+    def values(self):
+        return self._items.values()
+
+    def items(self):
+        return iter(self)
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if isinstance(other, DictSnapshot):
+            if self._hash is not None and other._hash is not None:
+                if self._hash != other._hash:
+                    return False
+            return list(self._items.items()) == list(other._items.items())
+        if isinstance(other, tuple):
+            return tuple(self) == other
+        return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash(tuple(self))
+        return self._hash
+
+    def __repr__(self):
+        return "{}({})".format(type(self).__name__, tuple(self))
+
+    def __reduce__(self):
+        return (type(self), (tuple(self._items.items()),))
+
+
+_NAMED_DICT_CLASSES = {}
+
+
+def _restore_named_dict(name, fields, values):
+    return named_dict_class(name, fields)(*values)
+
+
+def _reduce_named_dict(self):
+    return (_restore_named_dict, (type(self).__name__, self._fields, tuple(self)))
+
+
+def named_dict_class(name, fields):
+    """Returns the snapshot class of a NamedDict with the given `name` and
+    `fields`.
+
+    The classes are registered by name and fields, such that all snapshots of
+    the same schema level share a class. Instances are pickled by their name,
+    fields and values and are restored to the registered class, hence they
+    can be passed to other processes. As tuples cannot have slots of their own
+    the snapshots do not cache their hashes, see `compact_named_dict_class`.
+    """
+    fields = tuple(sorted(fields))
+    registry_key = (name, fields)
+    if registry_key not in _NAMED_DICT_CLASSES:
+        base = collections.namedtuple(name, fields)
+        named_dict = type(
+            name, (base,), {"__slots__": (), "__reduce__": _reduce_named_dict}
+        )
+        _NAMED_DICT_CLASSES.setdefault(registry_key, named_dict)
+    return _NAMED_DICT_CLASSES[registry_key]
+
+
+class _CompactNamedDict(object):
+    """Base of the compact snapshots of NamedDicts, which store their values
+    in slots. They behave as the tuple based snapshots of NamedDicts, but
+    without the memory overhead of a tuple.
+    """
+
+    __slots__ = ("_hash",)
+    _fields = ()
+
+    def __init__(self, *values):
+        if len(values) != len(self._fields):
+            msg = "Expected {} values, got {}"
+            raise TypeError(msg.format(len(self._fields), len(values)))
+
+        for field, value in zip(self._fields, values):
+            object.__setattr__(self, field, value)
+        object.__setattr__(self, "_hash", None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Cannot set attribute {} of a snapshot".format(name))
+
+    def __delattr__(self, name):
+        raise AttributeError("Cannot delete attribute {} of a snapshot".format(name))
+
+    def __iter__(self):
+        return (getattr(self, field) for field in self._fields)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return tuple(self)[idx]
+        return getattr(self, self._fields[idx])
+
+    def _asdict(self):
+        return collections.OrderedDict(zip(self._fields, self))
+
+    def __hash__(self):
+        if self._hash is None:
+            object.__setattr__(self, "_hash", hash(tuple(self)))
+        return self._hash
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, (tuple, _CompactNamedDict)):
+            return NotImplemented
+
+        other_hash = getattr(other, "_hash", None)
+        if self._hash is not None and other_hash is not None:
+            if self._hash != other_hash:
+                return False
+        return tuple(self) == tuple(other)
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __repr__(self):
+        return "{}({})".format(
+            type(self).__name__,
+            ", ".join(
+                "{}={!r}".format(key, value) for key, value in zip(self._fields, self)
+            ),
+        )
+
+    def __reduce__(self):
+        return (
+            _restore_compact_named_dict,
+            (type(self).__name__, self._fields, tuple(self)),
+        )
+
+
+_COMPACT_NAMED_DICT_CLASSES = {}
+
+
+def _restore_compact_named_dict(name, fields, values):
+    return compact_named_dict_class(name, fields)(*values)
+
+
+def compact_named_dict_class(name, fields):
+    """Returns the compact snapshot class of a NamedDict with the given
+    `name` and `fields`, storing its values in slots. The classes are
+    registered and pickled as the classes of `named_dict_class`.
+    """
+    fields = tuple(sorted(fields))
+    registry_key = (name, fields)
+    if registry_key not in _COMPACT_NAMED_DICT_CLASSES:
+        named_dict = type(
+            name, (_CompactNamedDict,), {"__slots__": fields, "_fields": fields}
+        )
+        _COMPACT_NAMED_DICT_CLASSES.setdefault(registry_key, named_dict)
+    return _COMPACT_NAMED_DICT_CLASSES[registry_key]
+
+
+class NumericListSnapshot(object):
+    """A compact snapshot of a List of integers or floats, storing the
+    elements in an `array.array`. It behaves as an immutable tuple of the
+    elements.
+    """
+
+    __slots__ = ("_data", "_hash")
+
+    def __init__(self, data):
+        self._data = data
+        self._hash = None
+
+    @classmethod
+    def from_elements(cls, elems):
+        """Returns a numeric list snapshot of `elems`, or `None` if the elements
+        are not all integers fitting in 64 bits or all floats."""
+        if len(elems) == 0:
+            return None
+
+        elem_types = set(type(elem) for elem in elems)
+        if elem_types == {int}:
+            typecode = "q"
+        elif elem_types == {float}:
+            typecode = "d"
+        else:
+            return None
+
+        try:
+            return cls(array.array(typecode, elems))
+        except OverflowError:
+            return None
+
+    @property
+    def typecode(self):
+        """The typecode of the underlying `array.array`."""
+        return self._data.typecode
+
+    def __len__(self):
+        return len(self._data)
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return tuple(self._data[idx])
+        return self._data[idx]
+
+    def __contains__(self, elem):
+        return elem in self._data
+
+    def index(self, elem):
+        return self._data.index(elem)
+
+    def count(self, elem):
+        return self._data.count(elem)
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash(tuple(self._data))
+        return self._hash
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if isinstance(other, NumericListSnapshot):
+            if self._hash is not None and other._hash is not None:
+                if self._hash != other._hash:
+                    return False
+            return self._data == other._data
+        if isinstance(other, tuple):
+            return tuple(self._data) == other
+        return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __repr__(self):
+        return "{}({})".format(type(self).__name__, tuple(self._data))
+
+    def __reduce__(self):
+        return (type(self), (self._data,))
+
+
+def _attach_shared_memory(name):
+    try:
+        return SharedMemory(name=name, track=False)
+    except TypeError:
+        # Before Python 3.13 the block is registered with the resource
+        # tracker, which is shared with the process that created it when
+        # attaching from a multiprocessing child.
+        return SharedMemory(name=name)
+
+
+def _attach_shared_numeric_list(name, typecode, length):
+    block = _attach_shared_memory(name)
+    return SharedNumericListSnapshot(
+        block.buf.cast(typecode)[:length], block, owner=False
+    )
+
+
+class SharedNumericListSnapshot(NumericListSnapshot):
+    """A `NumericListSnapshot` storing its elements in a
+    `multiprocessing.shared_memory` block.
+
+    The snapshot is pickled by the name of the block, and is hence unpickled,
+    for instance in a worker process, as a view of the same memory without
+    copying the elements. The snapshot that created the block unlinks it
+    when it is deleted, hence it must be kept alive until the snapshot is
+    unpickled by the other processes.
+    """
+
+    __slots__ = ("_block", "_owner")
+
+    def __init__(self, data, block, owner):
+        super(SharedNumericListSnapshot, self).__init__(data)
+        self._block = block
+        self._owner = owner
+
+    @classmethod
+    def from_numeric_list(cls, numeric_list):
+        """Returns a shared snapshot of the elements of `numeric_list`, copied
+        into a new shared memory block."""
+        data = numeric_list._data
+        block = SharedMemory(create=True, size=max(1, len(data) * data.itemsize))
+        view = block.buf.cast(data.typecode)[: len(data)]
+        view[:] = data
+        return cls(view, block, owner=True)
+
+    @property
+    def name(self):
+        """The name of the shared memory block."""
+        return self._block.name
+
+    @property
+    def typecode(self):
+        return self._data.format
+
+    def index(self, elem):
+        return operator.indexOf(self._data, elem)
+
+    def count(self, elem):
+        return operator.countOf(self._data, elem)
+
+    def __reduce__(self):
+        return (_attach_shared_numeric_list, (self.name, self.typecode, len(self)))
+
+    def __del__(self):
+        block = getattr(self, "_block", None)
+        if block is None:
+            return
+
+        self._data.release()
+        try:
+            block.close()
+        except BufferError:
+            return
+        if self._owner:
+            block.unlink()
+
+
+class ColumnarListSnapshot(object):
+    """A columnar snapshot of a List of NamedDicts with values of basic types,
+    storing one column per key of the NamedDict instead of one snapshot per
+    item. Columns of integers or floats are stored as
+    `NumericListSnapshot`s and other columns as tuples.
+
+    It behaves as an immutable tuple of the items, where the items are built
+    as row views on access. Columns are accessed by `column`.
+    """
+
+    __slots__ = ("_named_dict", "_columns", "_hash")
+
+    def __init__(self, named_dict, columns):
+        self._named_dict = named_dict
+        self._columns = tuple(columns)
+        self._hash = None
+
+    @classmethod
+    def from_rows(cls, named_dict, rows):
+        """Returns a columnar snapshot of `rows`, given as sequences of values
+        ordered as the fields of `named_dict`."""
+        columns = []
+        for column in zip(*rows):
+            numeric_column = NumericListSnapshot.from_elements(column)
+            columns.append(column if numeric_column is None else numeric_column)
+        return cls(named_dict, columns)
+
+    @property
+    def fields(self):
+        """The keys of the NamedDicts, which are the names of the columns."""
+        return self._named_dict._fields
+
+    def column(self, name):
+        """Returns the values of `name` of all items."""
+        try:
+            return self._columns[self.fields.index(name)]
+        except ValueError:
+            raise KeyError(name)
+
+    def to_numpy(self, name):
+        """Returns the values of `name` of all items as a NumPy array. Requires
+        NumPy to be installed."""
+        if numpy is None:
+            raise ImportError("NumPy is required to export columns as arrays")
+        return numpy.asarray(self.column(name))
+
+    def _row(self, idx):
+        return self._named_dict(*[column[idx] for column in self._columns])
+
+    def __len__(self):
+        return len(self._columns[0])
+
+    def __iter__(self):
+        return map(self._named_dict, *self._columns)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return tuple(self)[idx]
+        return self._row(idx)
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash(tuple(self))
+        return self._hash
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if isinstance(other, ColumnarListSnapshot):
+            if self._hash is not None and other._hash is not None:
+                if self._hash != other._hash:
+                    return False
+            return self.fields == other.fields and self._columns == other._columns
+        if isinstance(other, tuple):
+            return tuple(self) == other
+        return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __repr__(self):
+        return "{}({})".format(type(self).__name__, tuple(self))
+
+    def __reduce__(self):
+        compact = issubclass(self._named_dict, _CompactNamedDict)
+        return (
+            _restore_columnar_list,
+            (self._named_dict.__name__, self.fields, compact, self._columns),
+        )
+
+
+def _restore_columnar_list(name, fields, compact, columns):
+    if compact:
+        named_dict = compact_named_dict_class(name, fields)
+    else:
+        named_dict = named_dict_class(name, fields)
+    return ColumnarListSnapshot(named_dict, columns)
+
+
+def _unchanged(elems, base_elems):
+    return len(elems) == len(base_elems) and all(
+        elem is base_elem for elem, base_elem in zip(elems, base_elems)
+    )
+
+
+def _is_numeric(schema):
+    return schema[MK.Type] in (configsuite.types.Integer, configsuite.types.Number)
+
+
+def _is_flat_named_dict(schema):
+    return schema[MK.Type] == configsuite.types.NamedDict and all(
+        isinstance(value_schema[MK.Type], configsuite.BasicType)
+        for value_schema in schema[MK.Content].values()
+    )
+
+
+class SnapshotBuilder(object):
+    """Builds snapshots, see `build_snapshot`. The builder keeps track of the
+    number of bytes of the distinct strings that were replaced by interned
+    strings in `interned_bytes`.
+    """
+
+    def __init__(
+        self, compact=False, intern_strings=False, columnar=False, shared_memory=False
+    ):
+        if shared_memory and SharedMemory is None:
+            raise ImportError(
+                "multiprocessing.shared_memory is required for shared snapshots"
+            )
+
+        self._compact = compact
+        self._columnar = columnar
+        self._shared_memory = shared_memory
+        self._intern_strings = intern_strings
+        self._interned_bytes = 0
+        self._replaced = set()
+
+    @property
+    def interned_bytes(self):
+        return self._interned_bytes
+
+    def _intern(self, elem):
+        interned = sys.intern(elem)
+        if interned is not elem and id(elem) not in self._replaced:
+            self._replaced.add(id(elem))
+            self._interned_bytes += sys.getsizeof(elem)
+        return interned
+
+    def _named_dict_class(self, name, fields):
+        if self._compact:
+            return compact_named_dict_class(name, fields)
+        return named_dict_class(name, fields)
+
+    def _build_named_dict(self, config, schema, base):
+        content_schema = schema[MK.Content]
+        named_dict = self._named_dict_class(schema[MK.Type].name, content_schema.keys())
+
+        if type(base) is not named_dict:
+            base = None
+
+        values = [
+            self.build(
+                config.get(key),
+                content_schema[key],
+                base=None if base is None else base[idx],
+            )
+            for idx, key in enumerate(named_dict._fields)
+        ]
+
+        if base is not None and _unchanged(values, base):
+            return base
+        return named_dict(*values)
+
+    def _build_numeric_list(self, config, base):
+        numeric_list = NumericListSnapshot.from_elements(config)
+        shared = (
+            self._shared_memory
+            and numeric_list is not None
+            and len(numeric_list) >= SHARED_MEMORY_MIN_LENGTH
+        )
+
+        base_class = SharedNumericListSnapshot if shared else NumericListSnapshot
+        if isinstance(base, base_class) and numeric_list == base:
+            return base
+        if shared:
+            return SharedNumericListSnapshot.from_numeric_list(numeric_list)
+        return numeric_list
+
+    def _build_columnar_list(self, config, item_schema, base):
+        if len(config) == 0 or any(elem is None for elem in config):
+            return None
+
+        content_schema = item_schema[MK.Content]
+        named_dict = self._named_dict_class(
+            item_schema[MK.Type].name, content_schema.keys()
+        )
+        rows = [
+            [
+                self.build(elem.get(key), content_schema[key])
+                for key in named_dict._fields
+            ]
+            for elem in config
+        ]
+        columnar_list = ColumnarListSnapshot.from_rows(named_dict, rows)
+
+        if isinstance(base, ColumnarListSnapshot) and columnar_list == base:
+            return base
+        return columnar_list
+
+    def _build_list(self, config, schema, base):
+        item_schema = schema[MK.Content][MK.Item]
+
+        if (self._compact or self._shared_memory) and _is_numeric(item_schema):
+            numeric_list = self._build_numeric_list(config, base)
+            if numeric_list is not None:
+                return numeric_list
+
+        if self._columnar and _is_flat_named_dict(item_schema):
+            columnar_list = self._build_columnar_list(config, item_schema, base)
+            if columnar_list is not None:
+                return columnar_list
+
+        list_class = CompactListSnapshot if self._compact else ListSnapshot
+        if not isinstance(base, list_class):
+            base = ()
+
+        items = [
+            self.build(elem, item_schema, base=base[idx] if idx < len(base) else None)
+            for idx, elem in enumerate(config)
+        ]
+
+        if len(base) > 0 and _unchanged(items, base):
+            return base
+        return list_class(items)
+
+    def _build_dict(self, config, schema, base):
+        key_schema = schema[MK.Content][MK.Key]
+        value_schema = schema[MK.Content][MK.Value]
+
+        if not isinstance(base, DictSnapshot):
+            base = DictSnapshot()
+
+        pairs = []
+        for key, value in config.items():
+            key = self.build(key, key_schema)
+            value = self.build(value, value_schema, base=base.get(key))
+            pairs.append((key, value))
+
+        if len(base) > 0 and list(base.keys()) == [key for key, _ in pairs]:
+            if _unchanged([value for _, value in pairs], list(base.values())):
+                return base
+        return DictSnapshot(pairs)
+
+    def build(self, config, schema, base=None):
+        if config is None:
+            return None
+
+        data_type = schema[MK.Type]
+        if isinstance(data_type, configsuite.BasicType):
+            if type(base) is type(config) and base == config:
+                return base
+            if (
+                self._intern_strings
+                and data_type == configsuite.types.String
+                and type(config) is str
+            ):
+                return self._intern(config)
+            return config
+        elif data_type == configsuite.types.NamedDict:
+            return self._build_named_dict(config, schema, base)
+        elif data_type == configsuite.types.List:
+            return self._build_list(config, schema, base)
+        elif data_type == configsuite.types.Dict:
+            return self._build_dict(config, schema, base)
+        else:
+            msg = "Encountered unknown type {} while building snapshot"
+            raise TypeError(msg.format(str(data_type)))
+
+
+def build_snapshot(
+    config,
+    schema,
+    base=None,
+    compact=False,
+    intern_strings=False,
+    columnar=False,
+    shared_memory=False,
+):
+    """Builds an immutable snapshot of a readable `config` with respect to
+    `schema`.
+
+    If a `base` snapshot is given, subtrees of the snapshot that are equal to
+    the corresponding subtrees of `base` are reused from `base` instead of
+    being built anew. If `compact` is true, NamedDicts are represented by
+    classes storing their values in slots, Lists of integers or floats by
+    `NumericListSnapshot`s and other Lists by `CompactListSnapshot`s, all of
+    which cache their hashes. If `intern_strings` is true, the `String` keys
+    and values of the snapshot are interned. If `columnar` is true, Lists of
+    NamedDicts with values of basic types are represented by
+    `ColumnarListSnapshot`s. If `shared_memory` is true, Lists of at least
+    `SHARED_MEMORY_MIN_LENGTH` integers or floats are represented by
+    `SharedNumericListSnapshot`s.
+    """
+    builder = SnapshotBuilder(
+        compact=compact,
+        intern_strings=intern_strings,
+        columnar=columnar,
+        shared_memory=shared_memory,
+    )
+    return builder.build(config, schema, base=base)
@@ -0,0 +1,210 @@
+"""Copyright 2021 Equinor ASA and The Netherlands Organisation for
+Applied Scientific Research TNO.
+
+Licensed under the MIT license.
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the conditions stated in the LICENSE file in the project root for
+details.
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+"""
+
+
+import functools
+
+import configsuite
+
+try:
+    import jinja2
+except ImportError:
+    jinja2 = None
+
+
+_TEMPLATE_CACHE_SIZE = 4096
+
+
+@functools.lru_cache(maxsize=None)
+def _environment(variable_start_string, variable_end_string, autoescape):
+    return jinja2.Environment(
+        variable_start_string=variable_start_string,
+        variable_end_string=variable_end_string,
+        autoescape=autoescape,
+    )
+
+
+@functools.lru_cache(maxsize=_TEMPLATE_CACHE_SIZE)
+def _compile(source, variable_start_string, variable_end_string, autoescape):
+    env = _environment(variable_start_string, variable_end_string, autoescape)
+    return env.from_string(source)
+
+
+class TemplateRenderer(object):
+    """Renders Jinja templates with a fixed set of delimiters.
+
+    Compiled templates are cached on the template source and the delimiters,
+    such that rendering the same template multiple times only compiles it
+    once. In addition, the rendered variables are cached on the identity of
+    the variables given, such that a context transformation only renders its
+    variables once per context and not once per element.
+    """
+
+    def __init__(
+        self, variable_start_string="{{", variable_end_string="}}", autoescape=False
+    ):
+        if jinja2 is None:
+            raise ImportError(
+                "Jinja2 is required for templating, "
+                "install it with `pip install configsuite[templating]`"
+            )
+
+        self._delimiters = (variable_start_string, variable_end_string, autoescape)
+        self._cached_variables = (None, None)
+
+    def _compile(self, source):
+        return _compile(source, *self._delimiters)
+
+    def render_variables(self, variables):
+        """Renders the `variables` with respect to each other.
+
+        Variables are allowed to refer to other variables, which are resolved
+        by rendering the variables repeatedly. A `ValueError` is raised if the
+        variables could not be resolved due to circular dependencies.
+        """
+        cached_variables, cached_rendered = self._cached_variables
+        if variables is cached_variables:
+            return cached_rendered
+
+        rendered = dict(variables)
+        for _ in range(len(rendered)):
+            for key, value in rendered.items():
+                if isinstance(value, str):
+                    rendered[key] = self._compile(value).render(rendered)
+
+        var_start = self._delimiters[0]
+        if any(isinstance(v, str) and var_start in v for v in rendered.values()):
+            raise ValueError("Circular dependencies")
+
+        self._cached_variables = (variables, rendered)
+        return rendered
+
+    def render(self, template, variables):
+        """Renders `template` with `variables`. Non-string templates are
+        returned as is and left for the validation to report on.
+        """
+        if not isinstance(template, str):
+            return template
+
+        rendered_variables = self.render_variables(variables)
+        return self._compile(template).render(rendered_variables)
+
+
+class _TemplateTransformation(object):
+    """Renders the element as a Jinja template with `variables`.
+
+    Only the settings of the renderer and the variables are pickled, such
+    that the transformation can be sent to worker processes.
+    """
+
+    def __init__(
+        self, variables, variable_start_string, variable_end_string, autoescape
+    ):
+        self._variables = dict(variables if variables is not None else {})
+        self._delimiters = (variable_start_string, variable_end_string, autoescape)
+        self._renderer = TemplateRenderer(*self._delimiters)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_renderer"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._renderer = TemplateRenderer(*self._delimiters)
+
+    def __call__(self, elem):
+        return self._renderer.render(elem, self._variables)
+
+
+class _ContextTemplateTransformation(_TemplateTransformation):
+    """Renders the element as a Jinja template with `variables` and the
+    definitions extracted from the transformation context.
+    """
+
+    def __init__(self, variables, extract_definitions, *delimiters):
+        super(_ContextTemplateTransformation, self).__init__(variables, *delimiters)
+        self._extract_definitions = extract_definitions
+        self._cache = (None, None)
+
+    def __getstate__(self):
+        state = super(_ContextTemplateTransformation, self).__getstate__()
+        state["_cache"] = (None, None)
+        return state
+
+    def _context_variables(self, context):
+        cached_context, cached_variables = self._cache
+        if cached_variables is None or cached_context is not context:
+            cached_variables = dict(self._variables)
+            cached_variables.update(dict(self._extract_definitions(context)))
+            self._cache = (context, cached_variables)
+        return cached_variables
+
+    def __call__(self, elem, context):  # pylint: disable=arguments-differ
+        return self._renderer.render(elem, self._context_variables(context))
+
+
+def _extract_definitions(context):
+    return context.definitions
+
+
+def build_transformation(
+    variables=None,
+    variable_start_string="{{",
+    variable_end_string="}}",
+    autoescape=False,
+    msg="Renders Jinja template",
+):
+    """Builds a transformation rendering the element as a Jinja template with
+    `variables`.
+
+    The variables are rendered once, while the templates are compiled once
+    per distinct template. The result can be used as both a
+    `MetaKeys.Transformation` and a `MetaKeys.LayerTransformation`.
+    """
+    transformation = _TemplateTransformation(
+        variables, variable_start_string, variable_end_string, autoescape
+    )
+    return configsuite.transformation_msg(msg)(transformation)
+
+
+def build_context_transformation(
+    variables=None,
+    extract_definitions=_extract_definitions,
+    variable_start_string="{{",
+    variable_end_string="}}",
+    autoescape=False,
+    msg="Renders Jinja template using definitions",
+):
+    """Builds a context transformation rendering the element as a Jinja
+    template.
+
+    The definitions are extracted from the transformation context by
+    `extract_definitions` and take precedence over `variables`. They can be
+    given as a mapping or as an iterable of key-value pairs, for instance
+    the snapshot of a `Dict`. The definitions are rendered once per context,
+    and not once per element.
+    """
+    transformation = _ContextTemplateTransformation(
+        variables,
+        extract_definitions,
+        variable_start_string,
+        variable_end_string,
+        autoescape,
+    )
+    return configsuite.transformation_msg(msg)(transformation)
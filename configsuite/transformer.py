@@ -21,6 +21,7 @@ import collections
 
 import configsuite
 from configsuite import MetaKeys as MK
+from configsuite.executors import CHUNK_SIZE, chunks
 
 
 TransformationResult = collections.namedtuple(
@@ -28,14 +29,45 @@ TransformationResult = collections.namedtuple(
 )
 
 
+def _transform_chunk(transformation_type, transformation_context, bottom_up, chunk):
+    """Transforms a chunk of (config, schema, key_path) items serially. Defined
+    on module level such that it can be submitted to a process pool.
+    """
+    # pylint: disable=protected-access
+    transformer = Transformer(
+        None, transformation_type, transformation_context, bottom_up=bottom_up
+    )
+    transformer._errors = []
+    results = [transformer._transform(*item) for item in chunk]
+    return results, transformer._errors
+
+
 class Transformer(object):
+    """Applies the transformations of `transformation_type` to a config.
+
+    If an `executor` (a `concurrent.futures.Executor`) is given, the items of
+    lists and dicts with more than `chunk_size` elements are transformed in
+    chunks on the executor. The order of the elements and of the errors is the
+    same as for a serial transformation. Note that a process pool requires
+    the schema, the transformation context and the configuration to be
+    picklable.
+    """
+
     def __init__(
-        self, schema, transformation_type, transformation_context, bottom_up=True
+        self,
+        schema,
+        transformation_type,
+        transformation_context,
+        bottom_up=True,
+        executor=None,
+        chunk_size=CHUNK_SIZE,
     ):
         self._schema = schema
         self._transformation_type = transformation_type
         self._transformation_context = transformation_context
         self._bottom_up = bottom_up
+        self._executor = executor
+        self._chunk_size = chunk_size
         self._errors = None
 
         self._debug = transformation_type == MK.ContextTransformation
@@ -78,12 +110,10 @@ class Transformer(object):
             return config
 
         item_schema = schema[MK.Content][MK.Item]
-        return tuple(
-            [
-                self._transform(item, item_schema, key_path + (idx,))
-                for idx, item in enumerate(config)
-            ]
-        )
+        items = [
+            (item, item_schema, key_path + (idx,)) for idx, item in enumerate(config)
+        ]
+        return tuple(self._transform_items(items))
 
     def _transform_named_dict(self, config, schema, key_path):
         if not configsuite.types.NamedDict.validate(config):
@@ -109,13 +139,35 @@ class Transformer(object):
         key_schema = schema[MK.Content][MK.Key]
         value_schema = schema[MK.Content][MK.Value]
 
-        transformed_config = {}
+        items = []
         for key, value in config.items():
-            tkey = self._transform(key, key_schema, key_path + (key,))
-            tval = self._transform(value, value_schema, key_path + (key,))
-            transformed_config[tkey] = tval
-
-        return transformed_config
+            items.append((key, key_schema, key_path + (key,)))
+            items.append((value, value_schema, key_path + (key,)))
+
+        transformed_items = self._transform_items(items)
+        return dict(zip(transformed_items[::2], transformed_items[1::2]))
+
+    def _transform_items(self, items):
+        if self._executor is None or len(items) <= self._chunk_size:
+            return [self._transform(*item) for item in items]
+
+        futures = [
+            self._executor.submit(
+                _transform_chunk,
+                self._transformation_type,
+                self._transformation_context,
+                self._bottom_up,
+                chunk,
+            )
+            for chunk in chunks(items, self._chunk_size)
+        ]
+
+        transformed_items = []
+        for future in futures:
+            results, errors = future.result()
+            transformed_items += results
+            self._errors += errors
+        return transformed_items
 
     def _apply_single_transformation(self, config, schema, key_path):
         if self._transformation_type not in schema:
@@ -18,6 +18,8 @@ in all copies or substantial portions of the Software.
 
 
 import collections
+import importlib
+import inspect
 import numbers
 import datetime
 
@@ -59,26 +61,84 @@ class BooleanResult(object):
         return fmt.format(bool(self), self._msg, self._input)
 
 
+def _resolve(module_name, qualname):
+    obj = importlib.import_module(module_name)
+    for name in qualname.split("."):
+        obj = getattr(obj, name)
+    return obj
+
+
+class _MsgWrapper(object):
+    """Base of the wrappers of `transformation_msg` and `validator_msg`.
+
+    A wrapper that replaced the function it decorates, as is the case when
+    decorating a function at module or class level, is pickled by the
+    reference of the function and is hence unpickled to the same wrapper.
+    Other wrappers are pickled as their function and message.
+    """
+
+    def __init__(self, function, msg):
+        self._function = function
+        self._msg = msg
+
+    @property
+    def msg(self):
+        return self._msg
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        module_name = getattr(self._function, "__module__", None)
+        qualname = getattr(self._function, "__qualname__", None)
+        if module_name is not None and qualname is not None:
+            try:
+                if _resolve(module_name, qualname) is self:
+                    return (_resolve, (module_name, qualname))
+            except (ImportError, AttributeError):
+                pass
+        return (type(self), (self._function, self._msg))
+
+
+class _TransformationWrapper(_MsgWrapper):
+    def __call__(self, *args, **kwargs):
+        return self._function(*args, **kwargs)
+
+
 def transformation_msg(msg):
     """Used to decorate a transformation function with a msg.
     """
 
     def real_decorator(function):
-        class Wrapper(object):
-            def __init__(self, function, msg):
-                self._function = function
-                self._msg = msg
+        return _TransformationWrapper(function, msg)
 
-            @property
-            def msg(self):
-                return self._msg
+    return real_decorator
 
-            def __call__(self, *args, **kwargs):
-                return self._function(*args, **kwargs)
 
-        return Wrapper(function, msg)
+def _build_argument_str(*args, **kwargs):
+    elems = [str(arg) for arg in args]
+    elems += ["{}={}".format(str(key), str(value)) for key, value in kwargs.items()]
 
-    return real_decorator
+    return ", ".join(elems)
+
+
+class _ValidatorWrapper(_MsgWrapper):
+    def __init__(self, function, msg):
+        super(_ValidatorWrapper, self).__init__(function, msg)
+        self._is_coroutine = inspect.iscoroutinefunction(function)
+
+    def __call__(self, *args, **kwargs):
+        if self._is_coroutine:
+            return self._await(*args, **kwargs)
+
+        res = self._function(*args, **kwargs)
+        argument_str = _build_argument_str(*args, **kwargs)
+        return BooleanResult(res, self._msg, argument_str)
+
+    async def _await(self, *args, **kwargs):
+        res = await self._function(*args, **kwargs)
+        argument_str = _build_argument_str(*args, **kwargs)
+        return BooleanResult(res, self._msg, argument_str)
 
 
 def validator_msg(msg):
@@ -97,32 +157,14 @@ def validator_msg(msg):
     On the other hand, if `validate_size` returns a true value `ret`, for
     instance if provided with [0, 1], we will have
         `ret.msg = 'assert len(x) <= 2 is true on input [0, 1]`.
+
+    Coroutine functions can be decorated as well, in which case calling the
+    validator returns an awaitable of the message container. Such validators
+    are only supported by `Validator.avalidate`.
     """
 
     def real_decorator(function):
-        def _build_argument_str(*args, **kwargs):
-            elems = [str(arg) for arg in args]
-            elems += [
-                "{}={}".format(str(key), str(value)) for key, value in kwargs.items()
-            ]
-
-            return ", ".join(elems)
-
-        class Wrapper(object):
-            def __init__(self, function, msg):
-                self._function = function
-                self._msg = msg
-
-            @property
-            def msg(self):
-                return self._msg
-
-            def __call__(self, *args, **kwargs):
-                res = self._function(*args, **kwargs)
-                argument_str = _build_argument_str(*args, **kwargs)
-                return BooleanResult(res, self._msg, argument_str)
-
-        return Wrapper(function, msg)
+        return _ValidatorWrapper(function, msg)
 
     return real_decorator
 
@@ -130,6 +172,11 @@ def validator_msg(msg):
 BasicType = collections.namedtuple("Type", ["name", "validate"])
 Collection = collections.namedtuple("Type", ["name", "validate", "create_empty"])
 
+# Both classes are named Type, which is also the name of the meta type below,
+# hence they would not be found by pickle under their name.
+BasicType.__qualname__ = "BasicType"
+Collection.__qualname__ = "Collection"
+
 
 def _type_eq(self, other):
     return self.name == other.name
@@ -203,3 +250,34 @@ def _is_type(x):
 
 Type = BasicType("type", _is_type)
 Callable = BasicType("callable", validator_msg("Is x callable")(callable))
+
+_BUILTIN_TYPES = {
+    data_type.name: data_type
+    for data_type in (
+        NamedDict,
+        Dict,
+        List,
+        String,
+        Integer,
+        Number,
+        Bool,
+        Date,
+        DateTime,
+        Type,
+        Callable,
+    )
+}
+
+
+def _builtin_type(name):
+    return _BUILTIN_TYPES[name]
+
+
+def _reduce_type(self):
+    if _BUILTIN_TYPES.get(self.name) is self:
+        return (_builtin_type, (self.name,))
+    return (type(self), tuple(self))
+
+
+BasicType.__reduce__ = _reduce_type
+Collection.__reduce__ = _reduce_type
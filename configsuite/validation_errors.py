@@ -79,3 +79,7 @@ class TransformationError(ValidationError):
 
 class ContextExtractionError(ValidationError):
     pass
+
+
+class ValidationTimeoutError(ValidationError):
+    pass
@@ -17,17 +17,200 @@ in all copies or substantial portions of the Software.
 """
 
 
+import asyncio
 import collections
+import concurrent.futures
+import hashlib
+import inspect
+import pickle
+import queue
+import threading
+import time
+import weakref
+
 import configsuite
 from configsuite import MetaKeys as MK
+from configsuite.executors import CHUNK_SIZE, chunks
 
 
 ValidationResult = collections.namedtuple("ValidationResult", ("valid", "errors"))
 
+_COROUTINE_MSG = "Validator {} is a coroutine function, use avalidate"
+_BUDGET_MSG = "Validation time budget exceeded"
+_TIMED_OUT = object()
+
+_CHUNK_STATES = collections.OrderedDict()
+_CHUNK_STATES_SIZE = 8
+_chunk_states_lock = threading.Lock()
+
+
+class _BudgetExceeded(Exception):
+    def __init__(self, key):
+        super().__init__(key)
+        self.key = key
+
+
+class _CallTimeout(Exception):
+    def __init__(self, timeout):
+        super().__init__(timeout)
+        self.timeout = timeout
+
+
+def _run_calls(calls):
+    while True:
+        call = calls.get()
+        if call is None:
+            return
+
+        function, args, outcome, done = call
+        try:
+            outcome.append((True, function(*args)))
+        # pylint: disable=broad-except
+        except BaseException as e:
+            outcome.append((False, e))
+        done.set()
+
+
+class _TimeoutCaller(object):
+    """Calls functions in a worker thread, waiting at most a given timeout
+    for each call to return. The worker thread is reused between calls.
+
+    A call that times out is not stopped, as Python code cannot be
+    interrupted. It keeps running, and using CPU, in its worker thread until
+    it returns, and later calls are made in a new worker thread. Note that a
+    call holding the global interpreter lock, e.g. a regular expression
+    match, cannot be timed out.
+    """
+
+    def __init__(self):
+        self._calls = None
+        self._stop_worker = None
+
+    def _start_worker(self):
+        self._calls = queue.Queue()
+        threading.Thread(target=_run_calls, args=(self._calls,), daemon=True).start()
+        # The worker stops once its current call returns, if any, after the
+        # caller is garbage collected or abandons it.
+        self._stop_worker = weakref.finalize(self, self._calls.put, None)
+
+    def call(self, function, args, timeout):
+        if self._calls is None:
+            self._start_worker()
+
+        outcome = []
+        done = threading.Event()
+        self._calls.put((function, args, outcome, done))
+        if not done.wait(timeout):
+            self._stop_worker()
+            self._calls = None
+            raise _CallTimeout(timeout)
+
+        returned, value = outcome[0]
+        if not returned:
+            raise value
+        return value
+
+
+def _never_stop(schema):
+    return False
+
+
+def _chunk_state(state_key, state):
+    """Returns the state shared by the chunks of a container. A pickled state
+    is unpickled once per process and cached by `state_key`, such that only
+    the pickled bytes are sent along with each chunk.
+    """
+    if not isinstance(state, bytes):
+        return state
+
+    with _chunk_states_lock:
+        if state_key in _CHUNK_STATES:
+            _CHUNK_STATES.move_to_end(state_key)
+            return _CHUNK_STATES[state_key]
+
+    state = pickle.loads(state)
+    with _chunk_states_lock:
+        _CHUNK_STATES[state_key] = state
+        while len(_CHUNK_STATES) > _CHUNK_STATES_SIZE:
+            _CHUNK_STATES.popitem(last=False)
+    return state
+
+
+def _validate_chunk(state_key, state, time_budget, chunk):
+    """Validates a chunk of (index, item) pairs of a list, or (key, value)
+    pairs of a dict, serially. The key paths of the errors are relative to
+    the container. Defined on module level such that it can be submitted to
+    a process pool.
+    """
+    (
+        data_type,
+        content_schema,
+        context,
+        stop_condition,
+        apply_validators,
+        validator_timeout,
+    ) = _chunk_state(state_key, state)
+
+    # pylint: disable=protected-access
+    validator = Validator(
+        None,
+        stop_condition=stop_condition,
+        apply_validators=apply_validators,
+        validator_timeout=validator_timeout,
+        time_budget=time_budget,
+    )
+    validator._start_clock()
+    validator._errors = []
+    validator._key_stack = _KeyStack()
+    validator._context = context
+    if data_type == configsuite.types.List:
+        valid = validator._validate_list_items(chunk, content_schema)
+    else:
+        valid = validator._validate_dict_items(chunk, content_schema)
+    return valid, validator._errors
+
 
 class Validator(object):
+    """Validates configurations against `schema`.
+
+    If an `executor` is given, the calls of the context validators are
+    submitted to it, such that I/O bound validators run in parallel. They are
+    first assumed to pass, and if any of them fails the validation is
+    replayed with the results of the calls. Hence, the result, and the order
+    of the errors, is the same as if the validators were called in order.
+
+    If a `chunk_executor` is given, the items of lists and dicts with more
+    than `chunk_size` elements are validated in chunks on it, see
+    `configsuite.executors.parallel_executor`. Note that a process pool
+    requires the schema, the stop condition and the context to be picklable.
+    They are pickled once per container and unpickled once per worker
+    process.
+
+    Each validator call can be given at most `validator_timeout` seconds, and
+    the validation as a whole at most `time_budget` seconds. A validator that
+    times out fails with a `ValidationTimeoutError` at its key path, and when
+    the time budget is spent the validation stops with a
+    `ValidationTimeoutError` at the key path where it stopped. With either of
+    them the calls are made in a worker thread, which is reused between
+    calls, and waited for at most the per call timeout or the remaining
+    budget. Calls submitted to the `executor`, and coroutines, are waited
+    for the same. Note that a call that times out is abandoned, but not
+    stopped, as Python code cannot be interrupted. It keeps running, and
+    using CPU, until it returns. A call holding the global interpreter lock,
+    e.g. a backtracking regular expression match, cannot be timed out at
+    all.
+    """
+
     def __init__(
-        self, schema, stop_condition=(lambda schema: False), apply_validators=True
+        self,
+        schema,
+        stop_condition=_never_stop,
+        apply_validators=True,
+        executor=None,
+        chunk_executor=None,
+        chunk_size=CHUNK_SIZE,
+        validator_timeout=None,
+        time_budget=None,
     ):
         self._schema = schema
         self._errors = None
@@ -35,18 +218,185 @@ class Validator(object):
         self._context = None
         self._stop_condition = stop_condition
         self._apply_validators = apply_validators
+        self._executor = executor
+        self._chunk_executor = chunk_executor
+        self._chunk_size = chunk_size
+        self._validator_timeout = validator_timeout
+        self._time_budget = time_budget
+        self._timeout_caller = None
+        if validator_timeout is not None or time_budget is not None:
+            self._timeout_caller = _TimeoutCaller()
+        self._deadline = None
+        self._timed_out = False
+        self._pending_calls = None
+        self._call_results = None
+        self._awaiting = False
+        self._validating_key = False
 
     def validate(self, config, context=None):
+        self._start_clock()
+        if self._executor is None:
+            return self._validate_config(config, context)
+
+        self._pending_calls = collections.OrderedDict()
+        self._call_results = {}
+        try:
+            try:
+                val_res = self._validate_config(config, context)
+            except Exception:
+                _discard(self._pending_calls)
+                raise
+
+            if len(self._pending_calls) == 0:
+                return val_res
+
+            try:
+                self._call_results = _collect(
+                    self._pending_calls, self._deadline, self._validator_timeout
+                )
+            except _BudgetExceeded as e:
+                return _with_budget_error(val_res, e.key)
+            return self._replay_on_failure(val_res, config, context)
+        finally:
+            self._pending_calls = None
+            self._call_results = None
+
+    async def avalidate(self, config, context=None, concurrency=None):
+        """Validates `config` as `validate`, but also supports validators that
+        are coroutine functions. The coroutine validators are first assumed
+        to pass, and all of their calls are then awaited concurrently, with at
+        most `concurrency` calls in progress at the time if given. If any of
+        them fails, the validation is replayed with the results of the calls,
+        such that the result is the same as if the validators were called in
+        order.
+        """
+        self._start_clock()
+        self._pending_calls = collections.OrderedDict()
+        self._call_results = {}
+        self._awaiting = True
+        try:
+            try:
+                val_res = self._validate_config(config, context)
+            except Exception:
+                _discard(self._pending_calls)
+                raise
+
+            if len(self._pending_calls) == 0:
+                return val_res
+
+            try:
+                self._call_results = await _gather(
+                    self._pending_calls,
+                    concurrency,
+                    self._deadline,
+                    self._validator_timeout,
+                )
+            except _BudgetExceeded as e:
+                return _with_budget_error(val_res, e.key)
+            return self._replay_on_failure(val_res, config, context)
+        finally:
+            self._pending_calls = None
+            self._call_results = None
+            self._awaiting = False
+
+    def _start_clock(self):
+        self._timed_out = False
+        self._deadline = None
+        if self._time_budget is not None:
+            self._deadline = time.monotonic() + self._time_budget
+
+    def _out_of_time(self):
+        """Returns whether the time budget is spent, in which case a timeout
+        error is added the first time."""
+        if self._timed_out:
+            return True
+
+        if self._deadline is not None and time.monotonic() >= self._deadline:
+            self._add_timeout_error(_BUDGET_MSG)
+            return True
+        return False
+
+    def _call_timeout(self):
+        timeout = self._validator_timeout
+        if self._deadline is not None:
+            remaining = max(self._deadline - time.monotonic(), 0)
+            timeout = remaining if timeout is None else min(timeout, remaining)
+        return timeout
+
+    def _validate_config(self, config, context):
         self._errors = []
         self._key_stack = _KeyStack()
         self._context = context
         valid = self._validate(config, self._schema)
         return ValidationResult(valid=valid, errors=tuple(self._errors))
 
+    def _replay_on_failure(self, val_res, config, context):
+        if all(
+            res and not isinstance(res, _CallTimeout)
+            for res in self._call_results.values()
+        ):
+            return val_res
+        return self._validate_config(config, context)
+
+    def _call_validator(self, validator, call_id, submit, *args):
+        """Calls `validator` with `args`. While deferring calls, a call that
+        is to be `submit`ted to the executor, or that returns an awaitable
+        while validating asynchronously, is registered as pending and assumed
+        to pass, unless its result is already known. Returns `_TIMED_OUT` if
+        the call timed out."""
+        if self._pending_calls is not None:
+            key = (self._key_stack.keys(), self._validating_key, call_id)
+            if key in self._call_results:
+                return self._known_result(validator, self._call_results[key])
+
+            if submit and self._executor is not None:
+                self._pending_calls[key] = self._executor.submit(validator, *args)
+                return True
+
+        if self._out_of_time():
+            return _TIMED_OUT
+
+        res = self._call(validator, args)
+        if res is _TIMED_OUT or not inspect.isawaitable(res):
+            return res
+
+        if not self._awaiting:
+            res.close()
+            raise TypeError(_COROUTINE_MSG.format(validator.msg))
+
+        self._pending_calls[key] = res
+        return True
+
+    def _known_result(self, validator, res):
+        if isinstance(res, _CallTimeout):
+            self._add_call_timeout_error(validator, res.timeout)
+            return _TIMED_OUT
+        return res
+
+    def _call(self, validator, args):
+        if self._timeout_caller is None:
+            return validator(*args)
+
+        try:
+            res = self._timeout_caller.call(validator, args, self._call_timeout())
+        except _CallTimeout as e:
+            if not self._out_of_time():
+                self._add_call_timeout_error(validator, e.timeout)
+            return _TIMED_OUT
+
+        if self._out_of_time():
+            return _TIMED_OUT
+        return res
+
     def _validate(self, config, schema):
         if self._stop_condition(schema):
             return True
 
+        if self._out_of_time():
+            return False
+        return self._validate_node(config, schema)
+
+    def _validate_node(self, config, schema):
         data_type = schema[MK.Type]
         allow_none = schema.get(MK.AllowNone, False)
 
@@ -84,9 +434,12 @@ class Validator(object):
         elem_vals = schema.get(MK.ElementValidators, ())
 
         valid = True
-        for val in elem_vals:
-            res = val(config)
-            if not res:
+        for idx, val in enumerate(elem_vals):
+            call_id = (id(schema), MK.ElementValidators, idx)
+            res = self._call_validator(val, call_id, False, config)
+            if res is _TIMED_OUT:
+                valid = False
+            elif not res:
                 valid = False
                 self._add_invalid_value_error(res.msg)
 
@@ -103,9 +456,12 @@ class Validator(object):
         context_validators = schema.get(MK.ContextValidators, ())
 
         valid = True
-        for validator in context_validators:
-            res = validator(config, self._context)
-            if not res:
+        for idx, validator in enumerate(context_validators):
+            call_id = (id(schema), MK.ContextValidators, idx)
+            res = self._call_validator(validator, call_id, True, config, self._context)
+            if res is _TIMED_OUT:
+                valid = False
+            elif not res:
                 valid = False
                 self._add_invalid_value_error(res.msg)
 
@@ -152,10 +508,16 @@ class Validator(object):
         return valid
 
     def _validate_list(self, config, schema):
+        if self._in_chunks(config):
+            items = list(enumerate(config))
+            return self._validate_chunks(configsuite.types.List, schema, items)
+        return self._validate_list_items(enumerate(config), schema)
+
+    def _validate_list_items(self, items, schema):
         item_schema = schema[MK.Item]
 
         valid = True
-        for idx, config_item in enumerate(config):
+        for idx, config_item in items:
             self._key_stack.append(idx)
             valid &= self._validate(config_item, item_schema)
             self._key_stack.pop()
@@ -163,18 +525,78 @@ class Validator(object):
         return valid
 
     def _validate_dict(self, config, content_schema):
+        if self._in_chunks(config):
+            items = list(config.items())
+            return self._validate_chunks(configsuite.types.Dict, content_schema, items)
+        return self._validate_dict_items(config.items(), content_schema)
+
+    def _validate_dict_items(self, items, content_schema):
         key_schema = content_schema[MK.Key]
         value_schema = content_schema[MK.Value]
 
         valid = True
-        for key, value in config.items():
+        for key, value in items:
             self._key_stack.append(key)
+            # The key and the value share a key path, and possibly a schema,
+            # hence their deferred calls are told apart by role.
+            validating_key = self._validating_key
+            self._validating_key = True
             valid &= self._validate(key, key_schema)
+            self._validating_key = validating_key
             valid &= self._validate(value, value_schema)
             self._key_stack.pop()
 
         return valid
 
+    def _in_chunks(self, config):
+        return self._chunk_executor is not None and len(config) > self._chunk_size
+
+    def _chunk_state(self, data_type, content_schema):
+        state = (
+            data_type,
+            content_schema,
+            self._context,
+            self._stop_condition,
+            self._apply_validators,
+            self._validator_timeout,
+        )
+        if isinstance(self._chunk_executor, concurrent.futures.ThreadPoolExecutor):
+            return None, state
+
+        # The state is pickled once, instead of along with each chunk, and
+        # unpickled once per worker process.
+        state = pickle.dumps(state)
+        return hashlib.sha256(state).hexdigest(), state
+
+    def _validate_chunks(self, data_type, content_schema, items):
+        state_key, state = self._chunk_state(data_type, content_schema)
+        futures = [
+            self._chunk_executor.submit(
+                _validate_chunk,
+                state_key,
+                state,
+                _remaining(self._deadline),
+                chunk,
+            )
+            for chunk in chunks(items, self._chunk_size)
+        ]
+
+        key_path = self._key_stack.keys()
+        valid = True
+        for future in futures:
+            chunk_valid, errors = future.result()
+            valid &= chunk_valid
+            self._errors += [
+                error.__class__(error.msg, key_path + error.key_path)
+                for error in errors
+            ]
+            self._timed_out |= any(
+                isinstance(error, configsuite.ValidationTimeoutError)
+                and error.msg == _BUDGET_MSG
+                for error in errors
+            )
+        return valid
+
     def _add_invalid_type_error(self, msg):
         self._add_error(msg, configsuite.InvalidTypeError)
 
@@ -187,11 +609,106 @@ class Validator(object):
     def _add_invalid_value_error(self, msg):
         self._add_error(msg, configsuite.InvalidValueError)
 
+    def _add_call_timeout_error(self, validator, timeout):
+        msg = "Validator {} timed out after {}s"
+        self._add_timeout_error(msg.format(validator.msg, timeout))
+
+    def _add_timeout_error(self, msg):
+        self._timed_out |= msg == _BUDGET_MSG
+        self._add_error(msg, configsuite.ValidationTimeoutError)
+
     def _add_error(self, msg, ErrorType):
         err = ErrorType(msg, self._key_stack.keys())
         self._errors.append(err)
 
 
+def _with_budget_error(val_res, key):
+    key_path = key[0]
+    budget_error = configsuite.ValidationTimeoutError(_BUDGET_MSG, key_path)
+    return ValidationResult(valid=False, errors=val_res.errors + (budget_error,))
+
+
+def _remaining(deadline):
+    if deadline is None:
+        return None
+    return max(deadline - time.monotonic(), 0)
+
+
+def _discard(pending_calls):
+    for pending_call in pending_calls.values():
+        if isinstance(pending_call, concurrent.futures.Future):
+            pending_call.cancel()
+        else:
+            pending_call.close()
+
+
+def _call_wait(deadline, call_timeout):
+    """Returns how long to wait for a call, and whether waiting that long is
+    bound by the `call_timeout` rather than the time budget."""
+    remaining = _remaining(deadline)
+    if call_timeout is not None and (remaining is None or call_timeout < remaining):
+        return call_timeout, True
+    return remaining, False
+
+
+def _collect(pending_calls, deadline, call_timeout):
+    try:
+        results = {}
+        for key, future in pending_calls.items():
+            timeout, per_call = _call_wait(deadline, call_timeout)
+            try:
+                res = future.result(timeout=timeout)
+            except concurrent.futures.TimeoutError:
+                if not per_call:
+                    raise _BudgetExceeded(key)
+                future.cancel()
+                res = _CallTimeout(call_timeout)
+            if inspect.isawaitable(res):
+                res.close()
+                msg = "Coroutine validators are only supported by avalidate"
+                raise TypeError(msg)
+            results[key] = res
+        return results
+    except Exception:
+        _discard(pending_calls)
+        raise
+
+
+async def _gather(pending_calls, concurrency, deadline, call_timeout):
+    semaphore = None if concurrency is None else asyncio.Semaphore(concurrency)
+    results = {}
+
+    async def _resolve(pending_call):
+        if isinstance(pending_call, concurrent.futures.Future):
+            res = await asyncio.wrap_future(pending_call)
+            if inspect.isawaitable(res):
+                res = await res
+            return res
+        return await pending_call
+
+    async def _resolve_in_time(key):
+        try:
+            results[key] = await asyncio.wait_for(
+                _resolve(pending_calls[key]), call_timeout
+            )
+        except asyncio.TimeoutError:
+            results[key] = _CallTimeout(call_timeout)
+
+    async def _await(key):
+        if semaphore is None:
+            await _resolve_in_time(key)
+        else:
+            async with semaphore:
+                await _resolve_in_time(key)
+
+    gathered = asyncio.gather(*[_await(key) for key in pending_calls])
+    try:
+        await asyncio.wait_for(gathered, _remaining(deadline))
+    except asyncio.TimeoutError:
+        raise _BudgetExceeded(next(key for key in pending_calls if key not in results))
+    return results
+
+
 class _KeyStack(object):
     def __init__(self):
         self._stack = []
@@ -63,6 +63,7 @@ setuptools.setup(
     install_requires=[
         "PyYAML",
     ],
+    extras_require={"templating": ["jinja2"]},
     setup_requires=["setuptools_scm", "setuptools_scm_about"],
     tests_require=[
         "pytest",
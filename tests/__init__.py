@@ -71,9 +71,10 @@ def tmp(path=None, teardown=True):
 
     os.chdir(fname)
 
-    yield fname  # give control to caller scope
-
-    os.chdir(cwd)
+    try:
+        yield fname  # give control to caller scope
+    finally:
+        os.chdir(cwd)
 
     if teardown:
         try:
@@ -0,0 +1,107 @@
+"""Copyright 2021 Equinor ASA and The Netherlands Organisation for
+Applied Scientific Research TNO.
+
+Licensed under the MIT license.
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the conditions stated in the LICENSE file in the project root for
+details.
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+"""
+
+
+import unittest
+
+import configsuite
+
+from .data import car
+from .data import transactions
+
+
+class TestAccessor(unittest.TestCase):
+    def setUp(self):
+        self.suite = configsuite.ConfigSuite(
+            transactions.build_config(),
+            transactions.build_schema(),
+            extract_validation_context=transactions.extract_validation_context,
+        )
+        self.assertTrue(self.suite.valid, self.suite.errors)
+
+    def test_named_dict_and_list_access(self):
+        snapshot = self.suite.snapshot
+        self.assertEqual(
+            snapshot.transactions[1].target,
+            self.suite.accessor("transactions[1].target")(snapshot),
+        )
+        self.assertEqual(
+            "FLC", self.suite.accessor("transactions[-1].source")(snapshot)
+        )
+        self.assertEqual(
+            snapshot.transactions, self.suite.accessor("transactions")(snapshot)
+        )
+
+    def test_wildcard_access(self):
+        snapshot = self.suite.snapshot
+        amounts = self.suite.accessor("transactions[*].amount")(snapshot)
+        self.assertEqual((1000, 1, 0.001), amounts)
+        self.assertEqual(
+            tuple(snapshot.exchange_rates.values()),
+            self.suite.accessor("exchange_rates[*]")(snapshot),
+        )
+
+    def test_dict_access(self):
+        snapshot = self.suite.snapshot
+        self.assertEqual(9.67, self.suite.accessor("exchange_rates[EUR]")(snapshot))
+        self.assertEqual(1, self.suite.accessor('exchange_rates["NOK"]')(snapshot))
+        self.assertIsNone(self.suite.accessor("exchange_rates[SEK]")(snapshot))
+
+    def test_none_propagates(self):
+        raw_config = car.build_config()
+        raw_config["owner"]["first entry"]["location"] = None
+        suite = configsuite.ConfigSuite(raw_config, car.build_schema())
+
+        accessor = suite.accessor("owner[*].location")
+        self.assertEqual((None, "Earth"), accessor(suite.snapshot))
+        self.assertIsNone(suite.accessor("tire.rim")(None))
+
+    def test_accessor_other_suites(self):
+        accessor = self.suite.accessor("transactions[*].source")
+        self.assertIs(accessor, self.suite.accessor("transactions[*].source"))
+
+        pushed_suite = self.suite.push({"transactions": [{"source": "EUR"}]})
+        self.assertEqual("EUR", accessor(pushed_suite.snapshot)[-1])
+
+        schema = transactions.build_schema()
+        compact_suite = configsuite.ConfigSuite(
+            transactions.build_config(),
+            schema,
+            extract_validation_context=transactions.extract_validation_context,
+            compact_snapshot=True,
+        )
+        compiled = configsuite.compile_accessor(schema, "transactions[*].source")
+        self.assertEqual(
+            accessor(self.suite.snapshot), compiled(compact_suite.snapshot)
+        )
+
+    def test_invalid_paths(self):
+        for path in ("", "transactions..amount", "transactions[", ".transactions"):
+            with self.assertRaises(ValueError):
+                self.suite.accessor(path)
+
+        with self.assertRaises(ValueError):
+            self.suite.accessor("transactions[first]")
+        with self.assertRaises(KeyError):
+            self.suite.accessor("transactions[*].currency")
+        with self.assertRaises(TypeError):
+            self.suite.accessor("transactions.amount")
+        with self.assertRaises(TypeError):
+            self.suite.accessor("transactions[*].amount.value")
+        with self.assertRaises(TypeError):
+            self.suite.accessor("exchange_rates.NOK")
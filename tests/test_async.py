@@ -0,0 +1,187 @@
+"""Copyright 2021 Equinor ASA and The Netherlands Organisation for
+Applied Scientific Research TNO.
+
+Licensed under the MIT license.
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the conditions stated in the LICENSE file in the project root for
+details.
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+"""
+
+
+import asyncio
+import unittest
+
+import configsuite
+from configsuite import MetaKeys as MK
+
+from .data import transactions
+
+
+def _run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+class _CallTracker(object):
+    def __init__(self):
+        self.running = 0
+        self.max_running = 0
+        self.calls = 0
+
+    async def __call__(self, result):
+        self.calls += 1
+        self.running += 1
+        self.max_running = max(self.running, self.max_running)
+        await asyncio.sleep(0.001)
+        self.running -= 1
+        return result
+
+
+def _build_async_schema(tracker):
+    schema = transactions.build_schema()
+
+    @configsuite.validator_msg("Should be defined currency")
+    async def _is_currency(elem, context):
+        return await tracker(elem in context.currencies)
+
+    @configsuite.validator_msg("Amount should not be negative")
+    async def _positive_amount(amount):
+        return await tracker(amount > 0)
+
+    transaction_schema = schema[MK.Content]["transactions"][MK.Content][MK.Item]
+    for key in ("source", "target"):
+        transaction_schema[MK.Content][key][MK.ContextValidators] = (_is_currency,)
+    transaction_schema[MK.Content]["amount"][MK.ElementValidators] = (_positive_amount,)
+    return schema
+
+
+async def _extract_validation_context(snapshot):
+    await asyncio.sleep(0)
+    return transactions.extract_validation_context(snapshot)
+
+
+def _build_invalid_config():
+    raw_config = transactions.build_config()
+    raw_config["transactions"] += [
+        {"source": "SEK", "target": "NOK", "amount": 10},
+        {"source": "NOK", "target": "EUR", "amount": -10},
+        {"source": "DKK", "target": "ISK", "amount": 0},
+    ]
+    return raw_config
+
+
+class TestAsync(unittest.TestCase):
+    def test_avalidate(self):
+        tracker = _CallTracker()
+        suite = configsuite.AsyncConfigSuite(
+            transactions.build_config(),
+            _build_async_schema(tracker),
+            extract_validation_context=_extract_validation_context,
+        )
+        self.assertIs(suite, _run(suite.avalidate()))
+        self.assertTrue(suite.valid, suite.errors)
+        self.assertEqual(9, tracker.calls)
+        self.assertEqual(1000, suite.snapshot.transactions[0].amount)
+
+        self.assertIs(suite, _run(suite.avalidate()))
+        self.assertEqual(9, tracker.calls)
+
+    def test_avalidate_errors(self):
+        raw_config = _build_invalid_config()
+        suite = configsuite.ConfigSuite(
+            raw_config,
+            transactions.build_schema(),
+            extract_validation_context=transactions.extract_validation_context,
+        )
+        async_suite = configsuite.AsyncConfigSuite(
+            raw_config,
+            _build_async_schema(_CallTracker()),
+            extract_validation_context=_extract_validation_context,
+        )
+        _run(async_suite.avalidate())
+
+        self.assertFalse(async_suite.valid)
+        self.assertEqual(5, len(async_suite.errors))
+        self.assertEqual(suite.errors, async_suite.errors)
+
+    def test_avalidate_shared_key_value_schema(self):
+        @configsuite.validator_msg("Should be upper case")
+        async def _is_upper(elem, _context):
+            await asyncio.sleep(0)
+            return elem.isupper()
+
+        string_schema = {
+            MK.Type: configsuite.types.String,
+            MK.ContextValidators: (_is_upper,),
+        }
+        schema = {
+            MK.Type: configsuite.types.Dict,
+            MK.Content: {MK.Key: string_schema, MK.Value: string_schema},
+        }
+        validator = configsuite.Validator(schema)
+
+        for config, key_paths in (
+            ({"a": "B"}, [("a",)]),
+            ({"A": "b"}, [("A",)]),
+            ({"a": "b"}, [("a",), ("a",)]),
+            ({"A": "B"}, []),
+        ):
+            val_res = _run(validator.avalidate(config))
+            self.assertEqual(key_paths, [error.key_path for error in val_res.errors])
+
+    def test_avalidate_concurrency(self):
+        raw_config = transactions.build_config()
+        raw_config["transactions"] *= 10
+
+        for concurrency, max_running in ((None, 90), (4, 4)):
+            tracker = _CallTracker()
+            suite = configsuite.AsyncConfigSuite(
+                raw_config,
+                _build_async_schema(tracker),
+                extract_validation_context=transactions.extract_validation_context,
+            )
+            _run(suite.avalidate(concurrency=concurrency))
+            self.assertTrue(suite.valid, suite.errors)
+            self.assertEqual(90, tracker.calls)
+            self.assertEqual(max_running, tracker.max_running)
+
+    def test_not_validated(self):
+        suite = configsuite.AsyncConfigSuite(
+            transactions.build_config(),
+            _build_async_schema(_CallTracker()),
+            extract_validation_context=_extract_validation_context,
+        )
+        with self.assertRaises(AssertionError):
+            _ = suite.valid
+        with self.assertRaises(AssertionError):
+            _ = suite.errors
+
+        pushed_suite = _run(suite.push({"transactions": []}).avalidate())
+        self.assertIsInstance(pushed_suite, configsuite.AsyncConfigSuite)
+        self.assertTrue(pushed_suite.valid, pushed_suite.errors)
+
+    def test_unreadable(self):
+        suite = configsuite.AsyncConfigSuite([], _build_async_schema(_CallTracker()))
+        self.assertFalse(suite.readable)
+        self.assertFalse(suite.valid)
+        self.assertIs(suite, _run(suite.avalidate()))
+
+    def test_coroutine_validator_in_sync_suite(self):
+        with self.assertRaises(TypeError):
+            configsuite.ConfigSuite(
+                transactions.build_config(),
+                _build_async_schema(_CallTracker()),
+                extract_validation_context=transactions.extract_validation_context,
+            )
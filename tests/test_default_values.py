@@ -78,6 +78,35 @@ class TestDefaultValues(unittest.TestCase):
             self.assertEqual(expected_location, config_owner.location)
             self.assertEqual(expected_casualties, config_owner.casualties)
 
+    def test_default_values_many_named_dicts(self):
+        raw_config = car.build_config()
+        raw_config["incidents"] = [
+            {"location": "location_{}".format(idx)} for idx in range(100)
+        ]
+        raw_config["incidents"][42]["casualties"] = 3
+
+        config_suite = configsuite.ConfigSuite(raw_config, car.build_schema())
+        self.assertTrue(config_suite.valid, config_suite.errors)
+
+        incidents = config_suite.snapshot.incidents
+        self.assertEqual(100, len(incidents))
+        for idx, incident in enumerate(incidents):
+            self.assertEqual("location_{}".format(idx), incident.location)
+            self.assertEqual(3 if idx == 42 else 0, incident.casualties)
+
+    def test_default_values_not_shared_between_layers(self):
+        car_schema = car.build_schema()
+        raw_config = car.build_all_default_config()
+
+        config_suite = configsuite.ConfigSuite(raw_config, car_schema)
+        self.assertTrue(config_suite.valid)
+        pushed_suite = config_suite.push({"tire": {"rim": "blue"}})
+        self.assertTrue(pushed_suite.valid)
+
+        self.assertEqual("green", config_suite.snapshot.tire.rim)
+        self.assertEqual("blue", pushed_suite.snapshot.tire.rim)
+        self.assertEqual(17, pushed_suite.snapshot.tire.dimension)
+
     def test_element_transformations_applied(self):
         raw_config = car.build_all_default_config()
         car_schema = car.build_schema()
@@ -0,0 +1,114 @@
+"""Copyright 2021 Equinor ASA and The Netherlands Organisation for
+Applied Scientific Research TNO.
+
+Licensed under the MIT license.
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the conditions stated in the LICENSE file in the project root for
+details.
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+"""
+
+
+import unittest
+from unittest import mock
+
+import configsuite
+from configsuite import differ
+
+from .data import car
+from .data import transactions
+
+
+class TestDiff(unittest.TestCase):
+    def test_diff_pushed_suite(self):
+        suite = configsuite.ConfigSuite(car.build_config(), car.build_schema())
+        pushed_suite = suite.push(
+            {
+                "country": "Sweden",
+                "owner": {"first entry": {"location": "Mars"}},
+                "incidents": [{"location": "nowhere"}],
+            }
+        )
+        self.assertTrue(pushed_suite.valid, pushed_suite.errors)
+
+        self.assertEqual(
+            (("country",), ("incidents", 2), ("owner", "first entry", "location")),
+            configsuite.diff(suite, pushed_suite),
+        )
+        self.assertEqual((), configsuite.diff(suite, suite.push({})))
+
+    def test_diff_dicts(self):
+        raw_config = transactions.build_config()
+        suite = configsuite.ConfigSuite(
+            raw_config,
+            transactions.build_schema(),
+            extract_validation_context=transactions.extract_validation_context,
+        )
+        raw_config["exchange_rates"].pop("FLC")
+        raw_config["exchange_rates"]["SEK"] = 0.9
+        raw_config["exchange_rates"]["NOK"] = 1.0
+        raw_config["transactions"] = raw_config["transactions"][:2]
+        other_suite = configsuite.ConfigSuite(
+            raw_config,
+            transactions.build_schema(),
+            extract_validation_context=transactions.extract_validation_context,
+        )
+
+        self.assertEqual(
+            (
+                ("exchange_rates", "NOK"),
+                ("exchange_rates", "FLC"),
+                ("exchange_rates", "SEK"),
+                ("transactions", 2),
+            ),
+            configsuite.diff(suite, other_suite),
+        )
+
+    def test_diff_none(self):
+        raw_config = car.build_config()
+        suite = configsuite.ConfigSuite(raw_config, car.build_schema())
+        raw_config["tire"]["rim"] = None
+        other_suite = configsuite.ConfigSuite(raw_config, car.build_schema())
+        self.assertTrue(other_suite.valid, other_suite.errors)
+
+        self.assertEqual((("tire", "rim"),), configsuite.diff(suite, other_suite))
+        self.assertEqual((("tire", "rim"),), configsuite.diff(other_suite, suite))
+
+    def test_diff_skips_shared_subtrees(self):
+        raw_config = car.build_config()
+        raw_config["incidents"] *= 1000
+        suite = configsuite.ConfigSuite(raw_config, car.build_schema())
+        pushed_suite = suite.push({"tire": {"dimension": 17}})
+
+        with mock.patch.object(differ, "_diff", wraps=differ._diff) as diff_mock:
+            changes = configsuite.diff(suite, pushed_suite)
+        self.assertEqual((("tire", "dimension"),), changes)
+        self.assertLess(diff_mock.call_count, 20)
+
+    def test_diff_equal_suites(self):
+        suite = configsuite.ConfigSuite(car.build_config(), car.build_schema())
+        other_suite = configsuite.ConfigSuite(car.build_config(), car.build_schema())
+        self.assertEqual((), configsuite.diff(suite, other_suite))
+
+        compact_suite = configsuite.ConfigSuite(
+            car.build_config(), car.build_schema(), compact_snapshot=True
+        )
+        self.assertEqual((), configsuite.diff(suite, compact_suite))
+
+    def test_diff_other_schema(self):
+        suite = configsuite.ConfigSuite(car.build_config(), car.build_schema())
+        other_suite = configsuite.ConfigSuite(
+            transactions.build_config(),
+            transactions.build_schema(),
+            extract_validation_context=transactions.extract_validation_context,
+        )
+        with self.assertRaises(ValueError):
+            configsuite.diff(suite, other_suite)
@@ -17,10 +17,13 @@ in all copies or substantial portions of the Software.
 """
 
 
+import io
 import unittest
 import sys
 
 import configsuite
+from configsuite import MetaKeys as MK
+from configsuite import types
 
 from . import data
 
@@ -49,3 +52,56 @@ class TestDocGen(unittest.TestCase):
 
         exp_docs = data.pets.build_docs()
         self.assertEqual(sorted(exp_docs), sorted(docs))
+
+    @unittest.skipIf(sys.version_info < (3, 6), reason="requires python3.6 or higher")
+    def test_iter_generate(self):
+        schema = data.pets.build_schema()
+        fragments = list(configsuite.docs.iter_generate(schema))
+        self.assertGreater(len(fragments), 1)
+        self.assertEqual(data.pets.build_docs(), "".join(fragments))
+
+        fileobj = io.StringIO()
+        configsuite.docs.write(schema, fileobj)
+        self.assertEqual(data.pets.build_docs(), fileobj.getvalue())
+
+    def test_generate_shared_schemas(self):
+        currency = {MK.Type: types.String, MK.Description: "A currency"}
+        schema = {
+            MK.Type: types.NamedDict,
+            MK.Content: {
+                "source": currency,
+                "target": currency,
+                "currencies": {
+                    MK.Type: types.List,
+                    MK.Content: {MK.Item: currency},
+                },
+            },
+        }
+        docs = configsuite.docs.generate(schema)
+        self.assertEqual(2, docs.count("\n    A currency\n"))
+        self.assertEqual(1, docs.count("\n            A currency\n"))
+
+        unshared_schema = {
+            MK.Type: types.NamedDict,
+            MK.Content: {
+                "source": dict(currency),
+                "target": dict(currency),
+                "currencies": {
+                    MK.Type: types.List,
+                    MK.Content: {MK.Item: dict(currency)},
+                },
+            },
+        }
+        self.assertEqual(configsuite.docs.generate(unshared_schema), docs)
+
+    def test_generate_deep_schema(self):
+        depth = 2 * sys.getrecursionlimit()
+        schema = {MK.Type: types.Integer}
+        for _ in range(depth):
+            schema = {MK.Type: types.List, MK.Content: {MK.Item: schema}}
+
+        fileobj = io.StringIO()
+        configsuite.docs.write(schema, fileobj)
+        docs = fileobj.getvalue()
+        self.assertEqual(depth, docs.count("**<list_item>:**"))
+        self.assertTrue(docs.endswith(2 * depth * 4 * " " + ":type: integer"))
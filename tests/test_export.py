@@ -0,0 +1,102 @@
+"""Copyright 2021 Equinor ASA and The Netherlands Organisation for
+Applied Scientific Research TNO.
+
+Licensed under the MIT license.
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the conditions stated in the LICENSE file in the project root for
+details.
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+"""
+
+
+import datetime
+import json
+import unittest
+
+import configsuite
+from configsuite import MetaKeys as MK
+
+from .data import car
+from .data import transactions
+
+
+class TestExport(unittest.TestCase):
+    def test_to_primitive(self):
+        suite = configsuite.ConfigSuite(car.build_config(), car.build_schema())
+        self.assertTrue(suite.valid, suite.errors)
+
+        expected = {
+            "production_date": datetime.datetime(2000, 1, 1),
+            "country": "Norway",
+            "tire": {"dimension": 15, "rim": "green"},
+            "owner": {
+                "first entry": {"name": "Johan", "location": "Svalbard"},
+                "second entry": {"name": "Svein", "location": "Earth"},
+            },
+            "incidents": [
+                {"location": "whereabouts", "casualties": 0},
+                {"location": "somewhere else", "casualties": 1},
+            ],
+        }
+        self.assertEqual(expected, suite.to_primitive())
+        self.assertEqual(
+            expected, configsuite.export(suite.snapshot, car.build_schema())
+        )
+
+    def test_export_round_trip(self):
+        schema = transactions.build_schema()
+        suite = configsuite.ConfigSuite(
+            transactions.build_config(),
+            schema,
+            extract_validation_context=transactions.extract_validation_context,
+        )
+        self.assertTrue(suite.valid, suite.errors)
+
+        exported = suite.to_primitive()
+        self.assertEqual(transactions.build_config(), exported)
+
+        exported_suite = configsuite.ConfigSuite(
+            exported,
+            schema,
+            extract_validation_context=transactions.extract_validation_context,
+        )
+        self.assertEqual(suite.snapshot, exported_suite.snapshot)
+
+    def test_export_none(self):
+        schema = car.build_schema()
+        schema[MK.Content]["country"][MK.Default] = None
+
+        raw_config = car.build_config()
+        raw_config.pop("country", None)
+        suite = configsuite.ConfigSuite(raw_config, schema)
+        self.assertTrue(suite.valid, suite.errors)
+        self.assertIsNone(suite.to_primitive()["country"])
+
+    def test_to_json(self):
+        suite = configsuite.ConfigSuite(car.build_config(), car.build_schema())
+        self.assertTrue(suite.valid, suite.errors)
+
+        exported = json.loads(suite.to_json())
+        self.assertEqual("2000-01-01T00:00:00", exported["production_date"])
+        self.assertEqual(
+            json.loads(configsuite.export_json(suite.snapshot, car.build_schema())),
+            exported,
+        )
+        exported.pop("production_date")
+        expected = suite.to_primitive()
+        expected.pop("production_date")
+        self.assertEqual(expected, exported)
+
+    def test_unreadable_export(self):
+        suite = configsuite.ConfigSuite([], car.build_schema())
+        self.assertFalse(suite.readable)
+        with self.assertRaises(AssertionError):
+            suite.to_primitive()
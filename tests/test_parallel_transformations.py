@@ -0,0 +1,99 @@
+"""Copyright 2021 Equinor ASA and The Netherlands Organisation for
+Applied Scientific Research TNO.
+
+Licensed under the MIT license.
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the conditions stated in the LICENSE file in the project root for
+details.
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+"""
+
+
+import concurrent.futures
+import unittest
+
+import configsuite
+from configsuite import MetaKeys as MK
+from configsuite import types
+
+
+@configsuite.transformation_msg("Doubles x, fails on multiples of 7")
+def _double(x):
+    if x % 7 == 0:
+        raise ValueError("multiple of 7")
+    return 2 * x
+
+
+def _build_list_schema():
+    return {
+        MK.Type: types.List,
+        MK.Content: {MK.Item: {MK.Type: types.Integer, MK.Transformation: _double}},
+    }
+
+
+def _build_dict_schema():
+    return {
+        MK.Type: types.Dict,
+        MK.Content: {
+            MK.Key: {MK.Type: types.Integer, MK.Transformation: _double},
+            MK.Value: {MK.Type: types.Integer, MK.Transformation: _double},
+        },
+    }
+
+
+class TestParallelTransformations(unittest.TestCase):
+    def test_transform_list_in_chunks(self):
+        schema = _build_list_schema()
+        config = tuple(range(1, 1000))
+
+        serial = configsuite.Transformer(schema, MK.Transformation, ())
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            parallel = configsuite.Transformer(
+                schema, MK.Transformation, (), executor=executor, chunk_size=100
+            )
+            parallel_res = parallel.transform(config)
+        serial_res = serial.transform(config)
+
+        self.assertEqual(serial_res.result, parallel_res.result)
+        self.assertEqual(serial_res.errors, parallel_res.errors)
+        self.assertEqual(
+            [(idx,) for idx, elem in enumerate(config) if elem % 7 == 0],
+            [err.key_path for err in parallel_res.errors],
+        )
+
+    def test_transform_dict_in_chunks(self):
+        schema = _build_dict_schema()
+        config = {key: key + 1 for key in range(1, 1000, 2)}
+
+        serial = configsuite.Transformer(schema, MK.Transformation, ())
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            parallel = configsuite.Transformer(
+                schema, MK.Transformation, (), executor=executor, chunk_size=33
+            )
+            parallel_res = parallel.transform(config)
+        serial_res = serial.transform(config)
+
+        self.assertEqual(serial_res.result, parallel_res.result)
+        self.assertEqual(serial_res.errors, parallel_res.errors)
+        self.assertFalse(parallel_res.success)
+
+    def test_suite_with_executor(self):
+        schema = _build_list_schema()
+        config = [elem for elem in range(5000) if elem % 7 != 0]
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            suite = configsuite.ConfigSuite(config, schema, executor=executor)
+            self.assertTrue(suite.valid, suite.errors)
+            self.assertEqual(tuple(2 * elem for elem in config), suite.snapshot)
+
+            pushed_suite = suite.push([7])
+            self.assertFalse(pushed_suite.valid)
+            self.assertEqual((len(config),), pushed_suite.errors[0].key_path)
@@ -0,0 +1,219 @@
+"""Copyright 2021 Equinor ASA and The Netherlands Organisation for
+Applied Scientific Research TNO.
+
+Licensed under the MIT license.
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the conditions stated in the LICENSE file in the project root for
+details.
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+"""
+
+
+import asyncio
+import collections
+import concurrent.futures
+import sys
+import threading
+import time
+import unittest
+from unittest import mock
+
+import configsuite
+from configsuite import MetaKeys as MK
+from configsuite import executors
+
+from .data import transactions
+
+
+Context = collections.namedtuple("Context", ("currencies",))
+
+
+class _SlowCurrencyCheck(object):
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+
+    def __call__(self, elem, context):
+        with self._lock:
+            self.running += 1
+            self.max_running = max(self.running, self.max_running)
+        time.sleep(0.005)
+        with self._lock:
+            self.running -= 1
+        return elem in context.currencies
+
+
+def _build_schema(check):
+    schema = transactions.build_schema()
+    is_currency = configsuite.validator_msg("Should be defined currency")(check)
+    transaction_schema = schema[MK.Content]["transactions"][MK.Content][MK.Item]
+    for key in ("source", "target"):
+        transaction_schema[MK.Content][key][MK.ContextValidators] = (is_currency,)
+    return schema
+
+
+@configsuite.validator_msg("Should be upper case")
+def _is_upper(elem, _context):
+    return elem.isupper()
+
+
+def _build_shared_key_value_schema():
+    string_schema = {
+        MK.Type: configsuite.types.String,
+        MK.ContextValidators: (_is_upper,),
+    }
+    return {
+        MK.Type: configsuite.types.Dict,
+        MK.Content: {MK.Key: string_schema, MK.Value: string_schema},
+    }
+
+
+def _build_config():
+    config = transactions.build_config()
+    config["transactions"] *= 5
+    config["transactions"] += [
+        {"source": "SEK", "target": "NOK", "amount": 10},
+        {"source": "NOK", "target": "EUR", "amount": -10},
+        {"source": "DKK", "target": "ISK", "amount": 1},
+    ]
+    return config
+
+
+class TestParallelValidation(unittest.TestCase):
+    def test_executor_context_validators(self):
+        check = _SlowCurrencyCheck()
+        schema = _build_schema(check)
+        config = _build_config()
+        context = Context(tuple(config["exchange_rates"].keys()))
+
+        serial_result = configsuite.Validator(schema).validate(config, context)
+        self.assertEqual(1, check.max_running)
+        self.assertFalse(serial_result.valid)
+        self.assertEqual(4, len(serial_result.errors))
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+            validator = configsuite.Validator(schema, executor=executor)
+            for _ in range(3):
+                self.assertEqual(serial_result, validator.validate(config, context))
+        self.assertGreater(check.max_running, 1)
+
+    def test_executor_shared_key_value_schema(self):
+        schema = _build_shared_key_value_schema()
+        for config in ({"a": "B"}, {"A": "b"}, {"a": "b"}, {"A": "B"}):
+            serial_result = configsuite.Validator(schema).validate(config, None)
+            with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+                validator = configsuite.Validator(schema, executor=executor)
+                self.assertEqual(serial_result, validator.validate(config, None))
+
+    def test_executor_valid_config(self):
+        schema = _build_schema(_SlowCurrencyCheck())
+        config = transactions.build_config()
+        context = Context(tuple(config["exchange_rates"].keys()))
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            validator = configsuite.Validator(schema, executor=executor)
+            val_res = validator.validate(config, context)
+        self.assertTrue(val_res.valid, val_res.errors)
+
+    def test_executor_validator_raises(self):
+        schema = _build_schema(_SlowCurrencyCheck())
+        config = transactions.build_config()
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            validator = configsuite.Validator(schema, executor=executor)
+            with self.assertRaises(AttributeError):
+                validator.validate(config, None)
+
+    def test_executor_avalidate(self):
+        check = _SlowCurrencyCheck()
+        schema = _build_schema(check)
+        config = _build_config()
+        context = Context(tuple(config["exchange_rates"].keys()))
+        serial_result = configsuite.Validator(schema).validate(config, context)
+
+        loop = asyncio.new_event_loop()
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+                validator = configsuite.Validator(schema, executor=executor)
+                val_res = loop.run_until_complete(validator.avalidate(config, context))
+        finally:
+            loop.close()
+        self.assertEqual(serial_result, val_res)
+
+    def test_validate_list_in_chunks(self):
+        config = _build_config()
+        config["transactions"] *= 20
+        schema = transactions.build_schema()
+        context = Context(tuple(config["exchange_rates"].keys()))
+        serial_result = configsuite.Validator(schema).validate(config, context)
+        self.assertFalse(serial_result.valid)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            validator = configsuite.Validator(
+                schema, chunk_executor=executor, chunk_size=7
+            )
+            self.assertEqual(serial_result, validator.validate(config, context))
+
+        error_key_paths = [error.key_path for error in serial_result.errors]
+        self.assertIn(("transactions", 341, "target"), error_key_paths)
+
+    def test_validate_in_chunks_on_process_pool(self):
+        config = _build_config()
+        config["transactions"] *= 20
+        config["exchange_rates"] = {
+            "CUR{}".format(idx): (idx % 50) - 1 for idx in range(200)
+        }
+        config["exchange_rates"].update(transactions.build_config()["exchange_rates"])
+        schema = transactions.build_schema()
+        context = Context(tuple(config["exchange_rates"].keys()))
+        serial_result = configsuite.Validator(schema).validate(config, context)
+        self.assertFalse(serial_result.valid)
+
+        with concurrent.futures.ProcessPoolExecutor(max_workers=2) as executor:
+            validator = configsuite.Validator(
+                schema, chunk_executor=executor, chunk_size=16
+            )
+            self.assertEqual(serial_result, validator.validate(config, context))
+            self.assertEqual(serial_result, validator.validate(config, context))
+
+    def test_validate_dict_in_chunks(self):
+        config = transactions.build_config()
+        config["exchange_rates"] = {
+            "CUR{}".format(idx): (idx % 50) - 1 for idx in range(1000)
+        }
+        config["exchange_rates"][17] = 1
+        schema = transactions.build_schema()
+        context = Context(tuple(config["exchange_rates"].keys()))
+        serial_result = configsuite.Validator(schema).validate(config, context)
+        self.assertFalse(serial_result.valid)
+        self.assertIn(
+            ("exchange_rates", 17), [error.key_path for error in serial_result.errors]
+        )
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            validator = configsuite.Validator(
+                schema, chunk_executor=executor, chunk_size=64
+            )
+            self.assertEqual(serial_result, validator.validate(config, context))
+
+    def test_parallel_executor(self):
+        with mock.patch.object(sys, "_is_gil_enabled", lambda: False, create=True):
+            self.assertTrue(executors.free_threading())
+            executor = executors.parallel_executor(max_workers=2)
+        self.assertIsInstance(executor, concurrent.futures.ThreadPoolExecutor)
+        executor.shutdown()
+
+        with mock.patch.object(sys, "_is_gil_enabled", lambda: True, create=True):
+            self.assertFalse(executors.free_threading())
+            executor = executors.parallel_executor(max_workers=2)
+        self.assertIsInstance(executor, concurrent.futures.ProcessPoolExecutor)
+        executor.shutdown()
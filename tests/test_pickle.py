@@ -0,0 +1,131 @@
+"""Copyright 2021 Equinor ASA and The Netherlands Organisation for
+Applied Scientific Research TNO.
+
+Licensed under the MIT license.
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the conditions stated in the LICENSE file in the project root for
+details.
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+"""
+
+
+import concurrent.futures
+import multiprocessing
+import pickle
+import unittest
+
+import configsuite
+from configsuite import MetaKeys as MK
+
+from .data import car
+from .data import transactions
+
+
+@configsuite.validator_msg("Is x a user value")
+def _is_user_value(x):
+    return isinstance(x, str)
+
+
+def _build_suite(raw_config=None, **kwargs):
+    return configsuite.ConfigSuite(
+        transactions.build_config() if raw_config is None else raw_config,
+        transactions.build_schema(),
+        extract_validation_context=transactions.extract_validation_context,
+        **kwargs
+    )
+
+
+def _push_transaction(suite):
+    pushed = suite.push({"transactions": [{"source": "NOK", "target": "EUR"}]})
+    return (suite.valid, set(suite.errors), pushed.valid, set(pushed.errors))
+
+
+class TestPickle(unittest.TestCase):
+    def test_pickle_schema(self):
+        schema = car.build_schema_with_validators_and_transformators()
+        unpickled = pickle.loads(pickle.dumps(schema))
+
+        tire_schema = schema[MK.Content]["tire"][MK.Content]["dimension"]
+        unpickled_tire_schema = unpickled[MK.Content]["tire"][MK.Content]["dimension"]
+        for key in (MK.Type, MK.Transformation, MK.ContextTransformation):
+            self.assertIs(tire_schema[key], unpickled_tire_schema[key])
+        self.assertIs(
+            tire_schema[MK.ElementValidators][0],
+            unpickled_tire_schema[MK.ElementValidators][0],
+        )
+        self.assertEqual(
+            configsuite.schema.schema_fingerprint(schema),
+            configsuite.schema.schema_fingerprint(unpickled),
+        )
+
+    def test_pickle_types(self):
+        for data_type in (
+            configsuite.types.NamedDict,
+            configsuite.types.List,
+            configsuite.types.String,
+            configsuite.types.Callable,
+        ):
+            self.assertIs(data_type, pickle.loads(pickle.dumps(data_type)))
+
+        user_type = configsuite.BasicType("user", _is_user_value)
+        unpickled = pickle.loads(pickle.dumps(user_type))
+        self.assertIsInstance(unpickled, configsuite.BasicType)
+        self.assertEqual(user_type, unpickled)
+        self.assertIs(_is_user_value, unpickled.validate)
+
+    def test_pickle_wrapped_builtin(self):
+        is_callable = configsuite.validator_msg("Is x callable")(callable)
+        unpickled = pickle.loads(pickle.dumps(is_callable))
+        self.assertEqual(is_callable.msg, unpickled.msg)
+        self.assertTrue(unpickled(len))
+        self.assertFalse(unpickled(1))
+
+        to_upper = configsuite.transformation_msg("To upper")(str.upper)
+        self.assertEqual("ABC", pickle.loads(pickle.dumps(to_upper))("abc"))
+
+    def test_pickle_suite(self):
+        for raw_config in (
+            transactions.build_config(),
+            {"transactions": [{"source": "NOK", "target": "SEK", "amount": 1}]},
+        ):
+            suite = _build_suite(raw_config)
+            unpickled = pickle.loads(pickle.dumps(suite))
+
+            self.assertEqual(suite.readable, unpickled.readable)
+            self.assertEqual(suite.valid, unpickled.valid)
+            self.assertEqual(suite.errors, unpickled.errors)
+            self.assertEqual(suite.snapshot, unpickled.snapshot)
+            self.assertEqual(_push_transaction(suite), _push_transaction(unpickled))
+            self.assertEqual({}, suite.__getstate__()["_default_templates"])
+
+    def test_pickle_suite_executor_and_cache(self):
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            suite = _build_suite(
+                executor=executor, layer_cache=configsuite.LayerCache()
+            )
+            unpickled = pickle.loads(pickle.dumps(suite))
+
+        self.assertTrue(unpickled.valid, unpickled.errors)
+        pushed = unpickled.push({})
+        self.assertTrue(pushed.valid, pushed.errors)
+        self.assertEqual(unpickled.snapshot, pushed.snapshot)
+
+    def test_suite_to_spawned_worker(self):
+        suites = (
+            _build_suite(),
+            _build_suite({"transactions": [{"source": "SEK"}]}),
+        )
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=1, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            results = list(executor.map(_push_transaction, suites))
+
+        self.assertEqual([_push_transaction(suite) for suite in suites], results)
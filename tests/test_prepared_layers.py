@@ -0,0 +1,246 @@
+"""Copyright 2021 Equinor ASA and The Netherlands Organisation for
+Applied Scientific Research TNO.
+
+Licensed under the MIT license.
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the conditions stated in the LICENSE file in the project root for
+details.
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+"""
+
+
+import sys
+import unittest
+
+import configsuite
+from configsuite import MetaKeys as MK
+
+from .data import numbers
+from .data import transactions
+
+
+def _build_counting_schema():
+    schema = numbers.build_schema()
+    layer_transformation = schema[MK.LayerTransformation]
+    calls = []
+
+    @configsuite.transformation_msg(layer_transformation.msg)
+    def _counting_transformation(elem):
+        calls.append(elem)
+        return layer_transformation(elem)
+
+    schema[MK.LayerTransformation] = _counting_transformation
+    return schema, calls
+
+
+class TestPreparedLayers(unittest.TestCase):
+    def test_prepared_layer_snapshot(self):
+        schema = numbers.build_schema()
+        layers = ("1-6", [11, 7, 18])
+        prepared_layers = [configsuite.PreparedLayer(layer, schema) for layer in layers]
+
+        suite = configsuite.ConfigSuite("20-22", schema, layers=layers)
+        prepared_suite = configsuite.ConfigSuite(
+            "20-22", schema, layers=prepared_layers
+        )
+        self.assertTrue(prepared_suite.valid, prepared_suite.errors)
+        self.assertEqual(suite.snapshot, prepared_suite.snapshot)
+
+    def test_prepared_layer_reused(self):
+        schema, calls = _build_counting_schema()
+        base_layer = configsuite.PreparedLayer("1-100", schema)
+        self.assertEqual(["1-100"], calls)
+
+        for idx in range(10):
+            suite = configsuite.ConfigSuite([200 + idx], schema, layers=(base_layer,))
+            self.assertTrue(suite.valid, suite.errors)
+            self.assertEqual(tuple(range(1, 101)) + (200 + idx,), suite.snapshot)
+
+        self.assertEqual(["1-100"] + [[200 + idx] for idx in range(10)], calls)
+
+    def test_push_reuses_layers(self):
+        schema, calls = _build_counting_schema()
+        suite = configsuite.ConfigSuite("1-3", schema, layers=("5-6",))
+        self.assertEqual(["5-6", "1-3"], calls)
+
+        pushed_suite = suite.push("10")
+        self.assertTrue(pushed_suite.valid, pushed_suite.errors)
+        self.assertEqual((1, 2, 3, 5, 6, 10), pushed_suite.snapshot)
+        self.assertEqual(["5-6", "1-3", "10"], calls)
+
+    def test_prepared_layer_other_schema(self):
+        schema, calls = _build_counting_schema()
+        other_schema, other_calls = _build_counting_schema()
+
+        prepared_layer = configsuite.PreparedLayer("1-3", schema)
+        suite = configsuite.ConfigSuite([], other_schema, layers=(prepared_layer,))
+        self.assertTrue(suite.valid, suite.errors)
+        self.assertEqual((1, 2, 3), suite.snapshot)
+        self.assertEqual(["1-3"], calls)
+        self.assertEqual(["1-3", []], other_calls)
+
+    def test_prepared_layer_not_retained(self):
+        schema, _ = _build_counting_schema()
+        other_schema, _ = _build_counting_schema()
+
+        prepared_layer = configsuite.PreparedLayer("1-3", schema)
+        self.assertEqual("1-3", prepared_layer.raw_layer)
+
+        layer = [1, 2]
+        prepared_layer = configsuite.PreparedLayer(layer, schema)
+        prepared_layer.raw_layer.append(3)
+        self.assertEqual(layer, prepared_layer.raw_layer)
+
+        prepared_layer = configsuite.PreparedLayer("1-3", schema, keep_raw_layer=False)
+        self.assertIsNone(prepared_layer.raw_layer)
+        self.assertIs(prepared_layer, prepared_layer.prepare(schema))
+        with self.assertRaises(ValueError):
+            prepared_layer.prepare(other_schema)
+
+    def test_layer_transformation_in_place(self):
+        @configsuite.transformation_msg("Set b")
+        def _set_b(elem):
+            elem["b"] = 5
+            return elem
+
+        schema = {
+            MK.Type: configsuite.types.NamedDict,
+            MK.LayerTransformation: _set_b,
+            MK.Content: {
+                "a": {MK.Type: configsuite.types.Integer},
+                "b": {MK.Type: configsuite.types.Integer},
+            },
+        }
+        raw_config = {"a": 1}
+        suite = configsuite.ConfigSuite(raw_config, schema, deduce_required=True)
+        self.assertTrue(suite.valid, suite.errors)
+        self.assertEqual(5, suite.snapshot.b)
+        self.assertEqual({"a": 1}, raw_config)
+
+        prepared_layer = configsuite.PreparedLayer(raw_config, schema)
+        self.assertEqual({"a": 1, "b": 5}, prepared_layer.layer)
+        self.assertEqual({"a": 1}, prepared_layer.raw_layer)
+        self.assertEqual({"a": 1}, raw_config)
+
+    def test_suite_does_not_retain_layers(self):
+        schema = numbers.build_schema()
+        cache = configsuite.LayerCache()
+        suite = configsuite.ConfigSuite(
+            [3], schema, layers=([1], [2]), layer_cache=cache
+        )
+        self.assertTrue(suite.valid, suite.errors)
+        self.assertEqual(3, len(cache))
+        for layer in ([1], [2], [3]):
+            self.assertIsNone(cache.prepare(layer, schema).raw_layer)
+
+    def test_prepared_layer_unreadable(self):
+        schema = numbers.build_schema()
+        prepared_layer = configsuite.PreparedLayer("1--100", schema)
+        self.assertEqual(1, len(prepared_layer.errors))
+        self.assertEqual(1, len(prepared_layer.readability_errors))
+
+        suite = configsuite.ConfigSuite([], schema, layers=([1], prepared_layer))
+        self.assertFalse(suite.readable)
+        self.assertEqual(2, len(suite.errors))
+        self.assertIsInstance(suite.errors[0], configsuite.TransformationError)
+        self.assertIsInstance(suite.errors[1], configsuite.InvalidTypeError)
+        self.assertEqual(1, suite.errors[1].layer)
+
+    def test_layer_cache_reuses_equal_layers(self):
+        schema, calls = _build_counting_schema()
+        cache = configsuite.LayerCache()
+
+        for _ in range(3):
+            suite = configsuite.ConfigSuite(
+                [50], schema, layers=("1-3", "1-3", [7]), layer_cache=cache
+            )
+            self.assertTrue(suite.valid, suite.errors)
+            self.assertEqual((1, 2, 3, 7, 50), suite.snapshot)
+
+        self.assertEqual(["1-3", [7], [50]], calls)
+        self.assertEqual(3, len(cache))
+
+    def test_layer_cache_eviction(self):
+        schema, calls = _build_counting_schema()
+        cache = configsuite.LayerCache(maxsize=2)
+
+        for layer in ("1", "2", "3", "3"):
+            cache.prepare(layer, schema)
+        self.assertEqual(["1", "2", "3"], calls)
+        self.assertEqual(2, len(cache))
+
+        cache.prepare("1", schema)
+        self.assertEqual(["1", "2", "3", "1"], calls)
+
+        self.assertTrue(cache.evict("1", schema))
+        self.assertFalse(cache.evict("1", schema))
+        self.assertEqual(1, len(cache))
+
+        cache.clear()
+        self.assertEqual(0, len(cache))
+
+    def test_layer_cache_compares_schemas(self):
+        schema, calls = _build_counting_schema()
+        other_schema, other_calls = _build_counting_schema()
+        cache = configsuite.LayerCache()
+
+        prepared_layer = cache.prepare("1-3", schema, fingerprint="fingerprint")
+        self.assertIs(
+            prepared_layer, cache.prepare("1-3", schema, fingerprint="fingerprint")
+        )
+        other_layer = cache.prepare("1-3", other_schema, fingerprint="fingerprint")
+        self.assertIsNot(prepared_layer, other_layer)
+        self.assertEqual(["1-3"], calls)
+        self.assertEqual(["1-3"], other_calls)
+        self.assertEqual(1, len(cache))
+
+    def test_layer_digest(self):
+        first = {"a": [1, 2, {"b": "c"}], "d": 4}
+        second = {"d": 4, "a": [1, 2, {"b": "c"}]}
+        self.assertEqual(
+            configsuite.layer.layer_digest(first),
+            configsuite.layer.layer_digest(second),
+        )
+        self.assertNotEqual(
+            configsuite.layer.layer_digest([1, 2]),
+            configsuite.layer.layer_digest([2, 1]),
+        )
+
+    def test_prepared_layer_intern_strings(self):
+        schema = transactions.build_schema()
+        layer = {
+            "transactions": [
+                {"source": "".join(["N", "OK"]), "target": "".join(["U", "SD"])}
+                for _ in range(10)
+            ]
+        }
+
+        prepared_layer = configsuite.PreparedLayer(layer, schema)
+        self.assertFalse(prepared_layer.intern_strings)
+        self.assertEqual(0, prepared_layer.interned_bytes)
+        self.assertIs(
+            prepared_layer,
+            prepared_layer.prepare(schema, intern_strings=False),
+        )
+
+        interned_layer = prepared_layer.prepare(schema, intern_strings=True)
+        self.assertIsNot(prepared_layer, interned_layer)
+        self.assertTrue(interned_layer.intern_strings)
+        self.assertEqual(prepared_layer.layer, interned_layer.layer)
+        self.assertGreater(interned_layer.interned_bytes, 0)
+        sources = [elem["source"] for elem in interned_layer.layer["transactions"]]
+        self.assertTrue(all(source is sources[0] for source in sources))
+        raw_sources = [
+            elem["source"] for elem in interned_layer.raw_layer["transactions"]
+        ]
+        self.assertTrue(all(source is sources[0] for source in raw_sources))
+        self.assertEqual(20 * sys.getsizeof("NOK"), interned_layer.interned_bytes)
+        self.assertIs(interned_layer, interned_layer.prepare(schema))
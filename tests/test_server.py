@@ -0,0 +1,212 @@
+"""Copyright 2021 Equinor ASA and The Netherlands Organisation for
+Applied Scientific Research TNO.
+
+Licensed under the MIT license.
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the conditions stated in the LICENSE file in the project root for
+details.
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+"""
+
+
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import configsuite
+
+from .data import transactions
+
+if hasattr(socket, "AF_UNIX"):
+    from configsuite import server
+else:
+    server = None
+
+
+_SCHEMA = "tests.data.transactions.build_schema"
+_CONTEXT = "tests.data.transactions.extract_validation_context"
+_FAILING_CONTEXT = "tests.test_server.failing_extractor"
+
+
+def failing_extractor(_snapshot):
+    raise RuntimeError("Cannot extract context")
+
+
+@unittest.skipIf(server is None, "Unix sockets are not supported")
+class TestServer(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "configsuite.sock")
+        self.registry = server.SchemaRegistry()
+        self.registry.add_schema(_SCHEMA)
+        for spec in (_CONTEXT, _FAILING_CONTEXT):
+            self.registry.add_extractor(spec)
+        self.server = server.ValidationServer(self.path, registry=self.registry)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        shutil.rmtree(self.tmpdir)
+
+    def test_validate(self):
+        with server.Client(self.path) as client:
+            val_res = client.validate(
+                transactions.build_config(),
+                _SCHEMA,
+                extract_validation_context=_CONTEXT,
+            )
+            self.assertTrue(val_res.valid, val_res.errors)
+
+            raw_config = transactions.build_config()
+            raw_config["transactions"][1]["target"] = "SEK"
+            val_res = client.validate(
+                raw_config, _SCHEMA, extract_validation_context=_CONTEXT
+            )
+
+        self.assertFalse(val_res.valid)
+        self.assertEqual(1, len(val_res.errors))
+        error = val_res.errors[0]
+        self.assertIsInstance(error, configsuite.InvalidValueError)
+        self.assertEqual(("transactions", 1, "target"), error.key_path)
+
+        suite = configsuite.ConfigSuite(
+            raw_config,
+            transactions.build_schema(),
+            extract_validation_context=transactions.extract_validation_context,
+        )
+        self.assertEqual(suite.errors, val_res.errors)
+
+    def test_layers(self):
+        raw_config = transactions.build_config()
+        layer = {"exchange_rates": raw_config.pop("exchange_rates")}
+
+        with server.Client(self.path) as client:
+            for _ in range(3):
+                val_res = client.validate(
+                    raw_config,
+                    _SCHEMA,
+                    layers=(layer,),
+                    extract_validation_context=_CONTEXT,
+                )
+                self.assertTrue(val_res.valid, val_res.errors)
+
+        self.assertIn(_SCHEMA, self.registry)
+        self.assertEqual(2, len(self.registry.layer_cache))
+
+    def test_concurrent_clients(self):
+        results = []
+
+        def _validate():
+            with server.Client(self.path) as client:
+                for _ in range(10):
+                    results.append(
+                        client.validate(
+                            transactions.build_config(),
+                            _SCHEMA,
+                            extract_validation_context=_CONTEXT,
+                        )
+                    )
+
+        threads = [threading.Thread(target=_validate) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(40, len(results))
+        self.assertTrue(all(val_res.valid for val_res in results))
+
+    def test_invalid_requests(self):
+        with server.Client(self.path) as client:
+            for spec in (
+                "build_schema",
+                "os.getpid",
+                "tests.data.no_such_module.build_schema",
+                "tests.data.transactions.no_such_function",
+                "tests.data.transactions.build_config",
+            ):
+                with self.assertRaises(ValueError):
+                    client.validate({}, spec)
+                with self.assertRaises(ValueError):
+                    client.validate(
+                        transactions.build_config(),
+                        _SCHEMA,
+                        extract_validation_context=spec,
+                    )
+
+            self.assertIn("error", client.request({"config": {}}))
+            self.assertIn("error", client.request({"schema": _SCHEMA}))
+
+            with self.assertRaises(ValueError) as err:
+                client.validate(
+                    transactions.build_config(),
+                    _SCHEMA,
+                    extract_validation_context=_FAILING_CONTEXT,
+                )
+            self.assertIn("RuntimeError", str(err.exception))
+
+            val_res = client.validate(
+                transactions.build_config(),
+                _SCHEMA,
+                extract_validation_context=_CONTEXT,
+            )
+            self.assertTrue(val_res.valid, val_res.errors)
+
+    def test_load_on_request(self):
+        registry = server.SchemaRegistry(load_on_request=True)
+        for spec in (
+            "build_schema",
+            "tests.data.no_such_module.build_schema",
+            "tests.data.transactions.no_such_function",
+            "tests.data.transactions.build_config",
+        ):
+            response = server.validate_request(registry, {"schema": spec, "config": {}})
+            self.assertIn("error", response)
+
+        response = server.validate_request(
+            registry,
+            {
+                "schema": _SCHEMA,
+                "config": transactions.build_config(),
+                "extract_validation_context": _CONTEXT,
+            },
+        )
+        self.assertTrue(response["valid"], response)
+        self.assertIn(_SCHEMA, registry)
+
+    def test_schema_validated_once(self):
+        with mock.patch.object(
+            configsuite.config,
+            "assert_valid_schema",
+            wraps=configsuite.config.assert_valid_schema,
+        ) as assert_valid_schema:
+            with server.Client(self.path) as client:
+                for _ in range(3):
+                    val_res = client.validate(
+                        transactions.build_config(),
+                        _SCHEMA,
+                        extract_validation_context=_CONTEXT,
+                    )
+                    self.assertTrue(val_res.valid, val_res.errors)
+        self.assertEqual(0, assert_valid_schema.call_count)
+
+    def test_unreadable_config(self):
+        with server.Client(self.path) as client:
+            val_res = client.validate([], _SCHEMA, extract_validation_context=_CONTEXT)
+        self.assertFalse(val_res.valid)
+        self.assertIsInstance(val_res.errors[0], configsuite.InvalidTypeError)
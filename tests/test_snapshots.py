@@ -0,0 +1,533 @@
+"""Copyright 2021 Equinor ASA and The Netherlands Organisation for
+Applied Scientific Research TNO.
+
+Licensed under the MIT license.
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the conditions stated in the LICENSE file in the project root for
+details.
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+"""
+
+
+import concurrent.futures
+import gc
+import json
+import multiprocessing
+import pickle
+import sys
+import tracemalloc
+import unittest
+
+import configsuite
+from configsuite import MetaKeys as MK
+from configsuite import snapshot as snapshot_module
+from configsuite import types
+from configsuite.snapshot import (
+    ColumnarListSnapshot,
+    DictSnapshot,
+    ListSnapshot,
+    NumericListSnapshot,
+    SharedNumericListSnapshot,
+    build_snapshot,
+)
+
+from .data import car
+from .data import numbers
+from .data import transactions
+
+
+@configsuite.transformation_msg("Converts to upper case")
+def _to_upper(elem):
+    return elem.upper()
+
+
+def _total_amount(snapshot):
+    return sum(transaction.amount for transaction in snapshot.transactions)
+
+
+def _shared_sum(snapshot):
+    return snapshot.name, sum(snapshot)
+
+
+class TestSnapshots(unittest.TestCase):
+    def test_named_dict_classes_shared(self):
+        suite = configsuite.ConfigSuite(car.build_config(), car.build_schema())
+        self.assertTrue(suite.valid, suite.errors)
+
+        incidents = suite.snapshot.incidents
+        self.assertEqual(2, len(incidents))
+        self.assertIs(type(incidents[0]), type(incidents[1]))
+
+    def test_pickle_snapshot(self):
+        suite = configsuite.ConfigSuite(car.build_config(), car.build_schema())
+        self.assertTrue(suite.valid, suite.errors)
+
+        snapshot = pickle.loads(pickle.dumps(suite.snapshot))
+        self.assertEqual(suite.snapshot, snapshot)
+        self.assertIs(type(suite.snapshot), type(snapshot))
+        self.assertIs(type(suite.snapshot.tire), type(snapshot.tire))
+        self.assertEqual(suite.snapshot.owner, snapshot.owner)
+
+    def test_snapshot_to_process_pool(self):
+        raw_config = transactions.build_config()
+        raw_config["transactions"] *= 100
+        suite = configsuite.ConfigSuite(
+            raw_config,
+            transactions.build_schema(),
+            extract_validation_context=transactions.extract_validation_context,
+        )
+        self.assertTrue(suite.valid, suite.errors)
+
+        with concurrent.futures.ProcessPoolExecutor(max_workers=2) as executor:
+            total = executor.submit(_total_amount, suite.snapshot).result()
+        self.assertEqual(_total_amount(suite.snapshot), total)
+
+    def test_dict_snapshot_lookup(self):
+        suite = configsuite.ConfigSuite(car.build_config(), car.build_schema())
+        self.assertTrue(suite.valid, suite.errors)
+        owner = suite.snapshot.owner
+
+        self.assertEqual("Earth", owner["second entry"].location)
+        self.assertEqual("Svalbard", owner.get("first entry").location)
+        self.assertIsNone(owner.get("third entry"))
+        with self.assertRaises(KeyError):
+            _ = owner["third entry"]
+
+        self.assertIn("second entry", owner.keys())
+        self.assertIn(("second entry", owner["second entry"]), owner)
+        self.assertNotIn("second entry", owner)
+        self.assertNotIn([], owner)
+
+        pairs = DictSnapshot([("a", "b")])
+        self.assertIn(("a", "b"), pairs)
+        self.assertNotIn("ab", pairs)
+        self.assertNotIn(["a", "b"], pairs)
+        self.assertNotIn(({}, "b"), pairs)
+        self.assertEqual(
+            ["first entry", "second entry"], sorted(pair.key for pair in owner)
+        )
+        self.assertEqual(tuple(owner), owner)
+        self.assertEqual(hash(tuple(owner)), hash(owner))
+        self.assertEqual(dict(owner.items()), dict(owner))
+
+    def test_dict_snapshot_large(self):
+        schema = transactions.build_schema()
+        raw_config = transactions.build_config()
+        raw_config["exchange_rates"] = {
+            "CUR{}".format(idx): idx + 1 for idx in range(10000)
+        }
+        raw_config["transactions"] = []
+
+        suite = configsuite.ConfigSuite(raw_config, schema)
+        self.assertTrue(suite.valid, suite.errors)
+
+        exchange_rates = suite.snapshot.exchange_rates
+        self.assertEqual(10000, len(exchange_rates))
+        for idx in range(0, 10000, 7):
+            self.assertEqual(idx + 1, exchange_rates["CUR{}".format(idx)])
+
+    def test_snapshot_hash_cached(self):
+        suite = configsuite.ConfigSuite(
+            car.build_config(), car.build_schema(), compact_snapshot=True
+        )
+        other_suite = configsuite.ConfigSuite(car.build_config(), car.build_schema())
+        self.assertIsNot(suite.snapshot, other_suite.snapshot)
+
+        cache = {suite.snapshot: "compiled"}
+        self.assertEqual("compiled", cache[other_suite.snapshot])
+        self.assertEqual(hash(suite.snapshot.incidents), suite.snapshot.incidents._hash)
+        self.assertEqual(hash(suite.snapshot.owner), hash(tuple(suite.snapshot.owner)))
+        self.assertEqual(hash(suite.snapshot), hash(tuple(suite.snapshot)))
+
+        pickled_snapshot = pickle.loads(pickle.dumps(suite.snapshot))
+        self.assertIsNone(pickled_snapshot.incidents._hash)
+        self.assertEqual(hash(suite.snapshot), hash(pickled_snapshot))
+
+    def test_hashed_snapshot_memory(self):
+        raw_config = transactions.build_config()
+        raw_config["transactions"] = [
+            {"source": "NOK", "target": "USD", "amount": idx} for idx in range(20000)
+        ]
+        snapshot = build_snapshot(raw_config, transactions.build_schema())
+        self.assertIsInstance(snapshot.transactions, ListSnapshot)
+
+        tracemalloc.start()
+        try:
+            hash(snapshot)
+            allocated, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertLess(allocated, 4096)
+        self.assertEqual(hash(snapshot), hash(tuple(snapshot)))
+
+    def test_list_snapshot_is_tuple(self):
+        suite = configsuite.ConfigSuite([3, 1, 2], numbers.build_schema())
+        snapshot = suite.snapshot
+        self.assertIsInstance(snapshot, ListSnapshot)
+        self.assertIsInstance(snapshot, tuple)
+        self.assertEqual(json.dumps(list(snapshot)), json.dumps(snapshot))
+        self.assertEqual(tuple(snapshot) + (4,), snapshot + (4,))
+        self.assertTrue(snapshot < (5,))
+        self.assertEqual(snapshot, pickle.loads(pickle.dumps(snapshot)))
+
+    def test_snapshot_eq_hash_mismatch(self):
+        raw_config = car.build_config()
+        suite = configsuite.ConfigSuite(
+            raw_config, car.build_schema(), compact_snapshot=True
+        )
+        equal_suite = configsuite.ConfigSuite(
+            raw_config, car.build_schema(), compact_snapshot=True
+        )
+        raw_config["country"] = "Sweden"
+        other_suite = configsuite.ConfigSuite(raw_config, car.build_schema())
+
+        self.assertEqual(suite.snapshot, equal_suite.snapshot)
+        self.assertNotEqual(suite.snapshot, other_suite.snapshot)
+        self.assertNotEqual(hash(suite.snapshot), hash(other_suite.snapshot))
+
+        # Mismatching cached hashes decide equality without comparing elements
+        incidents = suite.snapshot.incidents
+        equal_incidents = equal_suite.snapshot.incidents
+        equal_incidents._hash = hash(incidents) + 1
+        self.assertNotEqual(incidents, equal_incidents)
+        self.assertEqual(tuple(incidents), equal_incidents)
+
+    def test_pushed_snapshot_shares_subtrees(self):
+        raw_config = car.build_config()
+        raw_config["incidents"] *= 50
+        suite = configsuite.ConfigSuite(raw_config, car.build_schema())
+        self.assertTrue(suite.valid, suite.errors)
+
+        pushed_suite = suite.push({"owner": {"first entry": {"location": "Mars"}}})
+        self.assertTrue(pushed_suite.valid, pushed_suite.errors)
+
+        snapshot, pushed_snapshot = suite.snapshot, pushed_suite.snapshot
+        self.assertIsNot(snapshot, pushed_snapshot)
+        self.assertIs(snapshot.incidents, pushed_snapshot.incidents)
+        self.assertIs(snapshot.tire, pushed_snapshot.tire)
+        self.assertIsNot(snapshot.owner, pushed_snapshot.owner)
+        self.assertIs(
+            snapshot.owner["second entry"], pushed_snapshot.owner["second entry"]
+        )
+        self.assertEqual("Mars", pushed_snapshot.owner["first entry"].location)
+
+        unchanged_suite = suite.push({})
+        self.assertIs(snapshot, unchanged_suite.snapshot)
+
+    def test_base_snapshot(self):
+        raw_config = car.build_config()
+        suite = configsuite.ConfigSuite(raw_config, car.build_schema())
+
+        raw_config["incidents"].append({"location": "nowhere"})
+        new_suite = configsuite.ConfigSuite(
+            raw_config, car.build_schema(), base_snapshot=suite.snapshot
+        )
+        self.assertTrue(new_suite.valid, new_suite.errors)
+        self.assertEqual(3, len(new_suite.snapshot.incidents))
+        self.assertIs(suite.snapshot.incidents[1], new_suite.snapshot.incidents[1])
+        self.assertIs(suite.snapshot.owner, new_suite.snapshot.owner)
+
+    def test_compact_snapshot(self):
+        suite = configsuite.ConfigSuite(car.build_config(), car.build_schema())
+        compact_suite = configsuite.ConfigSuite(
+            car.build_config(), car.build_schema(), compact_snapshot=True
+        )
+        self.assertTrue(compact_suite.valid, compact_suite.errors)
+
+        snapshot, compact_snapshot = suite.snapshot, compact_suite.snapshot
+        self.assertEqual(snapshot, compact_snapshot)
+        self.assertEqual(compact_snapshot, snapshot)
+        self.assertEqual(hash(snapshot), hash(compact_snapshot))
+        self.assertEqual(suite.to_primitive(), compact_suite.to_primitive())
+
+        self.assertFalse(hasattr(compact_snapshot, "__dict__"))
+        self.assertEqual(snapshot._fields, compact_snapshot._fields)
+        self.assertEqual(tuple(snapshot), tuple(compact_snapshot))
+        self.assertEqual(snapshot.tire._asdict(), compact_snapshot.tire._asdict())
+        self.assertEqual(snapshot.tire[0], compact_snapshot.tire[0])
+        self.assertEqual("Svalbard", compact_snapshot.owner["first entry"].location)
+        with self.assertRaises(AttributeError):
+            compact_snapshot.country = "Sweden"
+
+        unpickled_snapshot = pickle.loads(pickle.dumps(compact_snapshot))
+        self.assertEqual(compact_snapshot, unpickled_snapshot)
+        self.assertIs(type(compact_snapshot.tire), type(unpickled_snapshot.tire))
+
+    def test_compact_numeric_list(self):
+        raw_config = list(range(100))
+        suite = configsuite.ConfigSuite(raw_config, numbers.build_schema())
+        compact_suite = configsuite.ConfigSuite(
+            raw_config, numbers.build_schema(), compact_snapshot=True
+        )
+        self.assertTrue(compact_suite.valid, compact_suite.errors)
+
+        compact_snapshot = compact_suite.snapshot
+        self.assertIsInstance(compact_snapshot, NumericListSnapshot)
+        self.assertEqual("q", compact_snapshot.typecode)
+        self.assertEqual(suite.snapshot, compact_snapshot)
+        self.assertEqual(hash(suite.snapshot), hash(compact_snapshot))
+        self.assertEqual(tuple(range(10, 20)), compact_snapshot[10:20])
+        self.assertEqual(99, compact_snapshot[-1])
+        self.assertIn(42, compact_snapshot)
+        self.assertEqual(compact_snapshot, pickle.loads(pickle.dumps(compact_snapshot)))
+
+        pushed_suite = compact_suite.push("7")
+        self.assertIs(compact_snapshot, pushed_suite.snapshot)
+
+        big_suite = configsuite.ConfigSuite(
+            [2 ** 70], numbers.build_schema(), compact_snapshot=True
+        )
+        self.assertTrue(big_suite.valid, big_suite.errors)
+        self.assertEqual((2 ** 70,), big_suite.snapshot)
+        self.assertNotIsInstance(big_suite.snapshot, NumericListSnapshot)
+
+    def test_compact_snapshot_memory(self):
+        schema = transactions.build_schema()
+        raw_config = transactions.build_config()
+        raw_config["transactions"] = [
+            {"source": "NOK", "target": "USD", "amount": idx} for idx in range(10000)
+        ]
+
+        def _allocated(compact):
+            tracemalloc.start()
+            try:
+                snapshot = build_snapshot(raw_config, schema, compact=compact)
+                allocated, _ = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            self.assertEqual(10000, len(snapshot.transactions))
+            return allocated
+
+        self.assertLess(_allocated(compact=True), _allocated(compact=False))
+
+    def test_intern_strings(self):
+        raw_config = transactions.build_config()
+        raw_config["transactions"] = [
+            {
+                "source": "".join(["N", "OK"]),
+                "target": "".join(["U", "SD"]),
+                "amount": 1,
+            }
+            for _ in range(100)
+        ]
+        suite = configsuite.ConfigSuite(
+            raw_config,
+            transactions.build_schema(),
+            extract_validation_context=transactions.extract_validation_context,
+        )
+        interned_suite = configsuite.ConfigSuite(
+            raw_config,
+            transactions.build_schema(),
+            extract_validation_context=transactions.extract_validation_context,
+            intern_strings=True,
+        )
+        self.assertTrue(interned_suite.valid, interned_suite.errors)
+        self.assertEqual(suite.snapshot, interned_suite.snapshot)
+
+        self.assertEqual(0, suite.interned_bytes)
+        self.assertGreaterEqual(interned_suite.interned_bytes, 2 * 100 * len("NOK"))
+        snapshot = interned_suite.snapshot
+        self.assertTrue(
+            all(
+                elem.source is snapshot.transactions[0].source
+                for elem in snapshot.transactions
+            )
+        )
+
+        pushed_suite = interned_suite.push({})
+        self.assertEqual(interned_suite.interned_bytes, pushed_suite.interned_bytes)
+
+    def test_intern_strings_memory(self):
+        schema = transactions.build_schema()
+
+        def _retained(intern_strings):
+            gc.collect()
+            tracemalloc.start()
+            try:
+                raw_config = transactions.build_config()
+                raw_config["transactions"] = [
+                    {
+                        "source": "".join(["N", "OK"]),
+                        "target": "".join(["U", "SD"]),
+                        "amount": idx,
+                    }
+                    for idx in range(1, 2001)
+                ]
+                suite = configsuite.ConfigSuite(
+                    raw_config,
+                    schema,
+                    extract_validation_context=transactions.extract_validation_context,
+                    intern_strings=intern_strings,
+                )
+                self.assertEqual(2000, len(suite.snapshot.transactions))
+                del raw_config
+                gc.collect()
+                retained, _ = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            return retained, suite.interned_bytes
+
+        retained, _ = _retained(intern_strings=False)
+        interned_retained, interned_bytes = _retained(intern_strings=True)
+        self.assertGreater(interned_bytes, 0)
+        self.assertLessEqual(interned_retained, retained - interned_bytes)
+
+    def test_intern_transformed_strings(self):
+        schema = {
+            MK.Type: types.List,
+            MK.Content: {
+                MK.Item: {MK.Type: types.String, MK.Transformation: _to_upper}
+            },
+        }
+        raw_config = ["".join(["n", "ok"]) for _ in range(1000)]
+        suite = configsuite.ConfigSuite(
+            raw_config, schema, deduce_required=True, intern_strings=True
+        )
+        self.assertTrue(suite.valid, suite.errors)
+
+        merged_config = suite._merged_config
+        self.assertEqual(1, len({id(elem) for elem in merged_config}))
+        self.assertTrue(all(elem is merged_config[0] for elem in suite.snapshot))
+        # Each of the raw and the transformed strings is replaced, except for
+        # the first of each if it was not already interned.
+        self.assertGreaterEqual(suite.interned_bytes, 2 * 999 * sys.getsizeof("nok"))
+        self.assertLessEqual(suite.interned_bytes, 2 * 1000 * sys.getsizeof("nok"))
+
+    def test_columnar_snapshot(self):
+        raw_config = transactions.build_config()
+        raw_config["transactions"] = [
+            {"source": "NOK", "target": "USD", "amount": idx} for idx in range(1, 101)
+        ]
+        suite = configsuite.ConfigSuite(
+            raw_config,
+            transactions.build_schema(),
+            extract_validation_context=transactions.extract_validation_context,
+        )
+        columnar_suite = configsuite.ConfigSuite(
+            raw_config,
+            transactions.build_schema(),
+            extract_validation_context=transactions.extract_validation_context,
+            columnar_snapshot=True,
+        )
+        self.assertTrue(columnar_suite.valid, columnar_suite.errors)
+
+        columns = columnar_suite.snapshot.transactions
+        self.assertIsInstance(columns, ColumnarListSnapshot)
+        self.assertEqual(suite.snapshot, columnar_suite.snapshot)
+        self.assertEqual(hash(suite.snapshot), hash(columnar_suite.snapshot))
+        self.assertEqual(suite.to_primitive(), columnar_suite.to_primitive())
+
+        self.assertEqual(("amount", "source", "target"), columns.fields)
+        self.assertEqual(5050, sum(columns.column("amount")))
+        self.assertEqual("q", columns.column("amount").typecode)
+        self.assertEqual(("NOK",) * 100, columns.column("source"))
+        with self.assertRaises(KeyError):
+            columns.column("currency")
+
+        self.assertEqual(100, len(columns))
+        self.assertEqual(suite.snapshot.transactions[7], columns[7])
+        self.assertIs(type(suite.snapshot.transactions[7]), type(columns[7]))
+        self.assertEqual(suite.snapshot.transactions[-3:], columns[-3:])
+        self.assertEqual(columns, pickle.loads(pickle.dumps(columns)))
+
+        accessor = columnar_suite.accessor("transactions[*].amount")
+        self.assertEqual(tuple(range(1, 101)), accessor(columnar_suite.snapshot))
+        self.assertEqual(accessor(suite.snapshot), accessor(columnar_suite.snapshot))
+
+        pushed_suite = columnar_suite.push({"exchange_rates": {"SEK": 0.9}})
+        self.assertIs(columns, pushed_suite.snapshot.transactions)
+
+    @unittest.skipIf(snapshot_module.numpy is not None, "NumPy is installed")
+    def test_columnar_snapshot_without_numpy(self):
+        suite = configsuite.ConfigSuite(
+            transactions.build_config(),
+            transactions.build_schema(),
+            extract_validation_context=transactions.extract_validation_context,
+            columnar_snapshot=True,
+        )
+        with self.assertRaises(ImportError):
+            suite.snapshot.transactions.to_numpy("amount")
+
+    @unittest.skipIf(snapshot_module.numpy is None, "NumPy is not installed")
+    def test_columnar_snapshot_to_numpy(self):
+        suite = configsuite.ConfigSuite(
+            transactions.build_config(),
+            transactions.build_schema(),
+            extract_validation_context=transactions.extract_validation_context,
+            columnar_snapshot=True,
+        )
+        amounts = suite.snapshot.transactions.to_numpy("amount")
+        self.assertAlmostEqual(1001.001, amounts.sum())
+
+    @unittest.skipIf(snapshot_module.SharedMemory is None, "Requires shared memory")
+    def test_shared_memory_snapshot(self):
+        length = snapshot_module.SHARED_MEMORY_MIN_LENGTH
+        raw_config = list(range(length))
+        suite = configsuite.ConfigSuite(raw_config, numbers.build_schema())
+        shared_suite = configsuite.ConfigSuite(
+            raw_config, numbers.build_schema(), shared_memory_snapshot=True
+        )
+        self.assertTrue(shared_suite.valid, shared_suite.errors)
+
+        shared_snapshot = shared_suite.snapshot
+        self.assertIsInstance(shared_snapshot, SharedNumericListSnapshot)
+        self.assertEqual("q", shared_snapshot.typecode)
+        self.assertEqual(suite.snapshot, shared_snapshot)
+        self.assertEqual(hash(suite.snapshot), hash(shared_snapshot))
+        self.assertEqual((10, 11), shared_snapshot[10:12])
+        self.assertEqual(42, shared_snapshot.index(42))
+        self.assertEqual(1, shared_snapshot.count(42))
+
+        unpickled_snapshot = pickle.loads(pickle.dumps(shared_snapshot))
+        self.assertEqual(shared_snapshot.name, unpickled_snapshot.name)
+        self.assertEqual(shared_snapshot, unpickled_snapshot)
+
+        self.assertIs(shared_snapshot, shared_suite.push([]).snapshot)
+
+        small_suite = configsuite.ConfigSuite(
+            raw_config[:-1], numbers.build_schema(), shared_memory_snapshot=True
+        )
+        self.assertIsInstance(small_suite.snapshot, NumericListSnapshot)
+        self.assertNotIsInstance(small_suite.snapshot, SharedNumericListSnapshot)
+
+    @unittest.skipIf(snapshot_module.SharedMemory is None, "Requires shared memory")
+    def test_shared_memory_snapshot_to_process_pool(self):
+        raw_config = list(range(10000))
+        suite = configsuite.ConfigSuite(
+            raw_config, numbers.build_schema(), shared_memory_snapshot=True
+        )
+        snapshot = suite.snapshot
+
+        for method in ("fork", "spawn"):
+            if method not in multiprocessing.get_all_start_methods():
+                continue
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=2, mp_context=multiprocessing.get_context(method)
+            ) as executor:
+                results = list(executor.map(_shared_sum, [snapshot] * 4))
+            self.assertEqual([(snapshot.name, sum(raw_config))] * 4, results)
+
+    @unittest.skipIf(snapshot_module.SharedMemory is None, "Requires shared memory")
+    def test_shared_memory_released(self):
+        snapshot = build_snapshot(
+            list(range(1000)), numbers.build_schema(), shared_memory=True
+        )
+        attached_snapshot = pickle.loads(pickle.dumps(snapshot))
+        name = snapshot.name
+
+        del attached_snapshot
+        gc.collect()
+        self.assertEqual(999, pickle.loads(pickle.dumps(snapshot))[-1])
+
+        del snapshot
+        gc.collect()
+        with self.assertRaises(FileNotFoundError):
+            snapshot_module.SharedMemory(name=name)
@@ -23,7 +23,10 @@ from sphinx.util.docutils import docutils_namespace
 from sphinx.errors import SphinxWarning
 from functools import wraps
 
+from configsuite import MetaKeys as MK
+from configsuite.extension import ext
 from tests import tmpdir
+from tests.data import car
 
 
 def func_returns_int():
@@ -230,3 +233,52 @@ class TestSphinxExtension(unittest.TestCase):
         ]
         for content in contents:
             self.assertTrue(content in html)
+
+    @tmpdir("tests/data/doc")
+    @with_sphinx_app()
+    def test_parallel_safe(self, app):
+        extension = app.extensions["configsuite.extension.ext"]
+        self.assertTrue(extension.parallel_read_safe)
+        self.assertTrue(extension.parallel_write_safe)
+
+    @tmpdir("tests/data/doc")
+    @with_sphinx_app()
+    def test_cached_sections(self, app):
+        spec = "tests.data.car.build_schema_with_validators_and_transformators"
+        repeated_schema = """
+        .. configsuite::
+            :module: {spec}
+
+        .. configsuite::
+            :module: {spec}
+        """.format(spec=spec)
+        with open("index.rst", "w") as f:
+            f.write(repeated_schema)
+
+        app.build()
+        with open(os.path.join(app.outdir, "index.html"), "r") as f:
+            html = f.read()
+        self.assertEqual(2, html.count("Convert to cm - ignoring context"))
+
+        fingerprint = ext.doc_fingerprint(
+            car.build_schema_with_validators_and_transformators()
+        )
+        self.assertEqual({"index": {spec: fingerprint}}, app.env.configsuite_schemas)
+        self.assertEqual([fingerprint], list(app.env.configsuite_sections))
+
+        ext.purge_schemas(app, app.env, "index")
+        ext.prune_sections(app, app.env)
+        self.assertEqual({}, app.env.configsuite_sections)
+
+    def test_doc_fingerprint(self):
+        fingerprint = ext.doc_fingerprint(car.build_schema())
+        self.assertEqual(fingerprint, ext.doc_fingerprint(car.build_schema()))
+
+        schema = car.build_schema()
+        schema[MK.Content]["country"][MK.Description] = "Country of production"
+        self.assertNotEqual(fingerprint, ext.doc_fingerprint(schema))
+
+        self.assertNotEqual(
+            fingerprint,
+            ext.doc_fingerprint(car.build_schema_with_validators_and_transformators()),
+        )
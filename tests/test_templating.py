@@ -0,0 +1,150 @@
+"""Copyright 2021 Equinor ASA and The Netherlands Organisation for
+Applied Scientific Research TNO.
+
+Licensed under the MIT license.
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the conditions stated in the LICENSE file in the project root for
+details.
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+"""
+
+
+import collections
+import concurrent.futures
+import pickle
+import unittest
+from unittest import mock
+
+import configsuite
+from configsuite import MetaKeys as MK
+from configsuite import templating as cs_templating
+
+from .data import templating
+
+
+_VARIABLES = {"color": "blue", "secret_number": 42, "animal": "cow"}
+
+
+def _build_transformation():
+    return cs_templating.build_transformation(
+        variables=_VARIABLES, variable_start_string="<", variable_end_string=">"
+    )
+
+
+def _build_context_transformation():
+    return cs_templating.build_context_transformation(
+        variables=_VARIABLES, variable_start_string="<", variable_end_string=">"
+    )
+
+
+def _suite_snapshot(raw_config, schema):
+    suite = configsuite.ConfigSuite(raw_config, schema)
+    return suite.valid, suite.snapshot
+
+
+class TestTemplating(unittest.TestCase):
+    def test_render_no_definitions(self):
+        schema = templating.build_schema_no_definitions()
+        schema[MK.Content][MK.Item][MK.Transformation] = _build_transformation()
+
+        suite = configsuite.ConfigSuite(
+            templating.build_config_no_definitions(), schema
+        )
+        self.assertTrue(suite.valid, suite.errors)
+        self.assertEqual(templating.template_results_no_definitions(), suite.snapshot)
+
+    def test_render_with_definitions(self):
+        schema = templating.build_schema_with_definitions()
+        templates_schema = schema[MK.Content]["templates"][MK.Content][MK.Item]
+        templates_schema[MK.ContextTransformation] = _build_context_transformation()
+
+        suite = configsuite.ConfigSuite(
+            templating.build_config_with_definitions(),
+            schema,
+            extract_transformation_context=templating.extract_templating_context,
+        )
+        self.assertTrue(suite.valid, suite.errors)
+        self.assertEqual(
+            templating.template_results_with_definitions(), suite.snapshot.templates
+        )
+
+    def test_render_non_string(self):
+        schema = templating.build_schema_no_definitions()
+        schema[MK.Content][MK.Item][MK.Transformation] = _build_transformation()
+
+        raw_config = templating.build_config_no_definitions() + [14]
+        suite = configsuite.ConfigSuite(raw_config, schema)
+        self.assertFalse(suite.valid)
+        self.assertEqual(1, len(suite.errors))
+        self.assertIsInstance(suite.errors[0], configsuite.InvalidTypeError)
+
+    def test_render_circular_definitions(self):
+        render = cs_templating.build_transformation(
+            variables={"a": "<b>", "b": "<a>"},
+            variable_start_string="<",
+            variable_end_string=">",
+        )
+        schema = templating.build_schema_no_definitions()
+        schema[MK.Content][MK.Item][MK.Transformation] = render
+
+        suite = configsuite.ConfigSuite(["<a>"], schema)
+        self.assertFalse(suite.valid)
+        self.assertIsInstance(suite.errors[0], configsuite.TransformationError)
+        self.assertIn("Circular dependencies", suite.errors[0].msg)
+
+    def test_templates_compiled_once(self):
+        renderer = cs_templating.TemplateRenderer(
+            variable_start_string="[[", variable_end_string="]]"
+        )
+        variables = {"animal": "cow"}
+        template = "A [[animal]] called [[animal]]"
+
+        self.assertEqual("A cow called cow", renderer.render(template, variables))
+
+        misses = cs_templating._compile.cache_info().misses
+        for _ in range(1000):
+            self.assertEqual("A cow called cow", renderer.render(template, variables))
+        self.assertEqual(misses, cs_templating._compile.cache_info().misses)
+
+    def test_pickle_transformations(self):
+        for build in (_build_transformation, _build_context_transformation):
+            transformation = build()
+            unpickled = pickle.loads(pickle.dumps(transformation))
+            self.assertEqual(transformation.msg, unpickled.msg)
+
+        render = pickle.loads(pickle.dumps(_build_transformation()))
+        self.assertEqual("A cow", render("A <animal>"))
+
+        context = templating.extract_templating_context(
+            collections.namedtuple("Config", ["definitions"])({"animal": "pig"})
+        )
+        context_render = _build_context_transformation()
+        self.assertEqual("A pig", context_render("A <animal>", context))
+        context_render = pickle.loads(pickle.dumps(context_render))
+        self.assertEqual("A pig", context_render("A <animal>", context))
+
+    def test_render_in_process_pool(self):
+        schema = templating.build_schema_no_definitions()
+        schema[MK.Content][MK.Item][MK.Transformation] = _build_transformation()
+        raw_config = templating.build_config_no_definitions()
+
+        with concurrent.futures.ProcessPoolExecutor(max_workers=1) as executor:
+            valid, snapshot = executor.submit(
+                _suite_snapshot, raw_config, schema
+            ).result()
+        self.assertTrue(valid)
+        self.assertEqual(templating.template_results_no_definitions(), snapshot)
+
+    def test_without_jinja2(self):
+        with mock.patch.object(cs_templating, "jinja2", None):
+            with self.assertRaises(ImportError) as context:
+                _build_transformation()
+        self.assertIn("configsuite[templating]", str(context.exception))
@@ -0,0 +1,139 @@
+"""Copyright 2021 Equinor ASA and The Netherlands Organisation for
+Applied Scientific Research TNO.
+
+Licensed under the MIT license.
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the conditions stated in the LICENSE file in the project root for
+details.
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+"""
+
+
+import pickle
+import unittest
+from unittest import mock
+
+import configsuite
+from configsuite import batch
+
+from .data import transactions
+
+
+def _build_configs(count):
+    for idx in range(count):
+        config = transactions.build_config()
+        config["transactions"][0]["amount"] = idx - 10
+        yield config
+
+
+def _expected_result(config, **kwargs):
+    suite = configsuite.ConfigSuite(
+        config,
+        transactions.build_schema(),
+        extract_validation_context=transactions.extract_validation_context,
+        **kwargs
+    )
+    return (suite.valid, suite.errors)
+
+
+class TestValidateMany(unittest.TestCase):
+    def test_validate_many(self):
+        results = configsuite.validate_many(
+            _build_configs(100),
+            transactions.build_schema(),
+            workers=2,
+            extract_validation_context=transactions.extract_validation_context,
+            chunk_size=7,
+        )
+        results = dict(results)
+
+        self.assertEqual(list(range(100)), sorted(results))
+        for idx, config in enumerate(_build_configs(100)):
+            self.assertEqual(_expected_result(config), tuple(results[idx]))
+        self.assertEqual(11, sum(not result.valid for result in results.values()))
+
+    def test_validate_many_serial(self):
+        results = list(
+            configsuite.validate_many(
+                _build_configs(20),
+                transactions.build_schema(),
+                workers=1,
+                extract_validation_context=transactions.extract_validation_context,
+            )
+        )
+        self.assertEqual(list(range(20)), [idx for idx, _ in results])
+        self.assertFalse(results[0][1].valid)
+        self.assertTrue(results[-1][1].valid)
+
+    def test_validate_many_validates_schema_once(self):
+        with mock.patch.object(
+            configsuite.config,
+            "assert_valid_schema",
+            wraps=configsuite.config.assert_valid_schema,
+        ) as assert_valid_schema:
+            results = list(
+                configsuite.validate_many(
+                    _build_configs(20),
+                    transactions.build_schema(),
+                    workers=1,
+                    layers=({"exchange_rates": {"SEK": 0.9}},),
+                    extract_validation_context=transactions.extract_validation_context,
+                )
+            )
+        self.assertEqual(20, len(results))
+        self.assertEqual(1, assert_valid_schema.call_count)
+
+    def test_validate_many_layers(self):
+        layers = ({"exchange_rates": {"SEK": 0.9}},)
+        configs = [{"transactions": [{"source": "SEK", "target": "SEK", "amount": 1}]}]
+
+        for workers in (1, 2):
+            results = list(
+                configsuite.validate_many(
+                    configs,
+                    transactions.build_schema(),
+                    workers=workers,
+                    layers=layers,
+                    extract_validation_context=transactions.extract_validation_context,
+                )
+            )
+            self.assertEqual(1, len(results))
+            self.assertEqual(
+                _expected_result(configs[0], layers=layers), tuple(results[0][1])
+            )
+            self.assertTrue(results[0][1].valid, results[0][1].errors)
+
+    def test_validate_chunk_builds_suite_once(self):
+        suite_kwargs = {
+            "extract_validation_context": transactions.extract_validation_context,
+            "extract_transformation_context": configsuite.config._no_context,
+            "deduce_required": False,
+        }
+        state = pickle.dumps((transactions.build_schema(), (), suite_kwargs))
+        configs = list(_build_configs(20))
+
+        with mock.patch.object(
+            batch, "_suite_factory", wraps=batch._suite_factory
+        ) as suite_factory:
+            results = batch._validate_chunk("a", state, 0, configs[:10])
+            results += batch._validate_chunk("a", state, 10, configs[10:])
+            self.assertEqual(1, suite_factory.call_count)
+            batch._validate_chunk("b", state, 0, configs[:1])
+            self.assertEqual(2, suite_factory.call_count)
+
+        self.assertEqual(list(range(20)), [idx for idx, _ in results])
+        for (_, result), config in zip(results, configs):
+            self.assertEqual(_expected_result(config), tuple(result))
+
+    def test_validate_many_empty(self):
+        self.assertEqual(
+            [], list(configsuite.validate_many([], transactions.build_schema()))
+        )
@@ -0,0 +1,259 @@
+"""Copyright 2021 Equinor ASA and The Netherlands Organisation for
+Applied Scientific Research TNO.
+
+Licensed under the MIT license.
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the conditions stated in the LICENSE file in the project root for
+details.
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+"""
+
+
+import asyncio
+import concurrent.futures
+import threading
+import time
+import unittest
+
+import configsuite
+from configsuite import MetaKeys as MK
+
+from .data import transactions
+
+
+def _build_schema(delay, slow_currency=None):
+    schema = transactions.build_schema()
+
+    @configsuite.validator_msg("Should be defined currency")
+    def _is_currency(elem, context):
+        if slow_currency is None or elem == slow_currency:
+            time.sleep(delay)
+        return elem in context.currencies
+
+    transaction_schema = schema[MK.Content]["transactions"][MK.Content][MK.Item]
+    for key in ("source", "target"):
+        transaction_schema[MK.Content][key][MK.ContextValidators] = (_is_currency,)
+    return schema
+
+
+def _build_config(slow_currency=None):
+    raw_config = transactions.build_config()
+    raw_config["transactions"] = [
+        dict(transaction) for transaction in raw_config["transactions"] * 10
+    ]
+    if slow_currency is not None:
+        raw_config["exchange_rates"][slow_currency] = 1
+        raw_config["transactions"][7]["source"] = slow_currency
+    return raw_config
+
+
+def _timeout_errors(errors):
+    return [
+        error
+        for error in errors
+        if isinstance(error, configsuite.ValidationTimeoutError)
+    ]
+
+
+class TestValidationTimeouts(unittest.TestCase):
+    def test_validator_timeout(self):
+        suite = configsuite.ConfigSuite(
+            _build_config(slow_currency="SLOW"),
+            _build_schema(1, slow_currency="SLOW"),
+            extract_validation_context=transactions.extract_validation_context,
+            validator_timeout=0.05,
+        )
+        self.assertFalse(suite.valid)
+        self.assertEqual(1, len(suite.errors))
+
+        error = suite.errors[0]
+        self.assertIsInstance(error, configsuite.ValidationTimeoutError)
+        self.assertEqual(("transactions", 7, "source"), error.key_path)
+        self.assertIn("timed out", error.msg)
+
+        suite = configsuite.ConfigSuite(
+            _build_config(),
+            _build_schema(0),
+            extract_validation_context=transactions.extract_validation_context,
+            validator_timeout=1,
+        )
+        self.assertTrue(suite.valid, suite.errors)
+
+    def test_time_budget(self):
+        start = time.monotonic()
+        suite = configsuite.ConfigSuite(
+            _build_config(),
+            _build_schema(0.01),
+            extract_validation_context=transactions.extract_validation_context,
+            time_budget=0.1,
+        )
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertFalse(suite.valid)
+
+        timeout_errors = _timeout_errors(suite.errors)
+        self.assertEqual(1, len(timeout_errors))
+        self.assertEqual("transactions", timeout_errors[0].key_path[0])
+
+        suite = configsuite.ConfigSuite(
+            _build_config(),
+            _build_schema(0),
+            extract_validation_context=transactions.extract_validation_context,
+            time_budget=10,
+        )
+        self.assertTrue(suite.valid, suite.errors)
+
+    def test_time_budget_with_executor(self):
+        raw_config = _build_config()
+        suite = configsuite.ConfigSuite(
+            raw_config,
+            transactions.build_schema(),
+            extract_validation_context=transactions.extract_validation_context,
+        )
+        context = transactions.extract_validation_context(suite.snapshot)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            validator = configsuite.Validator(
+                _build_schema(0.05), executor=executor, time_budget=0.1
+            )
+            val_res = validator.validate(raw_config, context)
+        self.assertFalse(val_res.valid)
+        timeout_errors = _timeout_errors(val_res.errors)
+        self.assertEqual(1, len(timeout_errors))
+        self.assertEqual("transactions", timeout_errors[0].key_path[0])
+
+    def test_time_budget_avalidate(self):
+        schema = transactions.build_schema()
+
+        @configsuite.validator_msg("Should be defined currency")
+        async def _is_currency(elem, context):
+            await asyncio.sleep(10 if elem == "USD" else 0)
+            return elem in context.currencies
+
+        transaction_schema = schema[MK.Content]["transactions"][MK.Content][MK.Item]
+        transaction_schema[MK.Content]["target"][MK.ContextValidators] = (_is_currency,)
+
+        suite = configsuite.AsyncConfigSuite(
+            transactions.build_config(),
+            schema,
+            extract_validation_context=transactions.extract_validation_context,
+            time_budget=0.1,
+        )
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(suite.avalidate())
+        finally:
+            loop.close()
+
+        self.assertFalse(suite.valid)
+        self.assertEqual(1, len(suite.errors))
+        self.assertEqual(("transactions", 0, "target"), suite.errors[0].key_path)
+
+    def test_validator_timeout_with_executor(self):
+        raw_config = _build_config(slow_currency="SLOW")
+        suite = configsuite.ConfigSuite(
+            raw_config,
+            transactions.build_schema(),
+            extract_validation_context=transactions.extract_validation_context,
+        )
+        context = transactions.extract_validation_context(suite.snapshot)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            validator = configsuite.Validator(
+                _build_schema(0.5, slow_currency="SLOW"),
+                executor=executor,
+                validator_timeout=0.05,
+            )
+            val_res = validator.validate(raw_config, context)
+        self.assertFalse(val_res.valid)
+        self.assertEqual(1, len(val_res.errors))
+
+        error = val_res.errors[0]
+        self.assertIsInstance(error, configsuite.ValidationTimeoutError)
+        self.assertEqual(("transactions", 7, "source"), error.key_path)
+        self.assertIn("timed out", error.msg)
+
+    def test_validator_timeout_avalidate(self):
+        schema = transactions.build_schema()
+
+        @configsuite.validator_msg("Should be defined currency")
+        async def _is_currency(elem, context):
+            await asyncio.sleep(10 if elem == "USD" else 0)
+            return elem in context.currencies
+
+        transaction_schema = schema[MK.Content]["transactions"][MK.Content][MK.Item]
+        transaction_schema[MK.Content]["target"][MK.ContextValidators] = (_is_currency,)
+
+        suite = configsuite.AsyncConfigSuite(
+            transactions.build_config(),
+            schema,
+            extract_validation_context=transactions.extract_validation_context,
+            validator_timeout=0.1,
+        )
+        start = time.monotonic()
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(suite.avalidate())
+        finally:
+            loop.close()
+        self.assertLess(time.monotonic() - start, 5)
+
+        self.assertFalse(suite.valid)
+        self.assertEqual(1, len(suite.errors))
+        error = suite.errors[0]
+        self.assertIsInstance(error, configsuite.ValidationTimeoutError)
+        self.assertEqual(("transactions", 0, "target"), error.key_path)
+        self.assertIn("timed out", error.msg)
+
+    def test_validator_threads(self):
+        threads = set()
+
+        @configsuite.validator_msg("Is positive")
+        def _is_positive(elem):
+            threads.add(threading.get_ident())
+            return elem > 0
+
+        schema = {
+            MK.Type: configsuite.types.List,
+            MK.Content: {
+                MK.Item: {
+                    MK.Type: configsuite.types.Integer,
+                    MK.ElementValidators: (_is_positive,),
+                }
+            },
+        }
+        config = list(range(1, 101))
+
+        validator = configsuite.Validator(schema)
+        self.assertTrue(validator.validate(config).valid)
+        self.assertEqual({threading.get_ident()}, threads)
+
+        for kwargs in ({"time_budget": 10}, {"validator_timeout": 10}):
+            threads.clear()
+            validator = configsuite.Validator(schema, **kwargs)
+            self.assertTrue(validator.validate(config).valid)
+            self.assertEqual(1, len(threads))
+            self.assertNotIn(threading.get_ident(), threads)
+
+    def test_time_budget_stuck_validator(self):
+        @configsuite.validator_msg("Is slow")
+        def _is_slow(_elem):
+            time.sleep(1)
+            return True
+
+        schema = {MK.Type: configsuite.types.String, MK.ElementValidators: (_is_slow,)}
+        start = time.monotonic()
+        suite = configsuite.ConfigSuite("x", schema, time_budget=0.1)
+        self.assertLess(time.monotonic() - start, 0.5)
+
+        self.assertFalse(suite.valid)
+        timeout_errors = _timeout_errors(suite.errors)
+        self.assertEqual(1, len(timeout_errors))
+        self.assertEqual("Validation time budget exceeded", timeout_errors[0].msg)